@@ -0,0 +1,391 @@
+# backtest/engine.py
+
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config.settings import (
+    EMA_SHORT_PERIOD,
+    EMA_LONG_PERIOD,
+    RSI_PERIOD,
+    MACD_FAST_PERIOD,
+    MACD_SLOW_PERIOD,
+    MACD_SIGNAL_PERIOD,
+    VOLUME_MA_PERIOD,
+    TIMEFRAME_TREND,
+    TIMEFRAME_ENTRY,
+    BACKTEST_DATA_DIR,
+    BACKTEST_MAX_HOLD_BARS,
+    BACKTEST_FEE,
+    BACKTEST_CHUNK_SYMBOLS,
+    _PERIODS
+)
+from mexc.kline_cache import KlineCache
+from screener.params import (
+    ENTRY_BUFFER,
+    STOP_BUFFER,
+    RESISTANCE_BUFFER,
+    RR_TARGET,
+    RESISTANCE_WINDOW,
+    VOLUME_THRESHOLD_MULTIPLIER
+)
+from screener.vector_engine import ema, sma, rolling_max, rsi, macd, wilder_gain_loss
+from utils.logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+TRADE_COLUMNS = [
+    "symbol", "entry_time", "exit_time", "entry_price", "stop_loss", "take_profit",
+    "exit_price", "reason", "bars", "return", "r_multiple",
+]
+
+
+class BacktestParams(NamedTuple):
+    """Parâmetros da estratégia de SHORT (padrões = valores do screener ao vivo)."""
+    ema_short: int = EMA_SHORT_PERIOD
+    ema_long: int = EMA_LONG_PERIOD
+    rsi_period: int = RSI_PERIOD
+    macd_fast: int = MACD_FAST_PERIOD
+    macd_slow: int = MACD_SLOW_PERIOD
+    macd_signal: int = MACD_SIGNAL_PERIOD
+    volume_ma: int = VOLUME_MA_PERIOD
+    resistance_window: int = RESISTANCE_WINDOW
+    resistance_buffer: float = RESISTANCE_BUFFER
+    volume_mult: float = VOLUME_THRESHOLD_MULTIPLIER
+    entry_buffer: float = ENTRY_BUFFER
+    stop_buffer: float = STOP_BUFFER
+    rr_target: float = RR_TARGET
+    max_hold_bars: int = BACKTEST_MAX_HOLD_BARS
+    fee: float = BACKTEST_FEE
+    one_position: bool = True  # no máximo um trade aberto por símbolo
+
+    @property
+    def min_bars(self) -> int:
+        return max(self.ema_long, self.rsi_period, self.macd_slow, self.volume_ma, self.resistance_window)
+
+
+class MarketData:
+    """
+    Candles de vários símbolos alinhados numa grade de tempo comum: matrizes
+    (símbolos x barras) float64 com NaN onde o símbolo não tem candle.
+    """
+    __slots__ = ("symbols", "interval", "time", "open", "high", "low", "close", "volume")
+
+    def __init__(self, symbols: List[str], interval: str, time: np.ndarray,
+                 open: np.ndarray, high: np.ndarray, low: np.ndarray,
+                 close: np.ndarray, volume: np.ndarray):
+        self.symbols = symbols
+        self.interval = interval
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @classmethod
+    def from_payloads(cls, payloads: Dict[str, dict], interval: str = TIMEFRAME_ENTRY) -> "MarketData":
+        """Alinha payloads colunares (`time`, `open`, ..., `vol`) de cada símbolo na mesma grade."""
+        period = _PERIODS[interval]
+        symbols = [s for s, p in payloads.items() if len(p.get("time", []))]
+        if not symbols:
+            empty = np.zeros((0, 0))
+            return cls([], interval, np.zeros(0, dtype=np.int64), empty, empty, empty, empty, empty)
+        t0 = min(int(payloads[s]["time"][0]) for s in symbols)
+        t1 = max(int(payloads[s]["time"][-1]) for s in symbols)
+        time = np.arange(t0, t1 + period, period, dtype=np.int64)
+        shape = (len(symbols), len(time))
+        cols = {f: np.full(shape, np.nan) for f in ("open", "high", "low", "close", "vol")}
+        for i, sym in enumerate(symbols):
+            t = np.asarray(payloads[sym]["time"], dtype=np.int64)
+            on_grid = (t - t0) % period == 0
+            idx = (t[on_grid] - t0) // period
+            for f, out in cols.items():
+                out[i, idx] = np.asarray(payloads[sym][f], dtype=np.float64)[on_grid]
+        return cls(symbols, interval, time, cols["open"], cols["high"], cols["low"],
+                   cols["close"], cols["vol"])
+
+    @classmethod
+    def from_cache(
+        cls,
+        interval: str = TIMEFRAME_ENTRY,
+        base_dir: str = BACKTEST_DATA_DIR,
+        symbols: Optional[Iterable[str]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> "MarketData":
+        """
+        Carrega os .npz de `<base_dir>/<interval>/<símbolo>.npz`. O padrão é o histórico
+        gravado por `backtest.recorder` (o cache do screener guarda só os últimos candles).
+        """
+        cache = KlineCache(base_dir, max_bars=0)
+        folder = os.path.join(base_dir, interval)
+        if symbols is None:
+            names = sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+            symbols = [n[:-4] for n in names if n.endswith(".npz")]
+        payloads = {}
+        for sym in symbols:
+            arrays = cache.load(sym, interval)
+            if arrays is None:
+                continue
+            keep = np.ones(len(arrays["time"]), dtype=bool)
+            if start is not None:
+                keep &= arrays["time"] >= start
+            if end is not None:
+                keep &= arrays["time"] <= end
+            payloads[sym] = {f: a[keep] for f, a in arrays.items()}
+        logger.info(f"Backtest: {len(payloads)} séries {interval} carregadas de {folder}.")
+        return cls.from_payloads(payloads, interval)
+
+    def select(self, rows) -> "MarketData":
+        """Subconjunto de símbolos (índices ou slice)."""
+        idx = np.arange(len(self.symbols))[rows]
+        return MarketData(
+            [self.symbols[i] for i in idx], self.interval, self.time,
+            self.open[idx], self.high[idx], self.low[idx], self.close[idx], self.volume[idx]
+        )
+
+    def window(self, start: int, stop: int) -> "MarketData":
+        """Janela de barras [start, stop) — visões dos arrays, sem cópia."""
+        return MarketData(
+            self.symbols, self.interval, self.time[start:stop],
+            self.open[:, start:stop], self.high[:, start:stop], self.low[:, start:stop],
+            self.close[:, start:stop], self.volume[:, start:stop]
+        )
+
+
+def _at(values: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Valores por barra de entrada de uma matriz do timeframe trend (idx < 0 -> NaN)."""
+    out = np.take(values, np.clip(idx, 0, None), axis=1)
+    out[:, idx < 0] = np.nan
+    return out
+
+
+def trend_state(
+    market: MarketData,
+    params: BacktestParams,
+    trend_interval: str = TIMEFRAME_TREND
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Contexto e resistência do timeframe trend em cada barra de entrada, sem olhar o futuro.
+
+    Como no modo derivado do screener, o trend é reamostrado dos candles de entrada e a
+    última barra é a hora ainda aberta (candles de entrada do bucket até a barra atual).
+    As EMAs/RSI dessa barra são o passo recursivo a partir dos valores das horas fechadas,
+    e a resistência é o máximo entre as `resistance_window - 1` horas fechadas e a máxima
+    parcial da hora corrente. Horas incompletas (início da série, buracos) ficam NaN.
+
+    Retorna (contexto_ok, resistência), ambos (símbolos x barras de entrada).
+    """
+    period, trend_period = _PERIODS[market.interval], _PERIODS[trend_interval]
+    if trend_period % period:
+        raise ValueError(f"{trend_interval} não é múltiplo de {market.interval}.")
+    per_bucket = trend_period // period
+    close, high = market.close, market.high
+
+    bucket = market.time // trend_period
+    bucket = bucket - bucket[0]
+    starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+    ends = np.append(starts[1:], len(bucket)) - 1
+
+    # horas fechadas: só buckets completos
+    complete = np.add.reduceat(~np.isnan(close), starts, axis=1) == per_bucket
+    with np.errstate(invalid="ignore"):
+        h_close = np.where(complete, close[:, ends], np.nan)
+        h_high = np.where(complete, np.fmax.reduceat(high, starts, axis=1), np.nan)
+
+    a_s, a_l = 2 / (params.ema_short + 1), 2 / (params.ema_long + 1)
+    a_rsi = 1 / params.rsi_period
+    gain, loss = wilder_gain_loss(h_close, params.rsi_period)
+    prev = bucket - 1  # última hora fechada antes da barra
+    ema_s_prev = _at(ema(h_close, span=params.ema_short), prev)
+    ema_l_prev = _at(ema(h_close, span=params.ema_long), prev)
+    gain_prev, loss_prev = _at(gain, prev), _at(loss, prev)
+    close_prev = _at(h_close, prev)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ema_s = np.where(np.isnan(ema_s_prev), close, a_s * close + (1 - a_s) * ema_s_prev)
+        ema_l = np.where(np.isnan(ema_l_prev), close, a_l * close + (1 - a_l) * ema_l_prev)
+        delta = close - close_prev
+        up, down = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+        g = np.where(np.isnan(gain_prev), up, a_rsi * up + (1 - a_rsi) * gain_prev)
+        l = np.where(np.isnan(loss_prev), down, a_rsi * down + (1 - a_rsi) * loss_prev)
+        rsi_t = 100 - (100 / (1 + g / l))
+        context = (ema_s < ema_l) & (rsi_t < 50)
+
+    # máxima parcial da hora corrente (acumulada dentro de cada bucket)
+    partial_high = pd.DataFrame(high.T).groupby(bucket).cummax().to_numpy().T
+    if params.resistance_window > 1:
+        closed_max = _at(rolling_max(h_high, params.resistance_window - 1), prev)
+        resistance = np.maximum(closed_max, partial_high)
+    else:
+        resistance = partial_high
+    return context, resistance
+
+
+def signal_mask(
+    market: MarketData,
+    params: BacktestParams,
+    trend_interval: str = TIMEFRAME_TREND
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Regras de contexto/gatilho do `SignalGenerator` avaliadas no fechamento de cada barra
+    de entrada, para todos os símbolos de uma vez. Retorna (máscara de sinais, resistência).
+    """
+    close, volume = market.close, market.volume
+    trend_ok, resistance = trend_state(market, params, trend_interval)
+
+    ema_s = ema(close, span=params.ema_short)
+    ema_l = ema(close, span=params.ema_long)
+    rsi_e = rsi(close, params.rsi_period)
+    line, sig = macd(close, params.macd_fast, params.macd_slow, params.macd_signal)
+    vol_ma = sma(volume, params.volume_ma)
+    bars = np.cumsum(~np.isnan(close), axis=1)
+
+    with np.errstate(invalid="ignore"):
+        # mesmas rejeições de check_trigger (comparações com NaN não rejeitam)...
+        reject = (
+            (close > resistance * params.resistance_buffer)
+            | (volume < vol_ma * params.volume_mult)
+            | (rsi_e >= 50)
+            | (line >= sig)
+        )
+        mask = trend_ok & (ema_s < ema_l) & (rsi_e < 50) & (bars >= params.min_bars) & ~reject
+    # ...mas não se opera sem preço ou resistência
+    mask &= ~np.isnan(close) & ~np.isnan(resistance)
+    return mask, resistance
+
+
+def simulate(
+    market: MarketData,
+    mask: np.ndarray,
+    resistance: np.ndarray,
+    params: BacktestParams
+) -> pd.DataFrame:
+    """
+    Simula os trades de SHORT: entrada no fechamento da barra do sinal a
+    `close * (1 - entry_buffer)`, SL em `resistência * (1 + stop_buffer)` e TP em
+    `rr_target` vezes o risco. As barras seguintes são examinadas de uma vez
+    (janela de `max_hold_bars`); SL e TP na mesma barra contam como SL, e sem nenhum
+    dos dois o trade sai no último fechamento da janela.
+
+    Atenção: a entrada é o mesmo preço do sinal ao vivo (ordem limite abaixo do fechamento),
+    mas aqui ela é considerada executada sem checar se alguma barra seguinte chegou a esse
+    preço. É uma hipótese otimista: os resultados tendem a superestimar a taxa de execução.
+    """
+    rows, cols = np.nonzero(mask)
+    if not len(rows):
+        return pd.DataFrame(columns=TRADE_COLUMNS)
+    hold = params.max_hold_bars
+    entry = market.close[rows, cols] * (1 - params.entry_buffer)
+    stop = resistance[rows, cols] * (1 + params.stop_buffer)
+    target = entry - (stop - entry) * params.rr_target
+
+    pad = np.full((len(market.symbols), hold), np.nan)
+    def _ahead(values: np.ndarray) -> np.ndarray:
+        # janelas [col+1, col+hold] de cada sinal; a view não copia a matriz inteira
+        windows = sliding_window_view(np.concatenate([values, pad], axis=1), hold, axis=1)
+        return windows[rows, cols + 1]
+
+    high, low, close = _ahead(market.high), _ahead(market.low), _ahead(market.close)
+    with np.errstate(invalid="ignore"):
+        sl_hit = high >= stop[:, None]
+        tp_hit = low <= target[:, None]
+    first_sl = np.where(sl_hit.any(axis=1), sl_hit.argmax(axis=1), hold)
+    first_tp = np.where(tp_hit.any(axis=1), tp_hit.argmax(axis=1), hold)
+
+    valid = ~np.isnan(close)
+    last_valid = hold - 1 - valid[:, ::-1].argmax(axis=1)
+    has_data = valid.any(axis=1)
+
+    is_sl = (first_sl <= first_tp) & (first_sl < hold)
+    is_tp = (first_tp < first_sl)
+    offset = np.where(is_sl, first_sl, np.where(is_tp, first_tp, last_valid))
+    exit_price = np.where(is_sl, stop, np.where(is_tp, target, close[np.arange(len(rows)), last_valid]))
+    reason = np.where(is_sl, "sl", np.where(is_tp, "tp", "timeout"))
+
+    keep = has_data
+    exit_col = cols + 1 + offset
+    if params.one_position:
+        keep &= _non_overlapping(rows, cols, exit_col)
+
+    ret = (entry - exit_price) / entry - 2 * params.fee
+    r_mult = (entry - exit_price) / (stop - entry)
+    trades = pd.DataFrame({
+        "symbol": np.asarray(market.symbols, dtype=object)[rows],
+        "entry_time": pd.to_datetime(market.time[cols], unit="s"),
+        "exit_time": pd.to_datetime(market.time[np.minimum(exit_col, len(market) - 1)], unit="s"),
+        "entry_price": entry,
+        "stop_loss": stop,
+        "take_profit": target,
+        "exit_price": exit_price,
+        "reason": reason,
+        "bars": offset + 1,
+        "return": ret,
+        "r_multiple": r_mult,
+    })[keep]
+    return trades.sort_values(["entry_time", "symbol"], kind="stable").reset_index(drop=True)
+
+
+def _non_overlapping(rows: np.ndarray, cols: np.ndarray, exit_col: np.ndarray) -> np.ndarray:
+    """Descarta sinais de um símbolo enquanto o trade anterior dele ainda está aberto."""
+    keep = np.zeros(len(rows), dtype=bool)
+    busy_until: Dict[int, int] = {}
+    # np.nonzero já devolve os sinais ordenados por símbolo e barra
+    for k in range(len(rows)):
+        if cols[k] > busy_until.get(rows[k], -1):
+            keep[k] = True
+            busy_until[rows[k]] = exit_col[k]
+    return keep
+
+
+def summarize(trades: pd.DataFrame) -> dict:
+    """Estatísticas agregadas dos trades (retornos em fração do preço de entrada)."""
+    n = len(trades)
+    if not n:
+        return {"trades": 0}
+    ret = trades["return"].to_numpy(dtype=np.float64)
+    wins, losses = ret[ret > 0], ret[ret <= 0]
+    equity = np.cumsum(ret[np.argsort(trades["exit_time"].to_numpy(), kind="stable")])
+    drawdown = np.maximum.accumulate(np.maximum(equity, 0)) - equity
+    return {
+        "trades": n,
+        "symbols": int(trades["symbol"].nunique()),
+        "win_rate": len(wins) / n,
+        "avg_return": float(ret.mean()),
+        "total_return": float(ret.sum()),
+        "profit_factor": float(wins.sum() / -losses.sum()) if losses.sum() < 0 else float("inf"),
+        "avg_r": float(trades["r_multiple"].mean()),
+        "max_drawdown": float(drawdown.max()),
+        "avg_bars": float(trades["bars"].mean()),
+        **{f"exits_{k}": int(v) for k, v in trades["reason"].value_counts().items()},
+    }
+
+
+def run_backtest(
+    market: MarketData,
+    params: BacktestParams = BacktestParams(),
+    trend_interval: str = TIMEFRAME_TREND,
+    chunk_symbols: int = BACKTEST_CHUNK_SYMBOLS
+) -> Tuple[pd.DataFrame, dict]:
+    """
+    Backtest do SHORT para todo o universo. Os símbolos são processados em blocos de
+    `chunk_symbols` para limitar as matrizes intermediárias; dentro de cada bloco não há
+    laço por barra. Retorna (trades, estatísticas).
+    """
+    parts = []
+    for start in range(0, len(market.symbols), chunk_symbols):
+        chunk = market.select(slice(start, start + chunk_symbols))
+        mask, resistance = signal_mask(chunk, params, trend_interval)
+        parts.append(simulate(chunk, mask, resistance, params))
+    trades = (
+        pd.concat(parts, ignore_index=True).sort_values(["entry_time", "symbol"], kind="stable")
+        .reset_index(drop=True) if parts else pd.DataFrame(columns=TRADE_COLUMNS)
+    )
+    return trades, summarize(trades)
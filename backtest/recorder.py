@@ -0,0 +1,75 @@
+# backtest/recorder.py
+
+import asyncio
+from typing import Dict, Iterable, Optional
+
+from config.settings import BACKTEST_DATA_DIR, BACKTEST_PAGE_BARS, _PERIODS
+from mexc.kline_cache import KlineCache
+from utils.logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+
+class HistoryRecorder:
+    """
+    Grava o histórico completo de klines para o backtest, em `<base_dir>/<intervalo>/<símbolo>.npz`
+    e sem limite de candles (o cache do screener guarda só os últimos KLINE_CACHE_MAX_BARS).
+    Busca direto na API em páginas de `page_bars` candles e, nas execuções seguintes,
+    continua a partir do último candle gravado.
+    """
+    def __init__(self, api, base_dir: str = BACKTEST_DATA_DIR, page_bars: int = BACKTEST_PAGE_BARS):
+        self.api = api
+        self.store = KlineCache(base_dir, max_bars=0)
+        self.page_bars = max(1, page_bars)
+
+    async def record(self, symbol: str, interval: str, start: int, end: int) -> int:
+        """Completa o histórico de `symbol` até `end`; retorna o nº de candles gravados."""
+        period = _PERIODS[interval]
+        stored = await asyncio.to_thread(self.store.load, symbol, interval)
+        resume = stored is not None and len(stored["time"]) > 0 and stored["time"][0] <= start + period
+        # o último candle gravado pode ter ficado aberto: é buscado de novo
+        cursor = int(stored["time"][-1]) if resume else start
+        merged = stored if resume else None
+
+        while cursor <= end:
+            page_end = min(end, cursor + (self.page_bars - 1) * period)
+            data = await self.api.fetch_klines(symbol, interval, cursor, page_end)
+            if data is None:
+                logger.warning(f"Histórico de {symbol} {interval} interrompido em {cursor}.")
+                break
+            fresh = KlineCache.to_arrays(data)
+            if len(fresh["time"]):
+                merged = KlineCache.merge(merged, fresh) if merged is not None else fresh
+            # sem candles na página (símbolo ainda não listado ou lacuna): segue para a próxima
+            cursor = page_end + period
+
+        if merged is None:
+            return 0
+        await asyncio.to_thread(self.store.save, symbol, interval, merged)
+        return len(merged["time"])
+
+    async def record_many(
+        self,
+        symbols: Iterable[str],
+        interval: str,
+        start: int,
+        end: int,
+        concurrency: int = 4
+    ) -> Dict[str, int]:
+        """`record` de vários símbolos, no máximo `concurrency` em paralelo."""
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def _one(sym: str) -> Optional[int]:
+            async with sem:
+                try:
+                    return await self.record(sym, interval, start, end)
+                except Exception as e:
+                    logger.warning(f"Erro gravando histórico de {sym}: {e}")
+                    return None
+
+        symbols = list(symbols)
+        counts = await asyncio.gather(*(_one(s) for s in symbols))
+        done = {s: c for s, c in zip(symbols, counts) if c}
+        logger.info(f"Histórico {interval}: {len(done)}/{len(symbols)} símbolos, "
+                    f"{sum(done.values())} candles.")
+        return done
@@ -0,0 +1,253 @@
+# backtest/sweep.py
+
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import BacktestParams, MarketData, run_backtest, summarize
+from config.settings import (
+    TIMEFRAME_TREND,
+    SWEEP_MAX_WORKERS,
+    SWEEP_WARMUP_BARS,
+    SWEEP_MIN_TRADES
+)
+from utils.logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# Espaço de busca padrão: os parâmetros "chutados" de signal_generator.py e settings
+DEFAULT_SPACE: Dict[str, Sequence] = {
+    "ema_short": (7, 9, 12),
+    "ema_long": (21, 34),
+    "rsi_period": (10, 14),
+    "macd_fast": (8, 12),
+    "macd_slow": (21, 26),
+    "resistance_window": (6, 8, 12),
+    "volume_mult": (0.6, 0.8, 1.0),
+    "rr_target": (1.0, 1.5, 2.0),
+}
+
+_ARRAYS = ("time", "open", "high", "low", "close", "volume")
+
+
+def _valid(params: BacktestParams) -> bool:
+    return params.ema_short < params.ema_long and params.macd_fast < params.macd_slow
+
+
+def grid(space: Dict[str, Sequence], base: BacktestParams = BacktestParams()) -> List[BacktestParams]:
+    """Todas as combinações do espaço (descarta EMA/MACD rápida >= lenta)."""
+    names = list(space)
+    combos = (base._replace(**dict(zip(names, values))) for values in itertools.product(*space.values()))
+    return [p for p in combos if _valid(p)]
+
+
+def random_search(
+    space: Dict[str, Sequence],
+    n: int,
+    seed: int = 0,
+    base: BacktestParams = BacktestParams()
+) -> List[BacktestParams]:
+    """`n` combinações distintas sorteadas do espaço."""
+    rng = random.Random(seed)
+    total = int(np.prod([len(v) for v in space.values()]))
+    seen, out = set(), []
+    for _ in range(total * 4):
+        if len(out) >= n:
+            break
+        p = base._replace(**{k: rng.choice(list(v)) for k, v in space.items()})
+        if p not in seen and _valid(p):
+            seen.add(p)
+            out.append(p)
+    return out
+
+
+def walk_forward(n_bars: int, train: int, test: int, step: Optional[int] = None) -> List[Tuple[slice, slice]]:
+    """Janelas (treino, teste) consecutivas; o teste começa onde o treino termina."""
+    step = step or test
+    folds = []
+    start = 0
+    while start + train + test <= n_bars:
+        folds.append((slice(start, start + train), slice(start + train, start + train + test)))
+        start += step
+    return folds
+
+
+class SharedMarket:
+    """
+    Publica as matrizes de um `MarketData` em memória compartilhada: os processos do
+    pool montam visões NumPy sobre os mesmos buffers em vez de receber cópias.
+    """
+    def __init__(self, market: MarketData):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.spec = {"symbols": market.symbols, "interval": market.interval, "arrays": {}}
+        for name in _ARRAYS:
+            src = np.ascontiguousarray(getattr(market, name))
+            block = shared_memory.SharedMemory(create=True, size=max(src.nbytes, 1))
+            np.ndarray(src.shape, dtype=src.dtype, buffer=block.buf)[...] = src
+            self._blocks.append(block)
+            self.spec["arrays"][name] = (block.name, src.shape, src.dtype.str)
+
+    @staticmethod
+    def attach(spec: dict) -> Tuple[MarketData, List[shared_memory.SharedMemory]]:
+        blocks, arrays = [], {}
+        for name, (block_name, shape, dtype) in spec["arrays"].items():
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        market = MarketData(spec["symbols"], spec["interval"], arrays["time"], arrays["open"],
+                            arrays["high"], arrays["low"], arrays["close"], arrays["volume"])
+        # os blocos precisam continuar referenciados enquanto as visões forem usadas
+        return market, blocks
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+# estado de cada processo do pool (preenchido pelo initializer)
+_worker_market: Optional[MarketData] = None
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _init_worker(spec: dict) -> None:
+    global _worker_market, _worker_blocks
+    _worker_market, _worker_blocks = SharedMarket.attach(spec)
+
+
+def evaluate(
+    market: MarketData,
+    params: BacktestParams,
+    bars: slice = slice(None),
+    warmup: int = 0,
+    trend_interval: str = TIMEFRAME_TREND
+) -> dict:
+    """
+    Estatísticas de `params` na janela `bars`. Os `warmup` candles anteriores entram no
+    cálculo dos indicadores, mas só contam trades abertos dentro da janela.
+    """
+    start, stop, _ = bars.indices(len(market))
+    first = max(start - warmup, 0)
+    trades, _ = run_backtest(market.window(first, stop), params, trend_interval)
+    if start > first and len(trades):
+        trades = trades[trades["entry_time"] >= pd.to_datetime(market.time[start], unit="s")]
+    return summarize(trades)
+
+
+def _evaluate_task(task: Tuple[BacktestParams, slice, int, str]) -> dict:
+    params, bars, warmup, trend_interval = task
+    return evaluate(_worker_market, params, bars, warmup, trend_interval)
+
+
+def _params_from_row(row: pd.Series) -> BacktestParams:
+    # a tabela guarda os valores como tipos NumPy; volta aos tipos dos padrões
+    defaults = BacktestParams._field_defaults
+    return BacktestParams(**{f: type(defaults[f])(row[f]) for f in BacktestParams._fields})
+
+
+def _rank(results: List[Tuple[BacktestParams, dict]], metric: str, min_trades: int) -> pd.DataFrame:
+    rows = [{**p._asdict(), **stats} for p, stats in results]
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    table["eligible"] = table["trades"] >= min_trades
+    metric_col = table[metric] if metric in table else pd.Series(np.nan, index=table.index)
+    table = table.assign(_score=metric_col.where(table["eligible"]))
+    table = table.sort_values(["_score", "trades"], ascending=[False, False], na_position="last")
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    return table.drop(columns="_score").reset_index(drop=True)
+
+
+class SweepRunner:
+    """
+    Avalia conjuntos de parâmetros em paralelo (um processo por núcleo) sobre o mesmo
+    `MarketData`, compartilhado via memória compartilhada.
+    """
+    def __init__(
+        self,
+        market: MarketData,
+        max_workers: int = SWEEP_MAX_WORKERS,
+        metric: str = "total_return",
+        min_trades: int = SWEEP_MIN_TRADES,
+        warmup: int = SWEEP_WARMUP_BARS,
+        trend_interval: str = TIMEFRAME_TREND
+    ):
+        self.market = market
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.metric = metric
+        self.min_trades = min_trades
+        self.warmup = warmup
+        self.trend_interval = trend_interval
+
+    def _map(self, tasks: List[Tuple[BacktestParams, slice, int, str]]) -> List[dict]:
+        if self.max_workers <= 1:
+            return [evaluate(self.market, p, b, w, t) for p, b, w, t in tasks]
+        shared = SharedMarket(self.market)
+        try:
+            with ProcessPoolExecutor(self.max_workers, initializer=_init_worker,
+                                     initargs=(shared.spec,)) as pool:
+                return list(pool.map(_evaluate_task, tasks, chunksize=max(1, len(tasks) // (self.max_workers * 4))))
+        finally:
+            shared.close()
+
+    def sweep(self, candidates: Iterable[BacktestParams], bars: slice = slice(None)) -> pd.DataFrame:
+        """Tabela ranqueada por `metric` (combinações com menos de `min_trades` vão ao fim)."""
+        candidates = list(candidates)
+        logger.info(f"Sweep: {len(candidates)} combinações em {self.max_workers} processos.")
+        stats = self._map([(p, bars, self.warmup, self.trend_interval) for p in candidates])
+        return _rank(list(zip(candidates, stats)), self.metric, self.min_trades)
+
+    def walk_forward(
+        self,
+        candidates: Iterable[BacktestParams],
+        train: int,
+        test: int,
+        step: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Para cada janela, escolhe os parâmetros no treino e mede o resultado fora da
+        amostra no teste seguinte. Retorna uma linha por janela; se nenhuma combinação
+        atingir `min_trades` no treino, a janela fica sem operação (`traded=False`, sem
+        parâmetros nem teste) em vez de operar com a primeira da tabela.
+        """
+        candidates = list(candidates)
+        folds = walk_forward(len(self.market), train, test, step)
+        # todas as avaliações de treino de todas as janelas num único lote do pool
+        tasks = [(p, tr, self.warmup, self.trend_interval) for tr, _ in folds for p in candidates]
+        train_stats = self._map(tasks)
+        best: Dict[int, BacktestParams] = {}
+        for k, (tr, te) in enumerate(folds):
+            ranked = _rank(list(zip(candidates, train_stats[k * len(candidates):(k + 1) * len(candidates)])),
+                           self.metric, self.min_trades)
+            if ranked.empty or not ranked["eligible"].any():
+                logger.info(f"Walk-forward: janela {k} sem combinação com {self.min_trades} trades; sem operação.")
+                continue
+            best[k] = _params_from_row(ranked.iloc[0])
+        test_stats = dict(zip(best, self._map(
+            [(p, folds[k][1], self.warmup, self.trend_interval) for k, p in best.items()]
+        )))
+
+        rows = []
+        for k, (tr, te) in enumerate(folds):
+            row = {
+                "fold": k,
+                "train_start": pd.to_datetime(self.market.time[tr.start], unit="s"),
+                "test_start": pd.to_datetime(self.market.time[te.start], unit="s"),
+                "test_end": pd.to_datetime(self.market.time[te.stop - 1], unit="s"),
+                "traded": k in best,
+            }
+            if k in best:
+                row.update(best[k]._asdict())
+                row.update({f"test_{name}": value for name, value in test_stats[k].items()})
+            else:
+                row.update(dict.fromkeys(BacktestParams._fields, np.nan))
+                row["test_trades"] = 0
+            rows.append(row)
+        return pd.DataFrame(rows)
@@ -0,0 +1,339 @@
+# bench/mexc_standin.py
+"""
+Servidor substituto da MEXC (HTTP + WebSocket) para benchmarks offline.
+
+Serve detalhes de contratos, tickers e klines a partir de fixtures gravadas ou,
+na falta delas, de dados sintéticos determinísticos, com latência, jitter e
+injeção de HTTP 429 configuráveis. O modo `record` captura o tráfego real da
+exchange para o diretório de fixtures.
+
+Uso:
+    python -m bench.mexc_standin serve --port 8088 --latency 0.05 --jitter 0.02 --error-rate 0.02
+    python -m bench.mexc_standin record --out bench/fixtures --symbols BTC_USDT,ETH_USDT
+
+Para apontar o bot para o servidor:
+    MEXC_BASE_URL=http://127.0.0.1:8088 MEXC_WS_URL=ws://127.0.0.1:8088/edge python main.py screener
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import zlib
+from typing import Dict, List, Optional
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from mexc.mexc_endpoints import MexcEndpoints
+
+# cópia local dos períodos: o servidor não importa config.settings (que exige o .env do bot)
+_PERIODS = {
+    "Min1": 60, "Min5": 300, "Min15": 900, "Min30": 1800, "Min60": 3600,
+    "Hour4": 14400, "Hour8": 28800, "Day1": 86400, "Week1": 604800,
+}
+MAX_KLINES = 2000  # máximo de candles por resposta, como na exchange
+
+
+class FixtureStore:
+    """
+    Fixtures em disco (`contract_detail.json`, `ticker.json`, `klines/<SYMBOL>_<interval>.json`),
+    com fallback para dados sintéticos determinísticos.
+    """
+    def __init__(self, base_dir: Optional[str] = None, n_symbols: int = 50):
+        self.base_dir = base_dir
+        self.n_symbols = n_symbols
+        self._contracts = self._read("contract_detail.json")
+        self._tickers = self._read("ticker.json")
+
+    def _read(self, name: str):
+        if not self.base_dir:
+            return None
+        path = os.path.join(self.base_dir, name)
+        if not os.path.isfile(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _seed(*parts) -> int:
+        return zlib.crc32(":".join(map(str, parts)).encode())
+
+    def _base_price(self, symbol: str) -> float:
+        return 0.01 + (self._seed(symbol) % 100000) / 100.0
+
+    def contracts(self) -> List[dict]:
+        if self._contracts is not None:
+            return self._contracts
+        return [
+            {"symbol": f"SYN{i:03d}_USDT", "baseCoin": f"SYN{i:03d}", "quoteCoin": "USDT", "futureType": 1}
+            for i in range(self.n_symbols)
+        ]
+
+    def tickers(self) -> List[dict]:
+        if self._tickers is not None:
+            return self._tickers
+        out = []
+        for c in self.contracts():
+            sym = c["symbol"]
+            seed = self._seed(sym, "ticker")
+            out.append({
+                "symbol": sym,
+                "lastPrice": self._base_price(sym),
+                "volume24": float(seed % 5_000_000),
+                "amount24": float(seed % 50_000_000),
+                "holdVol": float((seed >> 8) % 1_000_000),
+            })
+        return out
+
+    def klines(self, symbol: str, interval: str, start: Optional[int], end: Optional[int]) -> dict:
+        recorded = self._read(os.path.join("klines", f"{symbol}_{interval}.json"))
+        if recorded is not None:
+            times = np.asarray(recorded.get("time", []), dtype=np.int64)
+            mask = np.ones(len(times), dtype=bool)
+            if start is not None: mask &= times >= start
+            if end is not None:   mask &= times <= end
+            return {k: np.asarray(v)[mask].tolist() for k, v in recorded.items() if isinstance(v, list)}
+        return self.synthetic_klines(symbol, interval, start, end)
+
+    def synthetic_klines(self, symbol: str, interval: str, start: Optional[int], end: Optional[int]) -> dict:
+        """
+        Candles sintéticos determinísticos: o valor de cada candle depende só do símbolo,
+        do intervalo e do índice do candle, então janelas sobrepostas são consistentes.
+        """
+        period = _PERIODS.get(interval, 900)
+        end = int(end if end is not None else time.time())
+        start = int(start if start is not None else end - 200 * period)
+        first = -(-start // period)
+        last = end // period
+        idx = np.arange(max(first, last - MAX_KLINES + 1), last + 1, dtype=np.int64)
+        seed = self._seed(symbol, interval)
+        phase = (seed % 1000) / 100.0
+
+        def _noise(k: np.ndarray, salt: int) -> np.ndarray:
+            h = (k * 2654435761 + seed + salt * 40503) % (2 ** 32)
+            return h / 2 ** 32 - 0.5
+
+        base = self._base_price(symbol)
+        close = base * (1 + 0.05 * np.sin(idx / 17.0 + phase) + 0.02 * np.sin(idx / 5.3 + 2 * phase)
+                        + 0.01 * _noise(idx, 1))
+        open_ = np.concatenate([[close[0]], close[:-1]]) if len(close) else close
+        spread = np.abs(_noise(idx, 2)) * 0.01 * base
+        high = np.maximum(open_, close) + spread
+        low = np.minimum(open_, close) - spread
+        vol = 1000 + np.abs(_noise(idx, 3)) * 10000
+        return {
+            "time": (idx * period).tolist(),
+            "open": open_.round(6).tolist(), "high": high.round(6).tolist(),
+            "low": low.round(6).tolist(), "close": close.round(6).tolist(),
+            "vol": vol.round(2).tolist(), "amount": (vol * close).round(2).tolist(),
+        }
+
+
+class MexcStandIn:
+    """Aplicação aiohttp que imita os endpoints públicos de contratos da MEXC."""
+    def __init__(
+        self,
+        store: FixtureStore,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: float = 1.0,
+        push_interval: float = 1.0,
+        seed: Optional[int] = None
+    ):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.push_interval = push_interval
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, int] = {"requests": 0, "throttled": 0, "ws_connections": 0}
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get(MexcEndpoints.FUTURES_CONTRACTS, self.contract_detail)
+        app.router.add_get(MexcEndpoints.TICKER, self.ticker)
+        app.router.add_get(MexcEndpoints.KLINES + "/{symbol}", self.kline)
+        app.router.add_get(MexcEndpoints.PING, self.ping)
+        app.router.add_get("/edge", self.websocket)
+        app.router.add_get("/_stats", self.stats_handler)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        if request.path in ("/edge", "/_stats"):
+            return await handler(request)
+        self.stats["requests"] += 1
+        delay = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.stats["throttled"] += 1
+            return web.json_response(
+                {"success": False, "code": 429, "message": "Too Many Requests"},
+                status=429, headers={"Retry-After": str(self.retry_after)}
+            )
+        return await handler(request)
+
+    @staticmethod
+    def _ok(data) -> web.Response:
+        return web.json_response({"success": True, "code": 0, "data": data})
+
+    async def contract_detail(self, request):
+        return self._ok(self.store.contracts())
+
+    async def ticker(self, request):
+        tickers = self.store.tickers()
+        symbol = request.query.get("symbol")
+        if symbol:
+            match = next((t for t in tickers if t.get("symbol") == symbol), None)
+            if match is None:
+                return web.json_response({"success": False, "code": 1001, "message": "contract not exist"})
+            return self._ok(match)
+        return self._ok(tickers)
+
+    async def kline(self, request):
+        q = request.query
+        data = self.store.klines(
+            request.match_info["symbol"], q.get("interval", "Min1"),
+            int(q["start"]) if "start" in q else None,
+            int(q["end"]) if "end" in q else None
+        )
+        return self._ok(data)
+
+    async def ping(self, request):
+        return self._ok(int(time.time() * 1000))
+
+    async def stats_handler(self, request):
+        return web.json_response(self.stats)
+
+    async def websocket(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats["ws_connections"] += 1
+        subs: Dict[str, dict] = {}
+        pusher = asyncio.create_task(self._push_loop(ws, subs))
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                req = json.loads(msg.data)
+                method, param = req.get("method"), req.get("param") or {}
+                if method == "ping":
+                    await ws.send_json({"channel": "pong", "data": int(time.time() * 1000)})
+                elif method in ("sub.kline", "sub.ticker"):
+                    subs[f"{method}:{param.get('symbol')}:{param.get('interval', '')}"] = {"method": method, **param}
+                    await ws.send_json({"channel": f"rs.{method}", "data": "success"})
+                elif method in ("unsub.kline", "unsub.ticker"):
+                    subs.pop(f"sub.{method[6:]}:{param.get('symbol')}:{param.get('interval', '')}", None)
+                    await ws.send_json({"channel": f"rs.{method}", "data": "success"})
+        finally:
+            pusher.cancel()
+        return ws
+
+    async def _push_loop(self, ws, subs: Dict[str, dict]) -> None:
+        while not ws.closed:
+            await asyncio.sleep(self.push_interval)
+            now = int(time.time())
+            for sub in list(subs.values()):
+                sym = sub["symbol"]
+                if sub["method"] == "sub.kline":
+                    interval = sub.get("interval", "Min1")
+                    # janela de um período: contém o candle aberto atual
+                    k = self.store.synthetic_klines(sym, interval, now - _PERIODS.get(interval, 900), now)
+                    data = {"symbol": sym, "interval": interval, "t": k["time"][-1],
+                            "o": k["open"][-1], "h": k["high"][-1], "l": k["low"][-1],
+                            "c": k["close"][-1], "q": k["vol"][-1], "a": k["amount"][-1]}
+                    await ws.send_json({"channel": "push.kline", "data": data, "symbol": sym, "ts": now * 1000})
+                else:
+                    t = next((t for t in self.store.tickers() if t["symbol"] == sym), {"symbol": sym})
+                    await ws.send_json({"channel": "push.ticker", "data": t, "symbol": sym, "ts": now * 1000})
+
+
+async def record(out_dir: str, symbols: List[str], intervals: List[str], bars: int, base_url: str) -> None:
+    """Grava respostas reais da exchange como fixtures para o servidor substituto."""
+    os.makedirs(os.path.join(out_dir, "klines"), exist_ok=True)
+    now = int(time.time())
+    async with aiohttp.ClientSession() as http:
+        async def _get(path: str, params: dict = None):
+            async with http.get(f"{base_url}{path}", params=params) as resp:
+                resp.raise_for_status()
+                return (await resp.json()).get("data")
+
+        contracts = await _get(MexcEndpoints.FUTURES_CONTRACTS)
+        tickers = await _get(MexcEndpoints.TICKER)
+        if symbols:
+            contracts = [c for c in contracts if c.get("symbol") in symbols]
+            tickers = [t for t in tickers if t.get("symbol") in symbols]
+        for name, data in (("contract_detail.json", contracts), ("ticker.json", tickers)):
+            with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+                json.dump(data, f)
+
+        for c in contracts:
+            sym = c["symbol"]
+            for interval in intervals:
+                period = _PERIODS.get(interval, 900)
+                data = await _get(
+                    f"{MexcEndpoints.KLINES}/{sym}",
+                    {"interval": interval, "start": now - bars * period, "end": now}
+                )
+                with open(os.path.join(out_dir, "klines", f"{sym}_{interval}.json"), "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+    print(f"{len(contracts)} contratos gravados em {out_dir}")
+
+
+async def serve(args) -> None:
+    standin = MexcStandIn(
+        FixtureStore(args.fixtures, args.symbols),
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        retry_after=args.retry_after, push_interval=args.push_interval, seed=args.seed
+    )
+    runner = web.AppRunner(standin.app())
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"MEXC substituta em http://{args.host}:{args.port} (WS em /edge)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor substituto da MEXC para benchmarks offline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="Serve fixtures/dados sintéticos")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8088)
+    p_serve.add_argument("--fixtures", default=None, help="Diretório de fixtures (opcional)")
+    p_serve.add_argument("--symbols", type=int, default=50, help="Nº de contratos sintéticos")
+    p_serve.add_argument("--latency", type=float, default=0.0, help="Latência base (s)")
+    p_serve.add_argument("--jitter", type=float, default=0.0, help="Jitter da latência (s)")
+    p_serve.add_argument("--error-rate", type=float, default=0.0, help="Probabilidade de HTTP 429")
+    p_serve.add_argument("--retry-after", type=float, default=1.0, help="Retry-After dos 429 (s)")
+    p_serve.add_argument("--push-interval", type=float, default=1.0, help="Intervalo dos push WS (s)")
+    p_serve.add_argument("--seed", type=int, default=None)
+
+    p_rec = sub.add_parser("record", help="Grava tráfego real como fixtures")
+    p_rec.add_argument("--out", required=True)
+    p_rec.add_argument("--symbols", default="", help="Lista separada por vírgula (vazio = todos)")
+    p_rec.add_argument("--intervals", default="Min15,Min60")
+    p_rec.add_argument("--bars", type=int, default=200)
+    p_rec.add_argument("--base-url", default="https://contract.mexc.com")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        asyncio.run(serve(args))
+    else:
+        symbols = [s.strip() for s in args.symbols.split(",") if s.strip()]
+        intervals = [i.strip() for i in args.intervals.split(",") if i.strip()]
+        asyncio.run(record(args.out, symbols, intervals, args.bars, args.base_url))
+
+
+if __name__ == "__main__":
+    main()
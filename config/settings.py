@@ -24,8 +24,31 @@ def _get_env(name: str, default: str = None) -> str:
 # --- Configurações da API MEXC ---
 MEXC_API_KEY      = _get_env("MEXC_API_KEY")
 MEXC_SECRET_KEY   = _get_env("MEXC_SECRET_KEY")
-MEXC_BASE_URL     = "https://contract.mexc.com"
+MEXC_BASE_URL     = _get_env("MEXC_BASE_URL", "https://contract.mexc.com")
 MEXC_WS_URL       = _get_env("MEXC_WS_URL", "wss://contract.mexc.com/edge")
+# Sessão HTTP de longa duração: limite de conexões (total/por host), TTL do cache DNS (s),
+# keep-alive (s) e nº de conexões pré-aquecidas antes de cada execução agendada.
+# O keep-alive só cobre uma varredura: entre execuções do scheduler as conexões ociosas
+# fecham e `warmup` as reabre; o que sobrevive é o cache DNS (padrão: dois intervalos).
+HTTP_POOL_LIMIT          = int(_get_env("HTTP_POOL_LIMIT", "50"))
+HTTP_POOL_LIMIT_PER_HOST = int(_get_env("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_DNS_CACHE_TTL       = int(_get_env(
+    "HTTP_DNS_CACHE_TTL", str(int(_get_env("SCHEDULER_INTERVAL_MINUTES", "60")) * 120)
+))
+HTTP_KEEPALIVE_TIMEOUT   = float(_get_env("HTTP_KEEPALIVE_TIMEOUT", "120"))
+HTTP_WARMUP_CONNECTIONS  = int(_get_env("HTTP_WARMUP_CONNECTIONS", "10"))
+# Pool de WebSockets: ping (s), assinaturas por socket, nº de sockets, lote de sub.* e backoff máximo (s)
+WS_PING_INTERVAL        = float(_get_env("WS_PING_INTERVAL", "15"))
+WS_MAX_SUBS_PER_CONN    = int(_get_env("WS_MAX_SUBS_PER_CONN", "200"))
+WS_MAX_CONNECTIONS      = int(_get_env("WS_MAX_CONNECTIONS", "4"))
+WS_SUB_BATCH_SIZE       = int(_get_env("WS_SUB_BATCH_SIZE", "50"))
+WS_RECONNECT_MAX_DELAY  = float(_get_env("WS_RECONNECT_MAX_DELAY", "30"))
+# Limite de requisições por endpoint (token bucket) e backoff de retentativas
+MEXC_RATE_LIMIT_PER_SEC = float(_get_env("MEXC_RATE_LIMIT_PER_SEC", "10"))
+MEXC_RATE_LIMIT_BURST   = float(_get_env("MEXC_RATE_LIMIT_BURST", "20"))
+MEXC_MAX_RETRIES        = int(_get_env("MEXC_MAX_RETRIES", "3"))
+MEXC_BACKOFF_BASE       = float(_get_env("MEXC_BACKOFF_BASE", "0.5"))
+MEXC_BACKOFF_MAX        = float(_get_env("MEXC_BACKOFF_MAX", "10"))
 
 
 # --- Configurações do Telegram ---
@@ -41,6 +64,51 @@ MIN_OPEN_INTEREST_USD = float(_get_env("MIN_OPEN_INTEREST_USD", "1000"))
 TIMEFRAME_TREND       = _get_env("TIMEFRAME_TREND", "Min60")
 TIMEFRAME_ENTRY       = _get_env("TIMEFRAME_ENTRY", "Min15")
 CANDLE_LIMIT          = int(_get_env("CANDLE_LIMIT", "200"))
+# Timeframes derivados por reamostragem do TIMEFRAME_ENTRY em vez de buscados na API
+# (lista separada por vírgula, ex.: "Min60"); os demais continuam sendo buscados
+DERIVED_TIMEFRAMES    = {tf.strip() for tf in _get_env("DERIVED_TIMEFRAMES", "").split(",") if tf.strip()}
+# Pipeline concorrente por símbolo: nº de símbolos analisados em paralelo e timeout (s) por símbolo
+SCREENER_MAX_WORKERS    = int(_get_env("SCREENER_MAX_WORKERS", "10"))
+SCREENER_SYMBOL_TIMEOUT = float(_get_env("SCREENER_SYMBOL_TIMEOUT", "30"))
+# Avaliação dos sinais: "pipeline" (símbolo a símbolo), "vector" (universo inteiro de uma vez)
+# ou "process" (lotes avaliados num pool de processos)
+SCREENER_EVAL_MODE      = _get_env("SCREENER_EVAL_MODE", "pipeline").lower()
+# Modo "process": processos do pool (0 = nº de núcleos) e símbolos por lote enviado a cada processo
+SCREENER_PROCESS_WORKERS = int(_get_env("SCREENER_PROCESS_WORKERS", "0"))
+SCREENER_PROCESS_BATCH   = int(_get_env("SCREENER_PROCESS_BATCH", "25"))
+# Modo streaming: máximo de avaliações pendentes (candles de entrada fechados aguardando
+# `evaluate`); acima disso o símbolo é descartado até o próximo fechamento
+STREAM_EVAL_QUEUE_SIZE   = int(_get_env("STREAM_EVAL_QUEUE_SIZE", "1000"))
+# Condição extra sobre o gatilho, na linguagem de screener/rule_dsl.py (vazio = só o gatilho
+# padrão), ex.: "rsi(14) < 40 and close < ema(50)"; `resistance` é o nível do trend
+SCREENER_TRIGGER_RULE    = _get_env("SCREENER_TRIGGER_RULE", "")
+
+# Veredito de trend (contexto + resistência sobre candles fechados) reaproveitado pelo
+# scheduler até o próximo candle de TIMEFRAME_TREND fechar
+TREND_CACHE_ENABLED     = _get_env("TREND_CACHE_ENABLED", "false").lower() == "true"
+
+# Cache local de klines (arquivos .npz por símbolo/intervalo), atualizado de forma incremental
+KLINE_CACHE_ENABLED   = _get_env("KLINE_CACHE_ENABLED", "true").lower() == "true"
+KLINE_CACHE_DIR       = _get_env("KLINE_CACHE_DIR", "data/klines")
+KLINE_CACHE_MAX_BARS  = int(_get_env("KLINE_CACHE_MAX_BARS", "1000"))
+
+# Backtest sobre klines armazenadas: duração máxima do trade (em candles de entrada),
+# custo por lado (fração do preço) e nº de símbolos processados por bloco (limita a memória)
+BACKTEST_MAX_HOLD_BARS = int(_get_env("BACKTEST_MAX_HOLD_BARS", "96"))
+BACKTEST_FEE           = float(_get_env("BACKTEST_FEE", "0.0004"))
+BACKTEST_CHUNK_SYMBOLS = int(_get_env("BACKTEST_CHUNK_SYMBOLS", "100"))
+# Histórico completo (sem o corte de KLINE_CACHE_MAX_BARS) gravado por `main.py record`:
+# diretório, dias gravados e candles por requisição à API
+BACKTEST_DATA_DIR      = _get_env("BACKTEST_DATA_DIR", "data/history")
+BACKTEST_HISTORY_DAYS  = int(_get_env("BACKTEST_HISTORY_DAYS", "365"))
+BACKTEST_PAGE_BARS     = int(_get_env("BACKTEST_PAGE_BARS", "2000"))
+# Sweep de parâmetros: processos (0 = nº de núcleos), candles de aquecimento dos indicadores
+# antes de cada janela e mínimo de trades para uma combinação entrar no ranking
+SWEEP_MAX_WORKERS      = int(_get_env("SWEEP_MAX_WORKERS", "0"))
+SWEEP_WARMUP_BARS      = int(_get_env("SWEEP_WARMUP_BARS", "500"))
+SWEEP_MIN_TRADES       = int(_get_env("SWEEP_MIN_TRADES", "30"))
+# nº de combinações sorteadas do espaço padrão (0 = grade completa)
+SWEEP_SAMPLES          = int(_get_env("SWEEP_SAMPLES", "200"))
 
 # --- Cálculo dinâmico de timestamps para consulta de klines ---
 # Mapeia cada timeframe ao seu período em segundos
@@ -78,6 +146,8 @@ MACD_FAST_PERIOD   = int(_get_env("MACD_FAST_PERIOD", "12"))
 MACD_SLOW_PERIOD   = int(_get_env("MACD_SLOW_PERIOD", "26"))
 MACD_SIGNAL_PERIOD = int(_get_env("MACD_SIGNAL_PERIOD", "9"))
 VOLUME_MA_PERIOD   = int(_get_env("VOLUME_MA_PERIOD", "20"))
+# Memória máxima (MB, estimada) dos indicadores memoizados por série no IndicatorKernel
+INDICATOR_CACHE_MAX_MB = float(_get_env("INDICATOR_CACHE_MAX_MB", "64"))
 
 
 # --- Configurações de Logging ---
@@ -92,3 +162,29 @@ NEWS_API_KEY: str = os.getenv("NEWS_API_KEY", "")
 NEWS_LOOKBACK_DAYS: int = int(os.getenv("NEWS_LOOKBACK_DAYS", 1))
 NEWS_PAGE_SIZE: int = int(os.getenv("NEWS_PAGE_SIZE", 5))
 
+# Respostas da NewsAPI reaproveitadas por consulta/ativo: validade em segundos e máximo de
+# entradas guardadas (LRU); poupa a cota diária da API. A validade padrão é 1,5 intervalo do
+# scheduler: a execução seguinte reaproveita as notícias e a próxima depois dela as renova
+NEWS_CACHE_TTL_SECONDS: int = int(_get_env("NEWS_CACHE_TTL_SECONDS", str(SCHEDULER_INTERVAL_MINUTES * 90)))
+NEWS_CACHE_MAX_ENTRIES: int = int(_get_env("NEWS_CACHE_MAX_ENTRIES", "512"))
+NEWS_HTTP_TIMEOUT: float = float(_get_env("NEWS_HTTP_TIMEOUT", "10"))
+# Orçamento de requisições da NewsAPI (plano gratuito: 100/dia): cota diária (dia UTC),
+# cota por janela deslizante (espalha o consumo ao longo do dia) e espera após HTTP 429,
+# dobrada a cada 429 seguido até o máximo
+NEWS_DAILY_QUOTA: int = int(_get_env("NEWS_DAILY_QUOTA", "100"))
+NEWS_WINDOW_QUOTA: int = int(_get_env("NEWS_WINDOW_QUOTA", "4"))
+NEWS_WINDOW_SECONDS: int = int(_get_env("NEWS_WINDOW_SECONDS", "3600"))
+NEWS_BACKOFF_SECONDS: float = float(_get_env("NEWS_BACKOFF_SECONDS", "300"))
+NEWS_BACKOFF_MAX_SECONDS: float = float(_get_env("NEWS_BACKOFF_MAX_SECONDS", "21600"))
+# Sentimento memoizado por hash do texto normalizado: entradas em memória (LRU) e arquivo
+# SQLite que mantém os resultados entre reinícios ("" = só em memória), limitado às
+# SENTIMENT_STORE_MAX_ROWS gravações mais recentes (0 = sem limite)
+SENTIMENT_CACHE_MAX_ENTRIES: int = int(_get_env("SENTIMENT_CACHE_MAX_ENTRIES", "10000"))
+SENTIMENT_STORE_PATH: str = _get_env("SENTIMENT_STORE_PATH", "data/sentiment.sqlite3")
+SENTIMENT_STORE_MAX_ROWS: int = int(_get_env("SENTIMENT_STORE_MAX_ROWS", "200000"))
+# Análise de sentimento fora do event loop: pool "thread" ou "process", nº de workers
+# (0 = automático), textos por tarefa enviada ao pool e máximo de lotes em voo no pool
+SENTIMENT_EXECUTOR: str = _get_env("SENTIMENT_EXECUTOR", "thread").lower()
+SENTIMENT_MAX_WORKERS: int = int(_get_env("SENTIMENT_MAX_WORKERS", "0"))
+SENTIMENT_BATCH_SIZE: int = int(_get_env("SENTIMENT_BATCH_SIZE", "64"))
+SENTIMENT_MAX_INFLIGHT_BATCHES: int = int(_get_env("SENTIMENT_MAX_INFLIGHT_BATCHES", "8"))
@@ -1,37 +1,200 @@
+import asyncio
 import os
-from typing import List, Dict, Any
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 import httpx
+from config.settings import NEWS_CACHE_TTL_SECONDS, NEWS_CACHE_MAX_ENTRIES, NEWS_HTTP_TIMEOUT
+from external_data.news_budget import NewsBudget
 from utils.logger import AppLogger
+from utils.ttl_cache import TTLCache
 
 logger = AppLogger(__name__).get_logger()
 
+# Limites da NewsAPI: tamanho do parâmetro `q` e artigos por página
+MAX_QUERY_CHARS = 500
+MAX_PAGE_SIZE = 100
+# tickers até esse tamanho (AI, OP...) só contam na forma $TICKER: sozinhos são palavras comuns
+SHORT_TICKER_LEN = 2
+
+
+def base_asset(symbol: str) -> str:
+    """Ativo base de um contrato (BTC_USDT -> BTC)."""
+    return symbol.split("_")[0]
+
+
+def build_queries(terms: List[str], max_chars: int = MAX_QUERY_CHARS) -> List[Tuple[str, List[str]]]:
+    """
+    Agrupa os termos em consultas `"A" OR "B" OR ...` de até `max_chars` caracteres.
+    Retorna [(consulta, termos da consulta)].
+    """
+    queries, current = [], []
+    for term in terms:
+        candidate = current + [term]
+        if current and len(" OR ".join(f'"{t}"' for t in candidate)) > max_chars:
+            queries.append(current)
+            candidate = [term]
+        current = candidate
+    if current:
+        queries.append(current)
+    return [(" OR ".join(f'"{t}"' for t in group), group) for group in queries]
+
+
+@lru_cache(maxsize=256)
+def _matcher(terms: Tuple[str, ...]) -> "re.Pattern":
+    # Sensível a maiúsculas: o ticker em caixa alta (ONE, NEAR, GAS), não a palavra comum
+    # ("one", "near-term", "gas prices"). Termos mais longos primeiro: a alternância pega o
+    # nome inteiro quando um é prefixo do outro.
+    ordered = sorted(terms, key=len, reverse=True)
+    alternatives = [
+        (r"\$" if len(t) <= SHORT_TICKER_LEN else r"(?<![$\w])\$?") + re.escape(t)
+        for t in ordered
+    ]
+    return re.compile(r"(?<!\w)(?:" + "|".join(alternatives) + r")(?!\w)")
+
+
+def match_articles(
+    articles: List[Dict[str, Any]],
+    terms: List[str],
+    per_term: int
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Distribui os artigos entre os termos citados no título ou na descrição (até `per_term` cada)."""
+    pattern = _matcher(tuple(terms))
+    out: Dict[str, List[Dict[str, Any]]] = {t: [] for t in terms}
+    for article in articles:
+        text = f"{article.get('title') or ''} {article.get('description') or ''}"
+        for found in {m.lstrip("$") for m in pattern.findall(text)}:
+            bucket = out[found]
+            if len(bucket) < per_term:
+                bucket.append(article)
+    return out
+
+
+def _retry_after(response) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
 class NewsAPIWrapper:
     """
     Wrapper para NewsAPI.org que evita poluir o log com múltiplos erros de rate-limit:
     - Sucesso de fetch agora vai para DEBUG
-    - Ao receber HTTP 429 (rate limit), emite apenas UMA mensagem de erro e silencia as próximas chamadas
+    - Requisições limitadas por um NewsBudget (cotas diária e por janela); ao receber HTTP 429
+      emite UMA mensagem de erro e suspende as chamadas até o fim do recuo
+    - Um único cliente HTTP (pool de conexões) por instância, criado na primeira chamada
+    - Respostas guardadas num TTLCache por (consulta, idioma, nº de artigos)
     """
-    def __init__(self, api_key: str = None):
+    def __init__(
+        self,
+        api_key: str = None,
+        cache: Optional[TTLCache] = None,
+        budget: Optional[NewsBudget] = None
+    ):
         self.api_key = api_key or os.getenv("NEWS_API_KEY")
         self.base_url = "https://newsapi.org/v2/everything"
-        self._rate_limited = False  # flag para suprimir logs repetidos de 429
+        self.budget = budget or NewsBudget()
+        self.cache = cache if cache is not None else TTLCache(NEWS_CACHE_MAX_ENTRIES, NEWS_CACHE_TTL_SECONDS)
+        self._http: Optional[httpx.AsyncClient] = None
 
         if not self.api_key:
             logger.warning("NEWS_API_KEY não configurada. Funcionalidade de notícias limitada.")
 
+    def _client(self) -> httpx.AsyncClient:
+        # keep-alive: consultas seguintes reaproveitam a conexão TLS já aberta
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=NEWS_HTTP_TIMEOUT)
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def fetch_news_batch(
+        self,
+        symbols: List[str],
+        language: str = "en",
+        page_size: int = 5
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Notícias de vários símbolos com poucas requisições: os ativos base são combinados
+        em consultas OR e cada artigo retornado vai para os símbolos que ele menciona.
+        Retorna {símbolo: até `page_size` artigos}, com todos os símbolos presentes.
+        `symbols` vem em ordem de prioridade: com pouco orçamento, as consultas dos primeiros
+        são feitas e as dos últimos ficam sem notícias.
+
+        O cache guarda os artigos de cada ativo base (a composição das consultas muda a
+        cada execução); só os ativos sem entrada válida entram nas consultas.
+        """
+        by_term: Dict[str, List[str]] = {}
+        for sym in symbols:
+            by_term.setdefault(base_asset(sym), []).append(sym)
+
+        matched: Dict[str, List[Dict[str, Any]]] = {}
+        pending = []
+        for term in by_term:
+            cached = self.cache.get(("term", term, language, page_size))
+            if cached is not None:
+                matched[term] = cached
+            else:
+                pending.append(term)
+
+        queries = build_queries(pending)
+        responses = await asyncio.gather(*(
+            self._request(query, language, min(MAX_PAGE_SIZE, page_size * len(terms)))
+            for query, terms in queries
+        ))
+        for (_, terms), articles in zip(queries, responses):
+            if articles is None:
+                continue  # falha ou sem orçamento: nada vai para o cache
+            for term, found in match_articles(articles, terms, page_size).items():
+                self.cache.put(("term", term, language, page_size), found)
+                matched[term] = found
+
+        out: Dict[str, List[Dict[str, Any]]] = {sym: [] for sym in symbols}
+        for term, found in matched.items():
+            for sym in by_term[term]:
+                out[sym] = found
+        logger.debug(
+            f"[NewsAPI] {len(symbols)} símbolos: {len(by_term) - len(pending)} ativos do cache, "
+            f"{len(queries)} consulta(s)"
+        )
+        return out
+
     async def fetch_news(
         self,
         query: str,
         language: str = "en",
         page_size: int = 5
     ) -> List[Dict[str, Any]]:
-        # se já estamos em rate limit, não faz mais chamadas
-        if self._rate_limited:
+        key = (query, language, page_size)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        articles = await self._request(query, language, page_size)
+        if articles is None:
             return []
+        # só respostas válidas entram no cache (inclusive sem artigos); erros não
+        self.cache.put(key, articles)
+        return articles
 
+    async def _request(
+        self,
+        query: str,
+        language: str,
+        page_size: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Uma chamada à NewsAPI; None em erro ou sem orçamento (resultado não cacheável)."""
         if not self.api_key:
             logger.error("API Key da NewsAPI não fornecida.")
-            return []
+            return None
+
+        # sem saldo (cota esgotada ou recuo após 429): não faz a chamada
+        if not self.budget.try_acquire():
+            logger.debug(f"[NewsAPI] orçamento esgotado; '{query}' ignorada")
+            return None
 
         params = {
             "q": query,
@@ -41,34 +204,35 @@ class NewsAPIWrapper:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                articles = data.get("articles", [])
+            response = await self._client().get(self.base_url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            articles = data.get("articles", [])
 
-                # Sucesso em nível DEBUG para não poluir o INFO
-                logger.debug(f"[NewsAPI] {len(articles)} artigos para '{query}'")
-                return articles
+            # Sucesso em nível DEBUG para não poluir o INFO
+            logger.debug(f"[NewsAPI] {len(articles)} artigos para '{query}'")
+            self.budget.on_success()
+            return articles
 
         except httpx.HTTPStatusError as e:
             status = e.response.status_code
             if status == 429:
-                # só registra uma vez
-                logger.error(
-                    "NewsAPI rate limit atingido (429). Aplicação não fará mais requisições de notícias."
-                )
-                self._rate_limited = True
+                # 429 de requisições que já estavam em voo não prolongam o recuo nem repetem o log
+                if not self.budget.rate_limited():
+                    delay = self.budget.on_rate_limited(_retry_after(e.response))
+                    logger.error(
+                        f"NewsAPI rate limit atingido (429). Notícias suspensas por {delay:.0f}s."
+                    )
             else:
                 logger.error(f"HTTP {status} em NewsAPI para '{query}'.")
-            return []
+            return None
 
         except httpx.RequestError as e:
             # problemas de rede ou DNS
             logger.error(f"Erro de requisição na NewsAPI para '{query}': {e}")
-            return []
+            return None
 
         except Exception as e:
             # qualquer outro erro inesperado
             logger.error(f"Erro inesperado na NewsAPI para '{query}': {e}")
-            return []
+            return None
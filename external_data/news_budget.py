@@ -0,0 +1,92 @@
+# external_data/news_budget.py
+
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from config.settings import (
+    NEWS_DAILY_QUOTA,
+    NEWS_WINDOW_QUOTA,
+    NEWS_WINDOW_SECONDS,
+    NEWS_BACKOFF_SECONDS,
+    NEWS_BACKOFF_MAX_SECONDS
+)
+
+_DAY = 86400
+
+
+class NewsBudget:
+    """
+    Orçamento de requisições da NewsAPI: cota por dia (UTC) e por janela deslizante de
+    `window_seconds`. Após um HTTP 429 as requisições ficam suspensas por um intervalo
+    que dobra a cada 429 seguido (ou pelo Retry-After) e voltam sozinhas depois dele;
+    a primeira resposta bem-sucedida zera o recuo.
+
+    Quem consome decide a prioridade: `try_acquire` atende na ordem das chamadas, então
+    os símbolos mais importantes devem pedir primeiro.
+    """
+    def __init__(
+        self,
+        daily_quota: int = NEWS_DAILY_QUOTA,
+        window_quota: int = NEWS_WINDOW_QUOTA,
+        window_seconds: float = NEWS_WINDOW_SECONDS,
+        backoff: float = NEWS_BACKOFF_SECONDS,
+        max_backoff: float = NEWS_BACKOFF_MAX_SECONDS,
+        clock: Callable[[], float] = time.time
+    ):
+        self.daily_quota = daily_quota
+        self.window_quota = window_quota
+        self.window_seconds = window_seconds
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self._day = int(clock() // _DAY)
+        self.used_today = 0
+        self._recent: deque = deque()    # instantes das requisições dentro da janela
+        self.blocked_until = 0.0
+        self.strikes = 0                 # 429 seguidos
+
+    def _roll(self, now: float) -> None:
+        day = int(now // _DAY)
+        if day != self._day:
+            self._day, self.used_today = day, 0
+        while self._recent and self._recent[0] <= now - self.window_seconds:
+            self._recent.popleft()
+
+    def rate_limited(self) -> bool:
+        """True durante o recuo após um 429."""
+        return self.clock() < self.blocked_until
+
+    def remaining(self) -> int:
+        """Requisições que podem ser feitas agora (0 durante o recuo após 429)."""
+        now = self.clock()
+        self._roll(now)
+        if self.rate_limited():
+            return 0
+        return max(0, min(self.daily_quota - self.used_today, self.window_quota - len(self._recent)))
+
+    def remaining_today(self) -> int:
+        """Saldo da cota diária, ignorando janela e recuo."""
+        self._roll(self.clock())
+        return max(0, self.daily_quota - self.used_today)
+
+    def try_acquire(self) -> bool:
+        """Consome uma requisição do orçamento; False se não houver saldo."""
+        if self.remaining() <= 0:
+            return False
+        now = self.clock()
+        self.used_today += 1
+        self._recent.append(now)
+        return True
+
+    def on_success(self) -> None:
+        self.strikes = 0
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """Registra um 429 e retorna por quantos segundos as requisições ficam suspensas."""
+        delay = min(self.max_backoff, self.backoff * 2 ** self.strikes)
+        if retry_after:
+            delay = max(delay, retry_after)
+        self.strikes += 1
+        self.blocked_until = self.clock() + delay
+        return delay
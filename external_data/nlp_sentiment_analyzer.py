@@ -1,25 +1,200 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from textblob import TextBlob
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from config.settings import (
+    SENTIMENT_CACHE_MAX_ENTRIES,
+    SENTIMENT_STORE_PATH,
+    SENTIMENT_EXECUTOR,
+    SENTIMENT_MAX_WORKERS,
+    SENTIMENT_BATCH_SIZE,
+    SENTIMENT_MAX_INFLIGHT_BATCHES
+)
+from external_data.sentiment_store import SentimentStore, Score
 from utils.logger import AppLogger
+from utils.ttl_cache import TTLCache
 
 logger = AppLogger(__name__).get_logger()
 
+
+def normalize_text(text: str) -> str:
+    """Texto sem espaços repetidos nem nas pontas (não altera o sentimento do TextBlob)."""
+    return " ".join(text.split())
+
+
+def text_key(text: str) -> str:
+    """Chave de memoização: hash do texto normalizado."""
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def score_text(text: str) -> Score:
+    """(polaridade, subjetividade) do TextBlob; `.sentiment` é calculado uma vez só."""
+    sentiment = TextBlob(normalize_text(text)).sentiment
+    return sentiment.polarity, sentiment.subjectivity
+
+
+def score_batch(texts: List[str]) -> List[Score]:
+    """`score_text` de um lote (tarefa executada no pool)."""
+    return [score_text(t) for t in texts]
+
+
+def _article_texts(articles: List[Dict[str, Any]]) -> List[str]:
+    texts = []
+    for article in articles:
+        if title := article.get("title"):
+            texts.append(title)
+        if desc := article.get("description"):
+            texts.append(desc)
+    return texts
+
+
+def _overall(total_polarity: float, n_articles: int) -> str:
+    if not n_articles:
+        return "neutro"
+    avg_polarity = total_polarity / n_articles
+    if avg_polarity > 0.1:
+        return "positivo"
+    elif avg_polarity < -0.1:
+        return "negativo"
+    return "neutro"
+
+
 class NLPSentimentAnalyzer:
-    def __init__(self):
-        pass
+    """
+    Sentimento via TextBlob, memoizado por hash do texto normalizado: LRU em memória
+    na frente de um SentimentStore em disco, de modo que cada texto distinto (as
+    manchetes se repetem entre execuções e símbolos) seja analisado uma única vez.
+
+    A API assíncrona (`analyze_many_async`, `get_overall_sentiment_async`, `overall_many`)
+    manda os textos não memoizados, em lotes, para um pool de threads ou processos; no
+    máximo `max_inflight_batches` lotes ficam em voo (um semáforo, não uma fila: os demais
+    aguardam sua vez) e o event loop não bloqueia no TextBlob.
+    """
+    def __init__(
+        self,
+        cache: Optional[TTLCache] = None,
+        store: Optional[SentimentStore] = None,
+        executor: str = SENTIMENT_EXECUTOR,
+        max_workers: int = SENTIMENT_MAX_WORKERS,
+        batch_size: int = SENTIMENT_BATCH_SIZE,
+        max_inflight_batches: int = SENTIMENT_MAX_INFLIGHT_BATCHES
+    ):
+        # ttl=0: resultado do texto não expira, só sai do LRU por tamanho
+        self.cache = cache if cache is not None else TTLCache(SENTIMENT_CACHE_MAX_ENTRIES, ttl=0)
+        if store is None and SENTIMENT_STORE_PATH:
+            store = SentimentStore(SENTIMENT_STORE_PATH)
+        self.store = store
+        self.executor = executor
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.max_inflight_batches = max(1, max_inflight_batches)
+        self._pool: Optional[Executor] = None
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._inflight_loop = None
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            if self.executor == "process":
+                # spawn: não herda o event loop nem as threads do processo principal
+                self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="sentiment")
+        return self._pool
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # um semáforo por event loop (o scheduler pode rodar execuções em loops diferentes)
+        loop = asyncio.get_running_loop()
+        if self._inflight is None or self._inflight_loop is not loop:
+            self._inflight, self._inflight_loop = asyncio.Semaphore(self.max_inflight_batches), loop
+        return self._inflight
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _lookup(self, texts: List[str]) -> Tuple[List[str], Dict[str, Score], Dict[str, str]]:
+        """
+        Consulta o LRU: (chaves na ordem de `texts`, resultados conhecidos, {chave: texto}
+        ainda sem resultado). O disco fica com `_merge_stored`.
+        """
+        keys = [text_key(t) for t in texts]
+        known: Dict[str, Score] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in known or key in missing:
+                continue
+            hit = self.cache.get(key)
+            if hit is not None:
+                known[key] = hit
+            else:
+                missing[key] = text
+        return keys, known, missing
+
+    def _merge_stored(self, known: Dict[str, Score], missing: Dict[str, str], stored: Dict[str, Score]) -> None:
+        for key, score in stored.items():
+            known[key] = score
+            self.cache.put(key, score)
+            del missing[key]
+
+    def _remember(self, known: Dict[str, Score], computed: Dict[str, Score]) -> None:
+        for key, score in computed.items():
+            self.cache.put(key, score)
+        known.update(computed)
+        logger.debug(f"Sentimento: {len(computed)} textos analisados, {len(known) - len(computed)} reaproveitados")
+
+    @staticmethod
+    def _as_dict(score: Score) -> Dict[str, float]:
+        return {
+            "polarity": score[0],      # -1.0 (negativo) a 1.0 (positivo)
+            "subjectivity": score[1]   # 0.0 (objetivo) a 1.0 (subjetivo)
+        }
+
+    def analyze_many(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Sentimento de vários textos; só os nunca vistos passam pelo TextBlob."""
+        keys, known, missing = self._lookup(texts)
+        if missing and self.store is not None:
+            self._merge_stored(known, missing, self.store.get_many(missing))
+        if missing:
+            computed = {key: score_text(text) for key, text in missing.items()}
+            self._remember(known, computed)
+            if self.store is not None:
+                self.store.put_many(computed)
+        return [self._as_dict(known[key]) for key in keys]
+
+    async def analyze_many_async(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Como `analyze_many`, com disco e TextBlob fora do event loop."""
+        keys, known, missing = self._lookup(texts)
+        if missing and self.store is not None:
+            self._merge_stored(known, missing, await asyncio.to_thread(self.store.get_many, list(missing)))
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            queue = self._semaphore()
+            items = list(missing.items())
+
+            async def run(batch: List[Tuple[str, str]]) -> List[Score]:
+                async with queue:
+                    return await loop.run_in_executor(self._executor(), score_batch, [t for _, t in batch])
+
+            batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+            results = await asyncio.gather(*(run(b) for b in batches))
+            computed = {key: score for batch, scores in zip(batches, results)
+                        for (key, _), score in zip(batch, scores)}
+            self._remember(known, computed)
+            if self.store is not None:
+                await asyncio.to_thread(self.store.put_many, computed)
+        return [self._as_dict(known[key]) for key in keys]
 
     def analyze_sentiment(self, text: str) -> Dict[str, float]:
         """
         Analisa o sentimento de um texto usando TextBlob.
         Retorna a polaridade (positiva/negativa) e a subjetividade (objetiva/subjetiva).
         """
-        analysis = TextBlob(text)
-        sentiment = {
-            "polarity": analysis.sentiment.polarity,  # -1.0 (negativo) a 1.0 (positivo)
-            "subjectivity": analysis.sentiment.subjectivity  # 0.0 (objetivo) a 1.0 (subjetivo)
-        }
-        logger.debug(f"Sentimento analisado: {sentiment}")
-        return sentiment
+        return self.analyze_many([text])[0]
 
     def get_overall_sentiment(self, articles: List[Dict[str, Any]]) -> str:
         """
@@ -28,18 +203,19 @@ class NLPSentimentAnalyzer:
         if not articles:
             return "neutro"
 
-        total_polarity = 0.0
-        for article in articles:
-            if title := article.get("title"):
-                total_polarity += self.analyze_sentiment(title)["polarity"]
-            if desc := article.get("description"):
-                total_polarity += self.analyze_sentiment(desc)["polarity"]
+        total_polarity = sum(self.analyze_sentiment(t)["polarity"] for t in _article_texts(articles))
+        return _overall(total_polarity, len(articles))
 
-        avg_polarity = total_polarity / len(articles)
+    async def get_overall_sentiment_async(self, articles: List[Dict[str, Any]]) -> str:
+        """`get_overall_sentiment` sem bloquear o event loop."""
+        return (await self.overall_many({"": articles}))[""]
 
-        if avg_polarity > 0.1:
-            return "positivo"
-        elif avg_polarity < -0.1:
-            return "negativo"
-        else:
-            return "neutro"
+    async def overall_many(self, articles_by_key: Dict[str, List[Dict[str, Any]]]) -> Dict[str, str]:
+        """Sentimento geral de vários grupos de artigos (ex.: por símbolo) num só lote."""
+        texts = {key: _article_texts(articles) for key, articles in articles_by_key.items()}
+        flat = [t for group in texts.values() for t in group]
+        polarities = iter(r["polarity"] for r in await self.analyze_many_async(flat))
+        return {
+            key: _overall(sum(next(polarities) for _ in texts[key]), len(articles))
+            for key, articles in articles_by_key.items()
+        }
@@ -0,0 +1,89 @@
+# external_data/sentiment_store.py
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, Tuple
+
+from config.settings import SENTIMENT_STORE_PATH, SENTIMENT_STORE_MAX_ROWS
+from utils.logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+Score = Tuple[float, float]  # (polaridade, subjetividade)
+
+# limite de parâmetros por consulta do SQLite
+_CHUNK = 500
+
+
+class SentimentStore:
+    """
+    Resultados de sentimento em disco (SQLite), por hash do texto. Cada operação abre
+    a própria conexão, então o store pode ser usado de qualquer thread. Falhas de
+    disco só geram aviso: o chamador recalcula o sentimento.
+
+    Guarda no máximo `max_rows` linhas (`<= 0` = sem limite): `INSERT OR REPLACE` dá a
+    cada gravação um rowid maior, então as gravações mais antigas são as de menor rowid
+    e saem por um DELETE por faixa após cada `put_many`.
+    """
+    def __init__(self, path: str = SENTIMENT_STORE_PATH, max_rows: int = SENTIMENT_STORE_MAX_ROWS):
+        self.path = path
+        self.max_rows = max_rows
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        if not self._ready:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment "
+                "(key TEXT PRIMARY KEY, polarity REAL NOT NULL, subjectivity REAL NOT NULL)"
+            )
+            self._ready = True
+        return conn
+
+    @contextmanager
+    def _session(self):
+        # transação confirmada ao sair do bloco; a conexão é sempre fechada
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Score]:
+        keys = list(keys)
+        found: Dict[str, Score] = {}
+        if not keys:
+            return found
+        try:
+            with self._session() as conn:
+                for i in range(0, len(keys), _CHUNK):
+                    chunk = keys[i:i + _CHUNK]
+                    rows = conn.execute(
+                        "SELECT key, polarity, subjectivity FROM sentiment "
+                        f"WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    )
+                    found.update((k, (p, s)) for k, p, s in rows)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Erro lendo sentimentos de {self.path}: {e}")
+        return found
+
+    def put_many(self, scores: Dict[str, Score]) -> None:
+        if not scores:
+            return
+        try:
+            with self._session() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO sentiment (key, polarity, subjectivity) VALUES (?, ?, ?)",
+                    [(k, p, s) for k, (p, s) in scores.items()]
+                )
+                if self.max_rows > 0:
+                    conn.execute(
+                        "DELETE FROM sentiment WHERE rowid <= (SELECT MAX(rowid) FROM sentiment) - ?",
+                        (self.max_rows,)
+                    )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Erro gravando sentimentos em {self.path}: {e}")
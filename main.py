@@ -12,6 +12,7 @@ logger = AppLogger(__name__).get_logger()
 # Imports principais só após configurar o logger
 from screener.screener_core import ScreenerCore
 from scheduler.job_scheduler import JobScheduler
+from screener.stream_screener import StreamScreener
 
 async def run_screener_once():
     logger.info("Executando screener em modo de execução única...")
@@ -28,13 +29,72 @@ async def run_screener_once():
     except Exception:
         logger.error("Erro ao executar screener", exc_info=True)
 
+async def run_stream():
+    logger.info("Executando screener em modo streaming (candle fechado)...")
+    try:
+        streamer = await StreamScreener.create()
+        await streamer.run()
+    except Exception:
+        logger.error("Erro no screener em streaming", exc_info=True)
+
+async def run_backtest_cmd():
+    from backtest.engine import MarketData, run_backtest
+
+    logger.info("Executando backtest sobre as klines armazenadas...")
+    try:
+        market = await asyncio.to_thread(MarketData.from_cache)
+        trades, stats = await asyncio.to_thread(run_backtest, market)
+        os.makedirs("reports/backtest", exist_ok=True)
+        trades.to_csv("reports/backtest/trades.csv", index=False)
+        logger.info(f"Backtest concluído: {stats}")
+    except Exception:
+        logger.error("Erro no backtest", exc_info=True)
+
+async def run_record_cmd():
+    import time
+    from backtest.recorder import HistoryRecorder
+    from config.settings import BACKTEST_HISTORY_DAYS, TIMEFRAME_ENTRY
+    from mexc.mexc_api import MexcApiAsync
+
+    logger.info(f"Gravando {BACKTEST_HISTORY_DAYS} dias de histórico {TIMEFRAME_ENTRY} para o backtest...")
+    api = await MexcApiAsync().init()
+    try:
+        contracts = await api.get_futures_contracts()
+        symbols = [c["symbol"] for c in contracts if c.get("symbol")]
+        end = int(time.time())
+        start = end - BACKTEST_HISTORY_DAYS * 86400
+        await HistoryRecorder(api).record_many(symbols, TIMEFRAME_ENTRY, start, end)
+    except Exception:
+        logger.error("Erro gravando histórico", exc_info=True)
+    finally:
+        await api.close()
+
+async def run_sweep_cmd():
+    from backtest.engine import MarketData
+    from backtest.sweep import DEFAULT_SPACE, SweepRunner, grid, random_search
+    from config.settings import SWEEP_SAMPLES
+
+    logger.info("Executando sweep de parâmetros sobre as klines armazenadas...")
+    try:
+        market = await asyncio.to_thread(MarketData.from_cache)
+        candidates = (
+            random_search(DEFAULT_SPACE, SWEEP_SAMPLES) if SWEEP_SAMPLES
+            else grid(DEFAULT_SPACE)
+        )
+        table = await asyncio.to_thread(SweepRunner(market).sweep, candidates)
+        os.makedirs("reports/backtest", exist_ok=True)
+        table.to_csv("reports/backtest/sweep.csv", index=False)
+        logger.info(f"Sweep concluído: {len(table)} combinações em reports/backtest/sweep.csv")
+    except Exception:
+        logger.error("Erro no sweep", exc_info=True)
+
 async def run_scheduler():
     scheduler = JobScheduler()
     await scheduler.start()
 
 async def cli():
     if len(sys.argv) < 2:
-        logger.info("Uso: python main.py [screener|scheduler]")
+        logger.info("Uso: python main.py [screener|scheduler|stream|record|backtest|sweep]")
         return
 
     command = sys.argv[1].lower()
@@ -43,6 +103,14 @@ async def cli():
         await run_screener_once()
     elif command == "scheduler":
         await run_scheduler()
+    elif command == "stream":
+        await run_stream()
+    elif command == "record":
+        await run_record_cmd()
+    elif command == "backtest":
+        await run_backtest_cmd()
+    elif command == "sweep":
+        await run_sweep_cmd()
     else:
         logger.error(f"Comando desconhecido: {command}")
 
@@ -0,0 +1,100 @@
+# mexc/kline_cache.py
+
+import os
+import tempfile
+from typing import Dict, Optional
+
+import numpy as np
+
+from config.settings import KLINE_CACHE_DIR, KLINE_CACHE_MAX_BARS
+from utils.logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# Campos do payload de klines da MEXC persistidos no cache (formato colunar)
+KLINE_FIELDS = ("time", "open", "high", "low", "close", "vol", "amount")
+
+
+class KlineCache:
+    """
+    Armazena candles em disco, um arquivo .npz (colunar, float64/int64) por símbolo e intervalo:
+    `<base_dir>/<interval>/<symbol>.npz`. Guarda no máximo `max_bars` candles por série
+    (`max_bars <= 0` = sem limite, usado pelo histórico do backtest).
+    """
+    def __init__(self, base_dir: str = KLINE_CACHE_DIR, max_bars: int = KLINE_CACHE_MAX_BARS):
+        self.base_dir = base_dir
+        self.max_bars = max_bars
+
+    def _path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.base_dir, interval, f"{symbol}.npz")
+
+    @staticmethod
+    def to_arrays(data: dict) -> Dict[str, np.ndarray]:
+        """Converte o payload colunar da API (listas) em arrays NumPy."""
+        times = np.asarray(data.get("time", []), dtype=np.int64)
+        arrays = {"time": times}
+        for field in KLINE_FIELDS[1:]:
+            values = data.get(field)
+            arrays[field] = (
+                np.asarray(values, dtype=np.float64) if values is not None
+                else np.full(len(times), np.nan)
+            )
+        return arrays
+
+    @staticmethod
+    def to_payload(arrays: Dict[str, np.ndarray]) -> dict:
+        """Payload colunar retornado por `get_klines`, com os próprios arrays (sem cópia)."""
+        return {field: arrays[field] for field in KLINE_FIELDS}
+
+    def load(self, symbol: str, interval: str) -> Optional[Dict[str, np.ndarray]]:
+        path = self._path(symbol, interval)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with np.load(path) as npz:
+                return {field: npz[field] for field in KLINE_FIELDS}
+        except Exception as e:
+            logger.debug(f"Cache de klines inválido para {symbol} {interval}: {e}")
+            return None
+
+    def save(self, symbol: str, interval: str, arrays: Dict[str, np.ndarray]) -> None:
+        path = self._path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        trimmed = (
+            {field: arrays[field][-self.max_bars:] for field in KLINE_FIELDS} if self.max_bars > 0
+            else {field: arrays[field] for field in KLINE_FIELDS}
+        )
+        # escrita atômica: grava num temporário exclusivo (escritores concorrentes não se
+        # sobrescrevem) e substitui; o último `os.replace` vence com um arquivo íntegro
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{symbol}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **trimmed)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.debug(f"Erro ao gravar cache de klines para {symbol} {interval}: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    @staticmethod
+    def merge(cached: Dict[str, np.ndarray], fresh: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Junta candles novos ao cache: candles recebidos substituem os armazenados a partir
+        do primeiro timestamp novo (o último candle cacheado podia ainda estar aberto).
+        """
+        if not len(fresh["time"]):
+            return cached
+        keep = cached["time"] < fresh["time"][0]
+        return {field: np.concatenate([cached[field][keep], fresh[field]]) for field in KLINE_FIELDS}
+
+    @staticmethod
+    def window(arrays: Dict[str, np.ndarray], start: Optional[int], end: Optional[int]) -> Dict[str, np.ndarray]:
+        """Recorta os candles com `start <= time <= end`."""
+        mask = np.ones(len(arrays["time"]), dtype=bool)
+        if start is not None:
+            mask &= arrays["time"] >= start
+        if end is not None:
+            mask &= arrays["time"] <= end
+        return {field: arrays[field][mask] for field in KLINE_FIELDS}
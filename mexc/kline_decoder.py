@@ -0,0 +1,94 @@
+# mexc/kline_decoder.py
+
+import json
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    # orjson (requirements.txt) decodifica bem mais rápido; sem ele, usa o json da stdlib
+    import orjson
+
+    def json_loads(raw):
+        return orjson.loads(raw)
+except ImportError:
+    def json_loads(raw):
+        return json.loads(raw)
+
+
+class KlineSeries:
+    """
+    Série de candles em arrays NumPy (int64 para `time` em segundos, float64 para o resto).
+    Leve o bastante para os indicadores; o DataFrame só é montado sob demanda.
+    """
+    __slots__ = ("symbol", "time", "open", "high", "low", "close", "volume", "amount")
+
+    def __init__(self, symbol: str, time, open, high, low, close, volume, amount):
+        self.symbol = symbol
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.amount = amount
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @classmethod
+    def from_payload(cls, data: dict, symbol: str) -> "KlineSeries":
+        """
+        Constrói a série a partir do payload colunar da MEXC (`time`, `open`, ..., `vol`, `amount`).
+        Arrays que já estão no dtype certo são reaproveitados sem cópia.
+        """
+        time = np.asarray(data.get("time", []), dtype=np.int64)
+        n = len(time)
+
+        def _col(name: str) -> np.ndarray:
+            values = data.get(name)
+            if values is None:
+                return np.full(n, np.nan)
+            return np.asarray(values, dtype=np.float64)
+
+        return cls(
+            symbol, time, _col("open"), _col("high"), _col("low"),
+            _col("close"), _col("vol"), _col("amount")
+        )
+
+    def to_payload(self) -> dict:
+        """Payload colunar (`vol` em vez de `volume`), com os próprios arrays (sem cópia)."""
+        return {
+            "time": self.time, "open": self.open, "high": self.high, "low": self.low,
+            "close": self.close, "vol": self.volume, "amount": self.amount
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Materializa o DataFrame no mesmo formato de `MexcApiAsync.klines_to_dataframe`."""
+        n = len(self)
+        return pd.DataFrame({
+            "time": pd.to_datetime(self.time, unit="s"),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "amount": self.amount,
+            # coluna constante como categórica: um código por linha em vez de uma string
+            "symbol": pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[self.symbol]),
+        })
+
+
+def decode_klines(raw, symbol: str) -> Optional[KlineSeries]:
+    """
+    Decodifica a resposta bruta (bytes/str) do endpoint de klines para `KlineSeries`.
+    O JSON ainda vira listas Python, que são convertidas uma única vez em arrays NumPy.
+    Aceita a resposta completa (`{"success": ..., "data": {...}}`) ou só o campo `data`.
+    """
+    payload = json_loads(raw) if isinstance(raw, (bytes, bytearray, str)) else raw
+    if isinstance(payload, dict) and isinstance(payload.get("data"), dict):
+        payload = payload["data"]
+    if not isinstance(payload, dict) or "time" not in payload:
+        return None
+    return KlineSeries.from_payload(payload, symbol)
@@ -3,57 +3,93 @@
 import asyncio
 import hashlib
 import hmac
-import json
 import time
 from urllib.parse import quote_plus
 
 import aiohttp
 import pandas as pd
-import websockets
 
 from config.settings import (
     MEXC_API_KEY,
     MEXC_SECRET_KEY,
     MEXC_BASE_URL,
-    MEXC_WS_URL
+    MEXC_WS_URL,
+    MEXC_MAX_RETRIES,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_WARMUP_CONNECTIONS,
+    KLINE_CACHE_ENABLED,
+    _PERIODS
  )
 from mexc.mexc_endpoints import MexcEndpoints
+from mexc.kline_cache import KlineCache
+from mexc.kline_decoder import KlineSeries, decode_klines, json_loads
+from mexc.ws_manager import MexcWsManager
+from mexc.rate_limiter import RateLimiter, default_rate_limiter
 from utils.logger import AppLogger
 
 logger = AppLogger(__name__).get_logger()
 
+# Código retornado pela MEXC (com HTTP 200) quando a frequência de requisições é excedida
+MEXC_RATE_LIMIT_CODE = 510
+
 class MexcApiAsync:
-    def __init__(self):
+    def __init__(
+        self,
+        rate_limiter: RateLimiter = None,
+        max_retries: int = MEXC_MAX_RETRIES,
+        kline_cache: KlineCache = None
+    ):
         self.api_key = MEXC_API_KEY
         self.secret_key = MEXC_SECRET_KEY
         self.base_url = MEXC_BASE_URL
         self.ws_url = MEXC_WS_URL
         self.http = None
-        self.ws = None
+        self.ws_manager = None
+        # limitador compartilhado por padrão entre todas as instâncias do cliente
+        self.rate_limiter = rate_limiter or default_rate_limiter
+        self.max_retries = max(1, max_retries)
+        # cache incremental de klines em disco (desligado com KLINE_CACHE_ENABLED=false)
+        self.kline_cache = kline_cache or (KlineCache() if KLINE_CACHE_ENABLED else None)
 
     async def init(self ):
-        if not self.http:
-            self.http = aiohttp.ClientSession( )
+        if not self.http or self.http.closed:
+            # pool de conexões explícito: o cache DNS vale entre execuções agendadas; as
+            # conexões ociosas expiram no keep-alive e são reabertas por `warmup`
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self.http = aiohttp.ClientSession(connector=connector)
         return self
 
+    async def warmup(self, connections: int = HTTP_WARMUP_CONNECTIONS) -> int:
+        """
+        Pré-aquece o pool abrindo até `connections` conexões em paralelo (endpoint de ping),
+        para que a varredura não pague TCP/TLS nas primeiras requisições (as conexões da
+        execução anterior já expiraram no keep-alive). Retorna quantas responderam.
+        """
+        await self.init()
+        connections = max(0, min(connections, HTTP_POOL_LIMIT_PER_HOST))
+        results = await asyncio.gather(
+            *(self._make_request("GET", MexcEndpoints.PING) for _ in range(connections)),
+            return_exceptions=True
+        )
+        ok = sum(1 for r in results if r is not None and not isinstance(r, Exception))
+        logger.debug(f"Pool HTTP pré-aquecido: {ok}/{connections} conexões.")
+        return ok
+
     @staticmethod
     def klines_to_dataframe(data: dict, symbol: str) -> pd.DataFrame:
-        df = pd.DataFrame({
-            "time": data.get("time", []),
-            "open": data.get("open", []),
-            "high": data.get("high", []),
-            "low": data.get("low", []),
-            "close": data.get("close", []),
-            "volume": data.get("vol", []),
-            "amount": data.get("amount", []),
-        })
-        df["time"] = pd.to_datetime(df["time"], unit="s")
-        df["symbol"] = symbol
-        return df
+        return KlineSeries.from_payload(data, symbol).to_dataframe()
 
     async def close(self):
-        if self.ws:
-            await self.ws.close()
+        if self.ws_manager:
+            await self.ws_manager.close()
         if self.http:
             await self.http.close( )
 
@@ -66,9 +102,22 @@ class MexcApiAsync:
             self.secret_key.encode(), payload.encode(), hashlib.sha256
         ).hexdigest()
 
-    async def _make_request(self, method: str, endpoint: str, params: dict = None, signed: bool = False) -> dict | list | None:
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict = None,
+        signed: bool = False,
+        rate_key: str = None
+    ) -> dict | list | None:
+        """
+        Executa a requisição respeitando o token bucket de `rate_key` (padrão: o endpoint).
+        HTTP 429 (ou código 510 da MEXC) bloqueia o bucket pelo `Retry-After` / backoff,
+        afetando todos os chamadores; demais falhas usam backoff exponencial com jitter.
+        """
         params = params or {}
         headers = {"Accept": "application/json"}
+        rate_key = rate_key or endpoint
 
         if signed:
             if not self.api_key or not self.secret_key:
@@ -84,7 +133,10 @@ class MexcApiAsync:
             })
 
         url = f"{self.base_url}{endpoint}"
-        for attempt in range(3):
+        retries = self.max_retries
+        for attempt in range(retries):
+            await self.rate_limiter.acquire(rate_key)
+            throttled = False
             try:
                 async with self.http.request(
                     method=method.upper( ),
@@ -93,16 +145,28 @@ class MexcApiAsync:
                     json=params if method.upper() == "POST" else None,
                     headers=headers,
                 ) as resp:
+                    if resp.status == 429:
+                        throttled = True
+                        retry_after = RateLimiter.parse_retry_after(resp.headers.get("Retry-After"))
+                        self.rate_limiter.penalize(rate_key, self.rate_limiter.backoff(attempt, retry_after))
+                        raise RuntimeError("HTTP 429 (rate limit)")
                     resp.raise_for_status()
-                    if "application/json" in resp.headers.get("Content-Type", ""):
-                        return await resp.json()
-                    return None
+                    if "application/json" not in resp.headers.get("Content-Type", ""):
+                        return None
+                    data = json_loads(await resp.read())
+                    if isinstance(data, dict) and data.get("code") == MEXC_RATE_LIMIT_CODE:
+                        throttled = True
+                        self.rate_limiter.penalize(rate_key, self.rate_limiter.backoff(attempt))
+                        raise RuntimeError(f"código {MEXC_RATE_LIMIT_CODE} (rate limit)")
+                    return data
             except Exception as e:
-                if attempt == 2:
-                    logger.error(f"Falha ao acessar {endpoint} após 3 tentativas: {e}")
-                else:
-                    logger.debug(f"Tentativa {attempt+1}/3 falhou para {endpoint}: {e}")
-                await asyncio.sleep(0.5 * (attempt + 1))
+                if attempt == retries - 1:
+                    logger.error(f"Falha ao acessar {endpoint} após {retries} tentativas: {e}")
+                    break
+                logger.debug(f"Tentativa {attempt+1}/{retries} falhou para {endpoint}: {e}")
+                # em rate limit a espera já está no bucket (vale para todos os chamadores)
+                if not throttled:
+                    await asyncio.sleep(self.rate_limiter.backoff(attempt))
         return None
 
     async def get_futures_contracts(self) -> list:
@@ -124,21 +188,69 @@ class MexcApiAsync:
         if interval not in valid:
             logger.warning(f"Intervalo inválido: {interval}.")
             return None
+        if self.kline_cache and interval in _PERIODS:
+            return await self._get_klines_cached(symbol, interval, start, end)
+        return await self._fetch_klines(symbol, interval, start, end)
+
+    async def fetch_klines(self, symbol: str, interval: str, start: int | None = None, end: int | None = None) -> dict | None:
+        """Klines direto da API, sem passar pelo cache em disco (ex.: gravação de histórico)."""
+        return await self._fetch_klines(symbol, interval, start, end)
+
+    async def _fetch_klines(self, symbol: str, interval: str, start: int | None, end: int | None) -> dict | None:
         params = {"interval": interval}
         if start is not None: params["start"] = start
         if end is not None:   params["end"] = end
         endpoint = f"{MexcEndpoints.KLINES}/{symbol}"
-        resp = await self._make_request("GET", endpoint, params=params)
-        if isinstance(resp, dict) and "data" in resp:
-            return resp["data"]
-        logger.warning(f"Formato inesperado de klines para {symbol}.")
-        return None
+        resp = await self._make_request("GET", endpoint, params=params, rate_key=MexcEndpoints.KLINES)
+        # o JSON é decodificado em listas Python e convertido uma única vez em arrays NumPy;
+        # daí em diante (cache, KlineSeries, DataFrame) os arrays são reaproveitados sem cópia
+        series = decode_klines(resp, symbol) if isinstance(resp, dict) and "data" in resp else None
+        if series is None:
+            logger.warning(f"Formato inesperado de klines para {symbol}.")
+            return None
+        return series.to_payload()
+
+    async def _get_klines_cached(self, symbol: str, interval: str, start: int | None, end: int | None) -> dict | None:
+        """
+        Consulta o cache em disco e busca na API apenas os candles a partir do último
+        candle armazenado (que pode ter sido gravado ainda aberto), mesclando o resultado.
+        """
+        cache = self.kline_cache
+        cached = await asyncio.to_thread(cache.load, symbol, interval)
+        # o cache precisa cobrir o início pedido e ainda alcançá-lo: um cache parado há dias
+        # (ex.: após downtime) faria buscar a partir do último candle gravado, e o limite de
+        # candles por requisição da API deixaria uma lacuna antes de `end`
+        covers = (
+            cached is not None and len(cached["time"]) > 0
+            and (start is None or (
+                cached["time"][0] <= start + _PERIODS[interval] and cached["time"][-1] >= start
+            ))
+        )
+        fetch_start = int(cached["time"][-1]) if covers else start
+
+        fresh = await self._fetch_klines(symbol, interval, fetch_start, end)
+        if fresh is None:
+            return None
+        fresh_arrays = KlineCache.to_arrays(fresh)
+        merged = KlineCache.merge(cached, fresh_arrays) if covers else fresh_arrays
+        await asyncio.to_thread(cache.save, symbol, interval, merged)
+        return KlineCache.to_payload(KlineCache.window(merged, start, end))
 
     async def get_ticker(self, symbol: str) -> dict | None:
         return await self._make_request(
             "GET", MexcEndpoints.TICKER, params={"symbol": symbol}
         )
 
+    async def get_all_tickers(self) -> list:
+        """
+        Ticker de todos os contratos em uma única requisição (endpoint chamado sem `symbol`).
+        """
+        resp = await self._make_request("GET", MexcEndpoints.TICKER)
+        if not isinstance(resp, dict) or not resp.get("success") or not isinstance(resp.get("data"), list):
+            logger.warning("Resposta inesperada ao obter tickers em lote.")
+            return []
+        return resp["data"]
+
     async def obter_liquidez(self, symbol: str) -> tuple[float, float]:
         try:
             resp = await self.get_ticker(symbol)
@@ -153,22 +265,29 @@ class MexcApiAsync:
             logger.debug(f"Erro ao obter liquidez para {symbol}: {e}")
             return 0.0, 0.0
 
-    async def subscribe_kline(self, symbol: str, interval: str, callback: callable):
-        if not self.ws:
-            self.ws = await websockets.connect(self.ws_url)
-        sub = json.dumps({"method":"sub.kline","param":{"symbol":symbol,"interval":interval}})
-        await self.ws.send(sub)
-        async for msg in self.ws:
-            data = json.loads(msg)
-            await callback(data)
-
-    async def subscribe_ticker(self, symbol: str, callback: callable):
-        if not self.ws:
-            self.ws = await websockets.connect(self.ws_url)
-        sub = json.dumps({"method":"sub.ticker","param":{"symbol":symbol}})
-        await self.ws.send(sub)
-        async for msg in self.ws:
-            data = json.loads(msg)
-            await callback(data)
+    def _ws(self) -> MexcWsManager:
+        if not self.ws_manager:
+            self.ws_manager = MexcWsManager(self.ws_url)
+        return self.ws_manager
+
+    async def subscribe_kline(self, symbol: str, interval: str, callback: callable) -> str:
+        """
+        Registra `callback` para os `push.kline` do símbolo/intervalo no pool de WebSockets
+        compartilhado e retorna imediatamente (a conexão é mantida em background).
+        """
+        return await self._ws().subscribe_kline(symbol, interval, callback)
 
+    async def subscribe_klines(self, pairs, callback: callable, on_reconnect: callable = None) -> list:
+        """
+        Como `subscribe_kline` para vários pares (símbolo, intervalo): as assinaturas são
+        distribuídas entre os sockets e enviadas em lotes de `sub.kline`.
+        `on_reconnect(params)` é chamado após cada reconexão de um socket, com os
+        `{"symbol", "interval"}` que ele assina (os candles da queda não são reenviados).
+        """
+        if on_reconnect is not None:
+            self._ws().add_reconnect_handler(on_reconnect)
+        return await self._ws().subscribe_klines(pairs, callback)
 
+    async def subscribe_ticker(self, symbol: str, callback: callable) -> str:
+        """Registra `callback` para os `push.ticker` do símbolo no pool de WebSockets."""
+        return await self._ws().subscribe_ticker(symbol, callback)
@@ -7,6 +7,7 @@ class MexcEndpoints:
     FUTURES_CONTRACTS = "/api/v1/contract/detail"
     KLINES = "/api/v1/contract/kline"
     TICKER = "/api/v1/contract/ticker"
+    PING = "/api/v1/contract/ping"
     
 
     # Endpoints de conta e trading (se necessário no futuro)
@@ -0,0 +1,113 @@
+# mexc/rate_limiter.py
+
+import asyncio
+import random
+import time
+from typing import Dict, Optional
+
+from config.settings import (
+    MEXC_RATE_LIMIT_PER_SEC,
+    MEXC_RATE_LIMIT_BURST,
+    MEXC_BACKOFF_BASE,
+    MEXC_BACKOFF_MAX,
+)
+
+
+class TokenBucket:
+    """
+    Token bucket sem locks: cada `acquire` reserva o token imediatamente (o saldo
+    pode ficar negativo) e dorme o tempo necessário para pagá-lo. Como não há `await`
+    entre o refill e a reserva, a operação é atômica no event loop e o bucket pode
+    ser compartilhado entre loops diferentes (ex.: `asyncio.run` repetidos).
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        # durante o bloqueio não há reposição: ela recomeça em `blocked_until`
+        start = max(self.updated, self.blocked_until)
+        if now > start:
+            self.tokens = min(self.capacity, self.tokens + (now - start) * self.rate)
+            self.updated = now
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """
+        Reserva `cost` tokens e retorna quantos segundos o chamador deve esperar: o resto
+        do bloqueio mais o tempo para pagar a dívida. Quem reservou durante o bloqueio é
+        liberado aos poucos, na taxa do bucket, e não todos de uma vez ao fim dele.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= cost
+        debt_wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(0.0, self.blocked_until - now) + debt_wait
+
+    async def acquire(self, cost: float = 1.0) -> None:
+        wait = self.reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, delay: float) -> None:
+        """Bloqueia o bucket por `delay` segundos (ex.: após HTTP 429) e zera o saldo."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, now + delay)
+
+
+class RateLimiter:
+    """
+    Conjunto de token buckets por endpoint, compartilhado por todos os usuários do
+    cliente (LiquidityFilter, ScreenerCore, reports.performance...).
+    """
+    def __init__(
+        self,
+        rate: float = MEXC_RATE_LIMIT_PER_SEC,
+        burst: float = MEXC_RATE_LIMIT_BURST,
+        backoff_base: float = MEXC_BACKOFF_BASE,
+        backoff_max: float = MEXC_BACKOFF_MAX
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, key: str) -> TokenBucket:
+        if key not in self._buckets:
+            self._buckets[key] = TokenBucket(self.rate, self.burst)
+        return self._buckets[key]
+
+    async def acquire(self, key: str, cost: float = 1.0) -> None:
+        await self.bucket(key).acquire(cost)
+
+    def penalize(self, key: str, delay: float) -> None:
+        self.bucket(key).penalize(delay)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Tempo de espera antes da próxima tentativa: respeita `Retry-After` quando
+        informado (sem o teto `backoff_max`, que vale só para o backoff exponencial:
+        reabrir antes do prazo do servidor só prolongaria o bloqueio); senão usa backoff
+        exponencial com full jitter.
+        """
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+
+
+# Limitador padrão do processo: todas as instâncias de MexcApiAsync o compartilham
+default_rate_limiter = RateLimiter()
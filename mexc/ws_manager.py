@@ -0,0 +1,251 @@
+# mexc/ws_manager.py
+
+import asyncio
+import json
+import random
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import websockets
+
+from config.settings import (
+    MEXC_WS_URL,
+    WS_PING_INTERVAL,
+    WS_MAX_SUBS_PER_CONN,
+    WS_MAX_CONNECTIONS,
+    WS_SUB_BATCH_SIZE,
+    WS_RECONNECT_MAX_DELAY,
+)
+from utils.logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+Handler = Callable[[dict], Awaitable[None]]
+ReconnectHandler = Callable[[List[dict]], Awaitable[None]]
+
+
+def kline_key(symbol: str, interval: str) -> str:
+    return f"kline:{symbol}:{interval}"
+
+
+def ticker_key(symbol: str) -> str:
+    return f"ticker:{symbol}"
+
+
+class _Connection:
+    """Um socket do pool e as assinaturas atribuídas a ele."""
+    def __init__(self, index: int):
+        self.index = index
+        self.subs: Dict[str, dict] = {}
+        self.ws = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class MexcWsManager:
+    """
+    Gerencia um pequeno pool de conexões WebSocket da MEXC compartilhado por todas as
+    assinaturas: distribui os `sub.*` entre os sockets (enviados em lotes), despacha os
+    `push.*` para os handlers de cada canal, envia ping periódico e, após quedas,
+    reconecta com backoff e refaz todas as assinaturas do socket. Os `push.*` perdidos
+    durante a queda não são repostos: os handlers de reconexão recebem os `param` das
+    assinaturas do socket para recarregar o que precisarem.
+    """
+    def __init__(
+        self,
+        url: str = MEXC_WS_URL,
+        max_subs_per_conn: int = WS_MAX_SUBS_PER_CONN,
+        max_connections: int = WS_MAX_CONNECTIONS,
+        ping_interval: float = WS_PING_INTERVAL,
+        sub_batch_size: int = WS_SUB_BATCH_SIZE,
+        reconnect_max_delay: float = WS_RECONNECT_MAX_DELAY,
+        connect: Callable = None
+    ):
+        self.url = url
+        self.max_subs_per_conn = max_subs_per_conn
+        self.max_connections = max(1, max_connections)
+        self.ping_interval = ping_interval
+        self.sub_batch_size = max(1, sub_batch_size)
+        self.reconnect_max_delay = reconnect_max_delay
+        self._connect = connect or websockets.connect
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._reconnect_handlers: List[ReconnectHandler] = []
+        self._conns: List[_Connection] = []
+        self._closed = False
+
+    # --- Assinaturas -----------------------------------------------------------------
+
+    async def subscribe_kline(self, symbol: str, interval: str, handler: Handler) -> str:
+        return await self.subscribe(
+            kline_key(symbol, interval), "sub.kline",
+            {"symbol": symbol, "interval": interval}, handler
+        )
+
+    async def subscribe_klines(self, pairs: Iterable[Tuple[str, str]], handler: Handler) -> List[str]:
+        """`subscribe_kline` de vários pares (símbolo, intervalo) num só `subscribe_many`."""
+        items = [
+            (kline_key(sym, interval), "sub.kline", {"symbol": sym, "interval": interval}, handler)
+            for sym, interval in pairs
+        ]
+        await self.subscribe_many(items)
+        return [item[0] for item in items]
+
+    async def subscribe_ticker(self, symbol: str, handler: Handler) -> str:
+        return await self.subscribe(ticker_key(symbol), "sub.ticker", {"symbol": symbol}, handler)
+
+    async def subscribe(self, key: str, method: str, param: dict, handler: Handler) -> str:
+        await self.subscribe_many([(key, method, param, handler)])
+        return key
+
+    async def subscribe_many(self, items: List[tuple]) -> None:
+        """
+        Registra várias assinaturas `(key, method, param, handler)` de uma vez;
+        os `sub.*` de cada socket são enviados em lotes de `sub_batch_size`.
+        """
+        pending: Dict[int, List[dict]] = {}
+        for key, method, param, handler in items:
+            self._handlers.setdefault(key, []).append(handler)
+            if any(key in c.subs for c in self._conns):
+                continue
+            conn = self._pick_connection()
+            msg = {"method": method, "param": param}
+            conn.subs[key] = msg
+            pending.setdefault(conn.index, []).append(msg)
+
+        for index, msgs in pending.items():
+            conn = self._conns[index]
+            if conn.task is None:
+                # a conexão envia todas as assinaturas ao conectar
+                conn.task = asyncio.create_task(self._run(conn))
+            elif conn.ws is not None:
+                await self._send_batched(conn, msgs)
+
+    def add_reconnect_handler(self, handler: ReconnectHandler) -> None:
+        """Registra `handler(params)`, chamado após cada reconexão com os `param` do socket."""
+        if handler not in self._reconnect_handlers:
+            self._reconnect_handlers.append(handler)
+
+    async def unsubscribe(self, key: str) -> None:
+        self._handlers.pop(key, None)
+        for conn in self._conns:
+            msg = conn.subs.pop(key, None)
+            if msg and conn.ws is not None:
+                unsub = {"method": msg["method"].replace("sub.", "unsub.", 1), "param": msg["param"]}
+                try:
+                    await conn.ws.send(json.dumps(unsub))
+                except Exception as e:
+                    logger.debug(f"Erro ao cancelar assinatura {key}: {e}")
+
+    def _pick_connection(self) -> _Connection:
+        for conn in self._conns:
+            if len(conn.subs) < self.max_subs_per_conn:
+                return conn
+        if len(self._conns) < self.max_connections:
+            conn = _Connection(len(self._conns))
+            self._conns.append(conn)
+            return conn
+        # pool cheio: distribui no socket menos carregado
+        return min(self._conns, key=lambda c: len(c.subs))
+
+    # --- Ciclo de vida das conexões ---------------------------------------------------
+
+    async def _run(self, conn: _Connection) -> None:
+        attempt = 0
+        connected_before = False
+        while not self._closed:
+            try:
+                conn.ws = await self._connect(self.url)
+                attempt = 0
+                logger.debug(f"WS #{conn.index} conectado; assinando {len(conn.subs)} canais.")
+                await self._send_batched(conn, list(conn.subs.values()))
+                if connected_before:
+                    await self._notify_reconnect(conn)
+                connected_before = True
+                ping_task = asyncio.create_task(self._ping_loop(conn))
+                try:
+                    async for raw in conn.ws:
+                        await self._dispatch(raw)
+                finally:
+                    ping_task.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"WS #{conn.index} desconectado: {e}")
+            conn.ws = None
+            if self._closed:
+                break
+            delay = random.uniform(0.5, 1.0) * min(self.reconnect_max_delay, 2 ** attempt)
+            attempt += 1
+            logger.debug(f"WS #{conn.index}: reconectando em {delay:.1f}s.")
+            await asyncio.sleep(delay)
+
+    async def _notify_reconnect(self, conn: _Connection) -> None:
+        params = [msg["param"] for msg in conn.subs.values()]
+        for handler in self._reconnect_handlers:
+            try:
+                await handler(params)
+            except Exception as e:
+                logger.warning(f"Erro no handler de reconexão do WS #{conn.index}: {e}")
+
+    async def _send_batched(self, conn: _Connection, msgs: List[dict]) -> None:
+        for i in range(0, len(msgs), self.sub_batch_size):
+            if conn.ws is None:
+                return
+            for msg in msgs[i:i + self.sub_batch_size]:
+                await conn.ws.send(json.dumps(msg))
+            # pequena pausa entre lotes para não estourar o limite de mensagens da exchange
+            if i + self.sub_batch_size < len(msgs):
+                await asyncio.sleep(0.1)
+
+    async def _ping_loop(self, conn: _Connection) -> None:
+        while conn.ws is not None:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                await conn.ws.send(json.dumps({"method": "ping"}))
+            except Exception as e:
+                logger.debug(f"WS #{conn.index}: falha no ping: {e}")
+                return
+
+    @staticmethod
+    def channel_key(msg: dict) -> Optional[str]:
+        """Chave de roteamento de uma mensagem `push.*` (mesma usada na assinatura)."""
+        channel = msg.get("channel", "")
+        data = msg.get("data") if isinstance(msg.get("data"), dict) else {}
+        symbol = data.get("symbol") or msg.get("symbol")
+        if channel == "push.kline":
+            return kline_key(symbol, data.get("interval"))
+        if channel == "push.ticker":
+            return ticker_key(symbol)
+        return None
+
+    async def _dispatch(self, raw) -> None:
+        try:
+            msg = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.debug(f"Mensagem WS inválida: {raw!r}")
+            return
+        channel = msg.get("channel", "")
+        if channel == "pong" or channel.startswith("rs."):
+            return
+        key = self.channel_key(msg)
+        for handler in self._handlers.get(key, []):
+            try:
+                await handler(msg)
+            except Exception as e:
+                logger.warning(f"Erro no handler de {key}: {e}")
+
+    async def close(self) -> None:
+        self._closed = True
+        for conn in self._conns:
+            if conn.task:
+                conn.task.cancel()
+            if conn.ws is not None:
+                try:
+                    await conn.ws.close()
+                except Exception:
+                    pass
+                conn.ws = None
+        for conn in self._conns:
+            if conn.task:
+                try:
+                    await conn.task
+                except (asyncio.CancelledError, Exception):
+                    pass
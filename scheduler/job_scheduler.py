@@ -1,17 +1,36 @@
 import asyncio
-from config.settings import SCHEDULER_INTERVAL_MINUTES
+from config.settings import SCHEDULER_INTERVAL_MINUTES, SCREENER_EVAL_MODE, TREND_CACHE_ENABLED
+from mexc.mexc_api import MexcApiAsync
+from screener.external_factors_evaluator import ExternalFactorsEvaluator
+from screener.process_evaluator import ProcessEvaluator
 from screener.screener_core import ScreenerCore
+from screener.trend_cache import TrendCache
 from utils.logger import AppLogger
 
 logger = AppLogger(__name__).get_logger()
 
-async def run_screener_job_async():
+async def run_screener_job_async(
+    api: MexcApiAsync = None,
+    trend_cache: TrendCache = None,
+    ext_evaluator: ExternalFactorsEvaluator = None,
+    process_evaluator: ProcessEvaluator = None
+):
     """
     Executa o screener de forma assíncrona.
+    Com `api`, reutiliza o cliente HTTP (sessão e cache DNS) em vez de criar um novo e
+    reabre as conexões com `warmup`, já que as da execução anterior expiraram;
+    com `trend_cache`, reaproveita os vereditos de trend da execução anterior; com
+    `ext_evaluator`, reaproveita a conexão e o cache de respostas da NewsAPI; com
+    `process_evaluator`, reaproveita o pool de processos do modo "process".
     """
     try:
         logger.info("Iniciando execução do Screener...")
-        screener = await ScreenerCore.create()
+        if api is not None:
+            await api.warmup()
+        screener = await ScreenerCore.create(
+            api=api, trend_cache=trend_cache, ext_evaluator=ext_evaluator,
+            process_evaluator=process_evaluator
+        )
         await screener.run()
         logger.info("Execução do Screener concluída.")
     except Exception as e:
@@ -20,23 +39,42 @@ async def run_screener_job_async():
 class JobScheduler:
     """
     Scheduler que executa o Screener periodicamente utilizando apenas asyncio.
+    Mantém um único cliente MEXC (sessão HTTP e cache DNS) durante toda a vida do scheduler,
+    assim como o cache de vereditos de trend quando TREND_CACHE_ENABLED e o avaliador de
+    fatores externos (cliente e cache da NewsAPI) e, com SCREENER_EVAL_MODE="process", o
+    pool de processos, que assim não é recriado a cada varredura.
     """
     def __init__(self):
         self.interval_minutes = SCHEDULER_INTERVAL_MINUTES
         self._stop = False
+        self.api = None
+        self.trend_cache = TrendCache() if TREND_CACHE_ENABLED else None
+        self.ext_evaluator = None
+        self.process_evaluator = None
 
     async def start(self):
         """
         Inicia o loop de agendamento: executa imediatamente e depois a cada intervalo.
         """
         logger.info(f"Agendando Screener a cada {self.interval_minutes} minutos...")
-        # execução imediata
-        await run_screener_job_async()
+        self.api = await MexcApiAsync().init()
+        self.ext_evaluator = ExternalFactorsEvaluator()
+        if SCREENER_EVAL_MODE == "process":
+            self.process_evaluator = ProcessEvaluator()
+        shared = (self.api, self.trend_cache, self.ext_evaluator, self.process_evaluator)
+        try:
+            # execução imediata
+            await run_screener_job_async(*shared)
 
-        # loop periódico
-        while not self._stop:
-            await asyncio.sleep(self.interval_minutes * 60)
-            await run_screener_job_async()
+            # loop periódico
+            while not self._stop:
+                await asyncio.sleep(self.interval_minutes * 60)
+                await run_screener_job_async(*shared)
+        finally:
+            if self.process_evaluator is not None:
+                self.process_evaluator.close()
+            await self.ext_evaluator.aclose()
+            await self.api.close()
 
     def stop(self):
         """
@@ -0,0 +1,97 @@
+# screener/candle_ring.py
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from mexc.kline_decoder import KlineSeries
+
+# Campos do payload colunar de klines (mesmos nomes da API)
+FIELDS = ("time", "open", "high", "low", "close", "vol", "amount")
+
+
+class CandleRing:
+    """
+    Buffer circular de candles com arrays NumPy pré-alocados (int64 para `time`, float64
+    para o resto); o último candle pode estar aberto.
+
+    Cada candle é gravado duas vezes (posições `i` e `i + capacity`), de modo que os N
+    mais recentes sempre formam uma fatia contígua: as leituras são visões sem cópia e a
+    memória não cresce depois da alocação inicial.
+    """
+    __slots__ = ("capacity", "size", "head", "cols")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.head = -1  # posição (0..capacity-1) do candle mais recente
+        self.cols: Dict[str, np.ndarray] = {
+            f: np.zeros(2 * capacity, dtype=np.int64 if f == "time" else np.float64)
+            for f in FIELDS
+        }
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def last_time(self) -> Optional[int]:
+        return int(self.cols["time"][self.head]) if self.size else None
+
+    def _write(self, pos: int, bar: dict) -> None:
+        for f in FIELDS:
+            value = bar.get(f, 0.0)
+            col = self.cols[f]
+            col[pos] = value
+            col[pos + self.capacity] = value
+
+    def append(self, bar: dict) -> None:
+        self.head = (self.head + 1) % self.capacity
+        self._write(self.head, bar)
+        self.size = min(self.size + 1, self.capacity)
+
+    def update_last(self, bar: dict) -> None:
+        """Atualiza o candle aberto no lugar."""
+        self._write(self.head, bar)
+
+    def upsert(self, bar: dict) -> bool:
+        """
+        Atualiza o candle aberto ou acrescenta um novo.
+        Retorna True quando o candle anterior fechou (chegou um `time` maior).
+        """
+        last = self.last_time
+        if last is not None and bar["time"] < last:
+            return False
+        if last is not None and bar["time"] == last:
+            self.update_last(bar)
+            return False
+        self.append(bar)
+        return last is not None
+
+    def extend(self, data: dict) -> None:
+        """Acrescenta candles de um payload colunar (`time`, `open`, ..., `vol`, `amount`)."""
+        times = data.get("time", [])
+        for i in range(len(times)):
+            self.upsert({f: data[f][i] for f in FIELDS if f in data})
+
+    def view(self, field: str, closed_only: bool = False) -> np.ndarray:
+        """Candles em ordem cronológica, como visão somente leitura do buffer."""
+        n = self.size - 1 if closed_only and self.size else self.size
+        end = self.head + self.capacity + 1 - (self.size - n)
+        out = self.cols[field][end - n:end]
+        out.flags.writeable = False
+        return out
+
+    def bar(self, index: int) -> dict:
+        """Candle por índice a partir do fim (-1 = mais recente)."""
+        if not -self.size <= index < 0:
+            raise IndexError(index)
+        pos = self.head + self.capacity + 1 + index
+        return {f: self.cols[f][pos] for f in FIELDS}
+
+    def payload(self, closed_only: bool = False) -> dict:
+        return {f: self.view(f, closed_only) for f in FIELDS}
+
+    def series(self, symbol: str, closed_only: bool = False) -> KlineSeries:
+        """`KlineSeries` apontando para o buffer (sem cópia)."""
+        v = self.payload(closed_only)
+        return KlineSeries(symbol, v["time"], v["open"], v["high"], v["low"], v["close"], v["vol"], v["amount"])
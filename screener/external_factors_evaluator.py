@@ -1,35 +1,85 @@
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+import pandas as pd
 
 from utils.logger import AppLogger
 from external_data.news_api_wrapper import NewsAPIWrapper
 from external_data.nlp_sentiment_analyzer import NLPSentimentAnalyzer
+from screener.vector_engine import _column
 
 logger = AppLogger(__name__).get_logger()
 
 class ExternalFactorsEvaluator:
-    def __init__(self):
-        self.news_wrapper = NewsAPIWrapper()
-        self.sentiment_analyzer = NLPSentimentAnalyzer()
+    def __init__(
+        self,
+        news_wrapper: Optional[NewsAPIWrapper] = None,
+        sentiment_analyzer: Optional[NLPSentimentAnalyzer] = None
+    ):
+        self.news_wrapper = news_wrapper or NewsAPIWrapper()
+        self.sentiment_analyzer = sentiment_analyzer or NLPSentimentAnalyzer()
+
+    async def aclose(self) -> None:
+        """Fecha o cliente HTTP da NewsAPI e o pool de análise de sentimento."""
+        await self.news_wrapper.aclose()
+        self.sentiment_analyzer.close()
 
     async def evaluate_external_factors(self, symbol: str, df) -> Dict[str, Any]:
         """
         Busca notícias e avalia sentimento, além de medir volume anômalo.
         Retorna campos: anomalous_volume (bool), sentiment (str), news_count (int).
         """
-        # 1) Notícias e sentimento
         try:
             articles = await self.news_wrapper.fetch_news(symbol, language="pt", page_size=5)
-            sentiment = self.sentiment_analyzer.get_overall_sentiment(articles)
-            news_count = len(articles)
         except Exception as e:
-            logger.warning(f"Erro ao buscar ou analisar notícias para {symbol}: {e}")
-            sentiment = "neutro"
-            news_count = 0
+            logger.warning(f"Erro ao buscar notícias para {symbol}: {e}")
+            articles = []
+        sentiment = await self._sentiments({symbol: articles})
+        return {**sentiment[symbol], **self._volume(symbol, df)}
+
+    async def evaluate_batch(self, frames: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Mesmo resultado de `evaluate_external_factors` para vários símbolos ({símbolo: df}),
+        com as notícias buscadas em consultas combinadas em vez de uma por símbolo.
+        O orçamento da NewsAPI vai primeiro para os símbolos de volume mais anômalo.
+        """
+        volume = {sym: self._volume(sym, df) for sym, df in frames.items()}
+        def priority(sym: str) -> float:
+            z = volume[sym]['anomalous_volume_z']
+            return abs(z) if z == z else 0.0  # NaN (volume constante ou curto) = sem prioridade
+
+        by_priority = sorted(frames, key=priority, reverse=True)
+        try:
+            news = await self.news_wrapper.fetch_news_batch(by_priority, language="pt", page_size=5)
+        except Exception as e:
+            logger.warning(f"Erro ao buscar notícias para {len(frames)} símbolos: {e}")
+            news = {}
+        budget = getattr(self.news_wrapper, "budget", None)
+        if budget is not None:
+            logger.info(
+                f"Orçamento NewsAPI: {budget.remaining()} requisições disponíveis agora, "
+                f"{budget.remaining_today()} restantes hoje."
+            )
+        sentiment = await self._sentiments({sym: news.get(sym, []) for sym in frames})
+        return {sym: {**sentiment[sym], **volume[sym]} for sym in frames}
+
+    async def _sentiments(self, articles_by_symbol: Dict[str, list]) -> Dict[str, Dict[str, Any]]:
+        # todos os textos num só lote, analisados fora do event loop
+        try:
+            overall = await self.sentiment_analyzer.overall_many(articles_by_symbol)
+        except Exception as e:
+            logger.warning(f"Erro ao analisar notícias de {len(articles_by_symbol)} símbolo(s): {e}")
+            return {sym: {'sentiment': 'neutro', 'news_count': 0} for sym in articles_by_symbol}
+        return {
+            sym: {'sentiment': overall[sym], 'news_count': len(articles)}
+            for sym, articles in articles_by_symbol.items()
+        }
 
-        # 2) Volume anômalo: z-score da última barra vs média móvel
+    def _volume(self, symbol: str, df) -> Dict[str, Any]:
+        # Volume anômalo: z-score da última barra vs média móvel
         try:
-            volumes = df['volume'].tail(20)
+            # DataFrame de klines ou KlineSeries (modo vetorizado)
+            volumes = pd.Series(_column(df, 'volume')[-20:])
             mean = volumes.mean()
             std = volumes.std()
             last_vol = volumes.iloc[-1]
@@ -41,8 +91,6 @@ class ExternalFactorsEvaluator:
             z_score = 0.0
 
         return {
-            'sentiment': sentiment,
-            'news_count': news_count,
             'anomalous_volume': anomalous,
             'anomalous_volume_z': round(z_score, 2)
         }
@@ -0,0 +1,108 @@
+# screener/gates.py
+
+from typing import Callable, List
+
+import pandas as pd
+
+from config.settings import (
+    EMA_LONG_PERIOD,
+    RSI_PERIOD,
+    MACD_SLOW_PERIOD,
+    VOLUME_MA_PERIOD
+)
+from screener.params import RESISTANCE_BUFFER, RESISTANCE_WINDOW, VOLUME_THRESHOLD_MULTIPLIER
+from utils.logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# janela mínima considerando todos os indicadores
+MIN_BARS = max(EMA_LONG_PERIOD, RSI_PERIOD, MACD_SLOW_PERIOD, VOLUME_MA_PERIOD, RESISTANCE_WINDOW)
+
+
+class Gate:
+    """
+    Uma condição do gatilho de SHORT. `check(gen, df, resistance, indicators)` devolve
+    True se o símbolo passa e pode registrar valores em `indicators`. `cost` é a ordem
+    de avaliação: comparações escalares antes de séries inteiras.
+    """
+    def __init__(self, name: str, cost: int, check: Callable[..., bool]):
+        self.name = name
+        self.cost = cost
+        self.check = check
+
+    def __repr__(self) -> str:
+        return f"Gate({self.name!r}, cost={self.cost})"
+
+
+def _min_bars(gen, df: pd.DataFrame, resistance: float, indicators: dict) -> bool:
+    if df.empty or len(df) < MIN_BARS:
+        logger.debug(f"Rejeitado por histórico: {len(df)} < {MIN_BARS} barras.")
+        return False
+    return True
+
+
+def _resistance(gen, df: pd.DataFrame, resistance: float, indicators: dict) -> bool:
+    close = df['close'].iloc[-1]
+    indicators['resistance_raw'] = resistance
+    buf_res = resistance * RESISTANCE_BUFFER
+    indicators['resistance_buffered'] = buf_res
+    # Para SHORT, close deve estar abaixo do nível bufferizado
+    if close > buf_res:
+        logger.debug(f"Rejeitado por resistência: close={close:.4f} > buf_res={buf_res:.4f}")
+        return False
+    return True
+
+
+def _volume(gen, df: pd.DataFrame, resistance: float, indicators: dict) -> bool:
+    vol = df['volume'].iloc[-1]
+    vol_ma = gen.kernel.of(df).volume_ma().iloc[-1]
+    indicators['volume'] = vol
+    indicators['volume_ma'] = vol_ma
+    if vol < vol_ma * VOLUME_THRESHOLD_MULTIPLIER:
+        logger.debug(f"Rejeitado por volume: vol={vol:.2f} < {vol_ma * VOLUME_THRESHOLD_MULTIPLIER:.2f}")
+        return False
+    return True
+
+
+def _rsi(gen, df: pd.DataFrame, resistance: float, indicators: dict) -> bool:
+    rsi_val = gen.calculate_rsi(df).iloc[-1]
+    indicators['rsi'] = rsi_val
+    if rsi_val >= 50:
+        logger.debug(f"Rejeitado por RSI: {rsi_val:.2f} >= 50")
+        return False
+    return True
+
+
+def _context(gen, df: pd.DataFrame, resistance: float, indicators: dict) -> bool:
+    if not gen.check_context(df):
+        logger.debug("Rejeitado no contexto de baixa.")
+        return False
+    return True
+
+
+def _macd(gen, df: pd.DataFrame, resistance: float, indicators: dict) -> bool:
+    macd_line, signal = gen.calculate_macd(df)
+    macd_val = macd_line.iloc[-1]
+    sig_val = signal.iloc[-1]
+    indicators['macd'] = macd_val
+    indicators['macd_signal'] = sig_val
+    if macd_val >= sig_val:
+        logger.debug(f"Rejeitado por MACD: macd={macd_val:.4f} >= signal={sig_val:.4f}")
+        return False
+    return True
+
+
+# RSI antes do contexto: o contexto reaproveita o RSI memoizado e só acrescenta as EMAs
+DEFAULT_GATES: List[Gate] = sorted([
+    Gate("min_bars", 0, _min_bars),
+    Gate("resistance", 1, _resistance),
+    Gate("volume", 2, _volume),
+    Gate("rsi", 3, _rsi),
+    Gate("context", 4, _context),
+    Gate("macd", 5, _macd),
+], key=lambda g: g.cost)
+
+# ordem das chaves em `indicators`, independente da ordem dos gates
+INDICATOR_KEYS = (
+    'resistance_raw', 'resistance_buffered', 'volume', 'volume_ma', 'rsi', 'macd', 'macd_signal'
+)
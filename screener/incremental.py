@@ -0,0 +1,225 @@
+# screener/incremental.py
+
+from collections import deque
+from typing import Iterable, Optional, Tuple
+
+from config.settings import (
+    EMA_SHORT_PERIOD,
+    EMA_LONG_PERIOD,
+    RSI_PERIOD,
+    MACD_FAST_PERIOD,
+    MACD_SLOW_PERIOD,
+    MACD_SIGNAL_PERIOD,
+    VOLUME_MA_PERIOD
+)
+from screener.params import (
+    RESISTANCE_BUFFER,
+    RESISTANCE_WINDOW,
+    VOLUME_THRESHOLD_MULTIPLIER
+)
+
+NAN = float("nan")
+
+# Folga relativa do pré-filtro: o estado incremental acumula todo o histórico, enquanto
+# `check_trigger` recalcula EMAs/RSI/MACD só sobre a janela de candles (CANDLE_LIMIT)
+PRECHECK_MARGIN = 1e-3
+
+# Indicadores com estado, atualizados em O(1) a cada candle fechado e com os mesmos valores
+# das fórmulas do SignalGenerator (ewm adjust=False, RSI de Wilder, rolling mean/max).
+# `peek(x)` calcula o valor como se `x` fosse o próximo candle, sem alterar o estado
+# (útil para considerar o candle ainda aberto).
+
+
+class EMAState:
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, span: int = None, alpha: float = None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        self.value: Optional[float] = None
+
+    def peek(self, x: float) -> float:
+        if self.value is None:
+            return x
+        return self.alpha * x + (1 - self.alpha) * self.value
+
+    def update(self, x: float) -> float:
+        self.value = self.peek(x)
+        return self.value
+
+
+class WilderRSIState:
+    __slots__ = ("prev", "gain", "loss")
+
+    def __init__(self, period: int = RSI_PERIOD):
+        self.prev: Optional[float] = None
+        self.gain = EMAState(alpha=1 / period)
+        self.loss = EMAState(alpha=1 / period)
+
+    @staticmethod
+    def _rsi(gain: float, loss: float) -> float:
+        if loss == 0:
+            # gain/0 = inf -> RSI 100; 0/0 = NaN, como no pandas
+            return 100.0 if gain > 0 else NAN
+        return 100 - (100 / (1 + gain / loss))
+
+    def peek(self, close: float) -> float:
+        if self.prev is None:
+            return NAN
+        delta = close - self.prev
+        return self._rsi(self.gain.peek(max(delta, 0.0)), self.loss.peek(max(-delta, 0.0)))
+
+    def update(self, close: float) -> float:
+        if self.prev is None:
+            self.prev = close
+            return NAN
+        delta = close - self.prev
+        self.prev = close
+        return self._rsi(self.gain.update(max(delta, 0.0)), self.loss.update(max(-delta, 0.0)))
+
+    @property
+    def value(self) -> float:
+        if self.gain.value is None:
+            return NAN
+        return self._rsi(self.gain.value, self.loss.value)
+
+
+class MACDState:
+    __slots__ = ("fast", "slow", "signal")
+
+    def __init__(self, fast: int = MACD_FAST_PERIOD, slow: int = MACD_SLOW_PERIOD, signal: int = MACD_SIGNAL_PERIOD):
+        self.fast = EMAState(span=fast)
+        self.slow = EMAState(span=slow)
+        self.signal = EMAState(span=signal)
+
+    def peek(self, close: float) -> Tuple[float, float]:
+        line = self.fast.peek(close) - self.slow.peek(close)
+        return line, self.signal.peek(line)
+
+    def update(self, close: float) -> Tuple[float, float]:
+        line = self.fast.update(close) - self.slow.update(close)
+        return line, self.signal.update(line)
+
+    @property
+    def value(self) -> Tuple[float, float]:
+        if self.signal.value is None:
+            return NAN, NAN
+        return self.fast.value - self.slow.value, self.signal.value
+
+
+class RollingMeanState:
+    """Média móvel simples (NaN até completar a janela), com soma corrente."""
+    __slots__ = ("window", "values", "total")
+
+    def __init__(self, window: int = VOLUME_MA_PERIOD):
+        self.window = window
+        self.values: deque = deque()
+        self.total = 0.0
+
+    def update(self, x: float) -> float:
+        self.values.append(x)
+        self.total += x
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.total / self.window if len(self.values) == self.window else NAN
+
+
+class RollingMaxState:
+    """Máximo móvel com deque monotônico (O(1) amortizado por candle)."""
+    __slots__ = ("window", "count", "dq")
+
+    def __init__(self, window: int = RESISTANCE_WINDOW):
+        self.window = window
+        self.count = 0
+        self.dq: deque = deque()  # (índice, valor) com valores decrescentes
+
+    def update(self, x: float) -> float:
+        while self.dq and self.dq[-1][1] <= x:
+            self.dq.pop()
+        self.dq.append((self.count, x))
+        self.count += 1
+        while self.dq[0][0] <= self.count - 1 - self.window:
+            self.dq.popleft()
+        return self.value
+
+    def peek(self, x: float) -> float:
+        if self.count + 1 < self.window:
+            return NAN
+        # candidatos que continuariam na janela após a entrada de `x`
+        kept = [v for i, v in self.dq if i > self.count - self.window]
+        return max(kept + [x])
+
+    @property
+    def value(self) -> float:
+        return self.dq[0][1] if self.count >= self.window else NAN
+
+
+class IndicatorSet:
+    """
+    Estado completo de uma série (símbolo/intervalo) para o screener em streaming:
+    EMAs do contexto, RSI, MACD, média de volume e máximo móvel das máximas (resistência).
+    """
+    def __init__(self):
+        self.ema_short = EMAState(span=EMA_SHORT_PERIOD)
+        self.ema_long = EMAState(span=EMA_LONG_PERIOD)
+        self.rsi = WilderRSIState(RSI_PERIOD)
+        self.macd = MACDState()
+        self.volume_ma = RollingMeanState(VOLUME_MA_PERIOD)
+        self.high_max = RollingMaxState(RESISTANCE_WINDOW)
+        self.count = 0
+        self.close = NAN
+        self.volume = NAN
+
+    def seed(self, closes: Iterable[float], highs: Iterable[float], volumes: Iterable[float]) -> None:
+        for c, h, v in zip(closes, highs, volumes):
+            self.update(c, h, v)
+
+    def update(self, close: float, high: float, volume: float) -> None:
+        """Incorpora um candle fechado."""
+        self.ema_short.update(close)
+        self.ema_long.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.volume_ma.update(volume)
+        self.high_max.update(high)
+        self.count += 1
+        self.close, self.volume = close, volume
+
+    def context(self, open_close: float = None, margin: float = 0.0) -> bool:
+        """
+        Mesmo critério de `check_context`; com `open_close` considera o candle aberto
+        como última barra (sem alterar o estado). `margin` afrouxa os limites (EMAs em
+        termos relativos, RSI em `100 * margin` pontos).
+        """
+        if open_close is None:
+            ema_s, ema_l, rsi_val = self.ema_short.value, self.ema_long.value, self.rsi.value
+        else:
+            ema_s, ema_l = self.ema_short.peek(open_close), self.ema_long.peek(open_close)
+            rsi_val = self.rsi.peek(open_close)
+        if ema_s is None or ema_l is None:
+            return False
+        return ema_s < ema_l * (1 + margin) and rsi_val < 50 + 100 * margin
+
+    def resistance(self, open_high: float = None) -> float:
+        return self.high_max.value if open_high is None else self.high_max.peek(open_high)
+
+    def trigger_precheck(self, resistance: float, min_bars: int, margin: float = PRECHECK_MARGIN) -> bool:
+        """
+        Pré-filtro O(1) com as rejeições de `check_trigger` sobre os candles fechados.
+        Resistência e volume usam janelas finitas e batem exatamente; EMAs, RSI e MACD vêm
+        de todo o histórico e diferem um pouco dos recalculados na janela de `check_trigger`,
+        por isso só rejeitam além de `margin`. Não é garantia: um caso na fronteira, com
+        diferença maior que a margem, ainda pode ser descartado.
+        """
+        if not self.context(margin=margin) or self.count < min_bars:
+            return False
+        macd_val, sig_val = self.macd.value
+        return not (
+            self.close > resistance * RESISTANCE_BUFFER
+            or self.volume < self.volume_ma.value * VOLUME_THRESHOLD_MULTIPLIER
+            or self.rsi.value >= 50 + 100 * margin
+            or macd_val >= sig_val + margin * self.close   # MACD em unidades de preço
+        )
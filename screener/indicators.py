@@ -0,0 +1,126 @@
+# screener/indicators.py
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from config.settings import (
+    RSI_PERIOD,
+    MACD_FAST_PERIOD,
+    MACD_SLOW_PERIOD,
+    MACD_SIGNAL_PERIOD,
+    VOLUME_MA_PERIOD,
+    INDICATOR_CACHE_MAX_MB
+)
+from screener.params import RESISTANCE_WINDOW
+
+# séries float64 que uma entrada pode acumular: EMAs curta e longa, RSI, MACD (linha e sinal), média de volume
+_INDICATOR_COLUMNS = 6
+
+
+# Fórmulas dos indicadores (fonte única para SignalGenerator e filter_engine)
+
+def ema(close: pd.Series, span: int) -> pd.Series:
+    return close.ewm(span=span, adjust=False).mean()
+
+
+def rsi(close: pd.Series, period: int = RSI_PERIOD) -> pd.Series:
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1/period, adjust=False).mean()
+    loss = -delta.clip(upper=0).ewm(alpha=1/period, adjust=False).mean()
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def macd(close: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    macd_line = ema(close, MACD_FAST_PERIOD) - ema(close, MACD_SLOW_PERIOD)
+    signal = macd_line.ewm(span=MACD_SIGNAL_PERIOD, adjust=False).mean()
+    return macd_line, signal
+
+
+def resistance(df: pd.DataFrame) -> float:
+    if len(df) < RESISTANCE_WINDOW:
+        raise ValueError(f"DataFrame precisa de ao menos {RESISTANCE_WINDOW} candles para resistência.")
+    # Garante ordenação por timestamp ascendente
+    df_sorted = df.sort_index()
+    return df_sorted['high'].rolling(window=RESISTANCE_WINDOW).max().iloc[-1]
+
+
+class SeriesIndicators:
+    """Indicadores de uma série de candles, calculados sob demanda e no máximo uma vez."""
+    __slots__ = ("df", "_values")
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._values: Dict[Hashable, object] = {}
+
+    def _get(self, key: Hashable, compute):
+        if key not in self._values:
+            self._values[key] = compute()
+        return self._values[key]
+
+    def ema(self, span: int) -> pd.Series:
+        return self._get(("ema", span), lambda: ema(self.df['close'], span))
+
+    def rsi(self) -> pd.Series:
+        return self._get("rsi", lambda: rsi(self.df['close']))
+
+    def macd(self) -> Tuple[pd.Series, pd.Series]:
+        return self._get("macd", lambda: macd(self.df['close']))
+
+    def volume_ma(self) -> pd.Series:
+        return self._get("volume_ma", lambda: self.df['volume'].rolling(window=VOLUME_MA_PERIOD).mean())
+
+    def resistance(self) -> float:
+        return self._get("resistance", lambda: resistance(self.df))
+
+
+class IndicatorKernel:
+    """
+    Memoiza `SeriesIndicators` por série: a chave é símbolo, espaçamento entre barras
+    (o intervalo), timestamp e valores da última barra. Assim contexto e gatilho do mesmo
+    candle compartilham RSI/EMAs, e um candle aberto atualizado gera uma chave nova.
+    Séries sem símbolo ou sem `time` não são memoizadas.
+
+    O LRU é limitado por memória estimada (`max_bytes`): o DataFrame mais as colunas de
+    indicadores que ele pode acumular, e não por nº de séries.
+    """
+    def __init__(self, max_bytes: int = int(INDICATOR_CACHE_MAX_MB * 2 ** 20)):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._series: "OrderedDict[Hashable, Tuple[SeriesIndicators, int]]" = OrderedDict()
+
+    @staticmethod
+    def estimate_bytes(df: pd.DataFrame) -> int:
+        return int(df.memory_usage(index=True, deep=False).sum()) + len(df) * 8 * _INDICATOR_COLUMNS
+
+    @staticmethod
+    def series_key(df: pd.DataFrame) -> Optional[Hashable]:
+        if df.empty or 'symbol' not in df.columns or 'time' not in df.columns:
+            return None
+        times = df['time']
+        spacing = times.iat[-1] - times.iat[-2] if len(df) > 1 else None
+        last = tuple(df[c].iat[-1] if c in df.columns else None for c in ('close', 'high', 'volume'))
+        return (df['symbol'].iat[-1], spacing, times.iat[0], times.iat[-1], len(df)) + last
+
+    def of(self, df: pd.DataFrame) -> SeriesIndicators:
+        key = self.series_key(df)
+        if key is None:
+            return SeriesIndicators(df)
+        entry = self._series.get(key)
+        if entry is not None:
+            self._series.move_to_end(key)
+            return entry[0]
+        indicators, size = SeriesIndicators(df), self.estimate_bytes(df)
+        self._series[key] = (indicators, size)
+        self.nbytes += size
+        # a série recém-inserida fica mesmo se sozinha passar do limite
+        while self.nbytes > self.max_bytes and len(self._series) > 1:
+            _, (_, evicted) = self._series.popitem(last=False)
+            self.nbytes -= evicted
+        return indicators
+
+    def clear(self) -> None:
+        self._series.clear()
+        self.nbytes = 0
@@ -3,6 +3,8 @@
 import asyncio
 from typing import List, Optional
 
+import pandas as pd
+
 from config.settings import MIN_VOLUME_24H_USD, MIN_OPEN_INTEREST_USD
 from mexc.mexc_api import MexcApiAsync
 from utils.logger import AppLogger
@@ -13,7 +15,23 @@ class LiquidityFilter:
     def __init__(self, api: MexcApiAsync):
         self.api = api
 
-    async def filter_by_liquidez(self, symbols: List[str], max_concurrent: int = 5) -> List[str]:
+    async def filter_by_liquidez(
+        self,
+        symbols: List[str],
+        max_concurrent: int = 5,
+        bulk: bool = True
+    ) -> List[str]:
+        # Modo em lote: um único ticker de todos os contratos, filtrado de forma vetorizada
+        if bulk and hasattr(self.api, "get_all_tickers"):
+            try:
+                tickers = await self.api.get_all_tickers()
+            except Exception as e:
+                logger.debug(f"Erro ao obter tickers em lote: {e}")
+                tickers = []
+            if tickers:
+                return self.filter_from_tickers(symbols, tickers)
+            logger.debug("Tickers em lote indisponíveis; consultando símbolo a símbolo.")
+
         sem = asyncio.Semaphore(max_concurrent)
         failed_syms: List[str] = []
 
@@ -41,3 +59,33 @@ class LiquidityFilter:
         logger.debug(f"Símbolos excluídos por liquidez insuficiente ou erro: {failed_syms}")
 
         return passed
+
+    @staticmethod
+    def filter_from_tickers(symbols: List[str], tickers: List[dict]) -> List[str]:
+        """
+        Filtra `symbols` a partir da resposta em lote do ticker, numa única passada vetorizada.
+        Usa os mesmos campos de `obter_liquidez` (volume24/amount24 e holdVol/hold_vol)
+        e preserva a ordem de `symbols`.
+        """
+        df = pd.DataFrame(tickers)
+        if df.empty or "symbol" not in df.columns:
+            logger.info("0 símbolos passaram no filtro de liquidez.")
+            return []
+
+        def _numeric(primary: str, fallback: str) -> pd.Series:
+            col = df[primary] if primary in df.columns else pd.Series(float("nan"), index=df.index)
+            if fallback in df.columns:
+                col = col.fillna(df[fallback])
+            return pd.to_numeric(col, errors="coerce").fillna(0.0)
+
+        vol = _numeric("volume24", "amount24")
+        oi = _numeric("holdVol", "hold_vol")
+        liquid = df.loc[(vol >= MIN_VOLUME_24H_USD) & (oi >= MIN_OPEN_INTEREST_USD), "symbol"]
+
+        universe = pd.Series(symbols, dtype=object)
+        mask = universe.isin(liquid)
+        passed = universe[mask].tolist()
+
+        logger.info(f"{len(passed)} símbolos passaram no filtro de liquidez.")
+        logger.debug(f"Símbolos excluídos por liquidez insuficiente: {universe[~mask].tolist()}")
+        return passed
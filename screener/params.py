@@ -0,0 +1,12 @@
+# screener/params.py
+
+# Parâmetros da estratégia de SHORT, fonte única para SignalGenerator, gates, indicadores,
+# motores vetorizado/incremental, regra DSL padrão e backtest.
+
+# Buffers e parâmetros de risco para operações de SHORT
+ENTRY_BUFFER = 0.001      # entry 0.1% abaixo do close
+STOP_BUFFER = 0.002       # SL 0.2% acima da resistência
+RESISTANCE_BUFFER = 0.995 # considera resistência 0.5% abaixo do topo
+RR_TARGET = 1.5           # target de reward:risk
+RESISTANCE_WINDOW = 8     # candles para calcular resistência
+VOLUME_THRESHOLD_MULTIPLIER = 0.8  # volume >= 80% da média
@@ -0,0 +1,117 @@
+# screener/process_evaluator.py
+
+import asyncio
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import SCREENER_PROCESS_WORKERS, SCREENER_PROCESS_BATCH
+from screener.signal_generator import SignalGenerator
+from utils.logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+# Colunas usadas por contexto/gatilho; só elas atravessam a fronteira entre processos
+_COLUMNS = ("time", "high", "close", "volume")
+
+# um SignalGenerator (e seu IndicatorKernel) por processo do pool
+_worker_gen: Optional[SignalGenerator] = None
+
+
+def to_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Reduz o DataFrame de klines aos arrays NumPy necessários para a avaliação."""
+    return {c: df[c].to_numpy() for c in _COLUMNS if c in df.columns}
+
+
+def _frame(sym: str, arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    df = pd.DataFrame(arrays)
+    df["symbol"] = sym
+    return df
+
+
+def _gen() -> SignalGenerator:
+    global _worker_gen
+    if _worker_gen is None:
+        _worker_gen = SignalGenerator()
+    return _worker_gen
+
+
+def _context_batch(batch: List[Tuple[str, Dict[str, np.ndarray]]]) -> Tuple[List[Optional[float]], Counter]:
+    """Resistência de cada símbolo com contexto de baixa no trend (None se rejeitado)."""
+    gen = _gen()
+    gen.reset_stats()
+    out = []
+    for sym, arrays in batch:
+        df = _frame(sym, arrays)
+        try:
+            if not gen.check_context(df):
+                gen.rejections["trend_context"] += 1
+                out.append(None)
+                continue
+            out.append(float(gen.calculate_resistance_h1(df)))
+        except Exception as e:
+            logger.warning(f"Erro avaliando contexto de {sym}: {e}")
+            out.append(None)
+    return out, gen.rejections.copy()
+
+
+def _trigger_batch(batch: List[Tuple[str, Dict[str, np.ndarray], float]]) -> Tuple[List[Optional[dict]], Counter]:
+    """`check_trigger` de cada símbolo do lote, na ordem recebida."""
+    gen = _gen()
+    gen.reset_stats()
+    out = [gen.check_trigger(_frame(sym, arrays), resistance) for sym, arrays, resistance in batch]
+    return out, gen.rejections.copy()
+
+
+class ProcessEvaluator:
+    """
+    Executa contexto e gatilho do `SignalGenerator` num pool de processos: o event loop
+    só envia lotes de arrays de candles e recebe os resultados, que voltam na ordem dos
+    símbolos. Os contadores de rejeição dos processos são somados em `rejections`.
+    """
+    def __init__(self, max_workers: int = SCREENER_PROCESS_WORKERS, batch_size: int = SCREENER_PROCESS_BATCH):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.rejections: Counter = Counter()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: não herda o event loop nem as threads do processo principal
+            self._pool = ProcessPoolExecutor(
+                self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def _map_batches(self, fn, items: list) -> list:
+        loop = asyncio.get_running_loop()
+        batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        done = await asyncio.gather(*(
+            loop.run_in_executor(self._executor(), fn, batch) for batch in batches
+        ))
+        results = []
+        for part, rejections in done:
+            results.extend(part)
+            self.rejections.update(rejections)
+        return results
+
+    async def context(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, float]:
+        """{símbolo: resistência} dos símbolos com contexto de baixa, na ordem de `frames`."""
+        items = [(sym, to_arrays(df)) for sym, df in frames.items()]
+        resistances = await self._map_batches(_context_batch, items)
+        return {sym: res for (sym, _), res in zip(items, resistances) if res is not None}
+
+    async def signals(self, frames: Dict[str, pd.DataFrame], resistance: Dict[str, float]) -> List[dict]:
+        """Sinais de `check_trigger` para os símbolos de `frames`, na mesma ordem."""
+        items = [(sym, to_arrays(df), resistance[sym]) for sym, df in frames.items()]
+        return [s for s in await self._map_batches(_trigger_batch, items) if s]
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,53 @@
+# screener/resampler.py
+
+import pandas as pd
+
+from config.settings import _PERIODS
+
+
+def resample_ohlcv(
+    df: pd.DataFrame,
+    from_interval: str,
+    to_interval: str,
+    include_partial: bool = True
+) -> pd.DataFrame:
+    """
+    Agrega candles de `from_interval` em candles de `to_interval` (ex.: Min15 -> Min60),
+    no mesmo formato de `MexcApiAsync.klines_to_dataframe`.
+
+    - O primeiro bucket é descartado se estiver incompleto (a janela buscada raramente
+      começa alinhada ao timeframe maior), pois sua abertura/máxima/mínima estariam erradas.
+    - O último bucket incompleto é o candle ainda aberto do timeframe maior; é mantido
+      quando `include_partial=True`, como a própria exchange faz ao retornar klines.
+    """
+    if df.empty:
+        return df.copy()
+    src, dst = _PERIODS[from_interval], _PERIODS[to_interval]
+    if dst % src:
+        raise ValueError(f"{to_interval} não é múltiplo de {from_interval}.")
+    per_bucket = dst // src
+
+    epoch = (df["time"] - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
+    bucket = (epoch // dst) * dst
+    agg = {
+        "open": "first", "high": "max", "low": "min", "close": "last",
+        "volume": "sum", "amount": "sum",
+    }
+    agg = {col: fn for col, fn in agg.items() if col in df.columns}
+    grouped = df.groupby(bucket.values, sort=True)
+    out = grouped.agg(agg)
+    counts = grouped.size()
+
+    # bucket inicial incompleto: faltam candles anteriores ao início da janela
+    first_epoch = int(epoch.iloc[0])
+    if first_epoch != out.index[0] and counts.iloc[0] < per_bucket:
+        out, counts = out.iloc[1:], counts.iloc[1:]
+    # bucket final incompleto = candle aberto do timeframe maior
+    if not include_partial and len(out) and counts.iloc[-1] < per_bucket:
+        out = out.iloc[:-1]
+
+    out.insert(0, "time", pd.to_datetime(out.index.to_numpy(), unit="s"))
+    out = out.reset_index(drop=True)
+    if "symbol" in df.columns:
+        out["symbol"] = df["symbol"].iloc[-1]
+    return out
@@ -0,0 +1,375 @@
+# screener/rule_dsl.py
+
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    EMA_SHORT_PERIOD,
+    EMA_LONG_PERIOD,
+    RSI_PERIOD,
+    MACD_FAST_PERIOD,
+    MACD_SLOW_PERIOD,
+    MACD_SIGNAL_PERIOD,
+    VOLUME_MA_PERIOD
+)
+from screener.params import RESISTANCE_BUFFER, VOLUME_THRESHOLD_MULTIPLIER
+from screener.vector_engine import ema, sma, rolling_max, rsi, stack, _column
+
+# Linguagem de regras sobre candles, compilada para operações NumPy sobre matrizes
+# (símbolos x barras). Exemplo:
+#
+#   ema(9) < ema(21) and rsi(14) < 50 and volume >= 0.8 * sma(volume, 20)
+#
+# Cada subexpressão vira um nó imutável (tupla); nós iguais — inclusive entre regras
+# diferentes do mesmo RuleSet — são calculados uma única vez por avaliação. Erros de tipo
+# (ex.: `not close`) são detectados na compilação. O screener aplica a regra de
+# SCREENER_TRIGGER_RULE aos sinais gerados.
+
+Node = Tuple
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+_COMPARE = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+            "==": np.equal, "!=": np.not_equal}
+_ARITH = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": np.divide}
+# operandos podem ser reordenados sem mudar o resultado: mais subexpressões compartilhadas
+_COMMUTATIVE = {"+", "*", "==", "!=", "and", "or"}
+
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*|\.\d+)|([A-Za-z_]\w*)|(<=|>=|==|!=|[<>+\-*/(),]))")
+
+
+# Gatilho de SHORT do SignalGenerator escrito na linguagem (`resistance` vem do trend)
+SHORT_TRIGGER = (
+    f"ema({EMA_SHORT_PERIOD}) < ema({EMA_LONG_PERIOD}) and rsi({RSI_PERIOD}) < 50"
+    f" and close <= resistance * {RESISTANCE_BUFFER}"
+    f" and volume >= {VOLUME_THRESHOLD_MULTIPLIER} * sma(volume, {VOLUME_MA_PERIOD})"
+    f" and macd({MACD_FAST_PERIOD}, {MACD_SLOW_PERIOD})"
+    f" < macd_signal({MACD_FAST_PERIOD}, {MACD_SLOW_PERIOD}, {MACD_SIGNAL_PERIOD})"
+)
+
+
+class RuleSyntaxError(ValueError):
+    pass
+
+
+def tokenize(text: str) -> List[Tuple[str, str, int]]:
+    """Lista de (tipo, valor, posição) com tipo em num/name/op."""
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m:
+            raise RuleSyntaxError(f"Caractere inesperado na posição {pos}: {text[pos]!r}")
+        kind = "num" if m.group(1) else "name" if m.group(2) else "op"
+        tokens.append((kind, m.group(m.lastindex), m.start(m.lastindex)))
+        pos = m.end()
+    return tokens
+
+
+def _series_period(fname: str, args: List[Node], n_periods: int) -> Tuple[Node, ...]:
+    # ema(9) == ema(close, 9): a série é opcional e vale close
+    if len(args) == n_periods:
+        args = [("col", "close")] + args
+    if len(args) != n_periods + 1:
+        raise RuleSyntaxError(f"{fname}() espera {n_periods} período(s) e uma série opcional.")
+    series, periods = args[0], args[1:]
+    for p in periods:
+        if p[0] != "num" or p[1] != int(p[1]) or p[1] < 1:
+            raise RuleSyntaxError(f"{fname}(): períodos devem ser inteiros positivos.")
+    return (series,) + tuple(("num", int(p[1])) for p in periods)
+
+
+# nome -> nº de períodos inteiros (após a série opcional)
+FUNCTIONS = {"ema": 1, "sma": 1, "rsi": 1, "highest": 1, "lowest": 1, "shift": 1,
+             "macd": 2, "macd_signal": 3}
+
+
+class _Parser:
+    """Descida recursiva: or > and > not > comparação > soma > produto > unário > átomo."""
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.i = 0
+
+    def _peek(self) -> Optional[Tuple[str, str, int]]:
+        return self.tokens[self.i] if self.i < len(self.tokens) else None
+
+    def _accept(self, *values: str) -> Optional[str]:
+        tok = self._peek()
+        if tok and tok[0] in ("op", "name") and tok[1] in values:
+            self.i += 1
+            return tok[1]
+        return None
+
+    def _expect(self, value: str) -> None:
+        if not self._accept(value):
+            tok = self._peek()
+            where = f"posição {tok[2]}" if tok else "fim da regra"
+            raise RuleSyntaxError(f"Esperado {value!r} em {where}: {self.text!r}")
+
+    def parse(self) -> Node:
+        node = self._or()
+        if self._peek():
+            raise RuleSyntaxError(f"Token inesperado na posição {self._peek()[2]}: {self.text!r}")
+        return node
+
+    def _binary(self, op: str, a: Node, b: Node) -> Node:
+        if op in _COMMUTATIVE and repr(b) < repr(a):
+            a, b = b, a
+        return ("bin", op, a, b)
+
+    def _or(self) -> Node:
+        node = self._and()
+        while self._accept("or"):
+            node = self._binary("or", node, self._and())
+        return node
+
+    def _and(self) -> Node:
+        node = self._not()
+        while self._accept("and"):
+            node = self._binary("and", node, self._not())
+        return node
+
+    def _not(self) -> Node:
+        if self._accept("not"):
+            return ("not", self._not())
+        return self._comparison()
+
+    def _comparison(self) -> Node:
+        node = self._sum()
+        op = self._accept(*_COMPARE)
+        if op:
+            node = self._binary(op, node, self._sum())
+        return node
+
+    def _sum(self) -> Node:
+        node = self._product()
+        while True:
+            op = self._accept("+", "-")
+            if not op:
+                return node
+            node = self._binary(op, node, self._product())
+
+    def _product(self) -> Node:
+        node = self._unary()
+        while True:
+            op = self._accept("*", "/")
+            if not op:
+                return node
+            node = self._binary(op, node, self._unary())
+
+    def _unary(self) -> Node:
+        if self._accept("-"):
+            operand = self._unary()
+            return ("num", -operand[1]) if operand[0] == "num" else ("neg", operand)
+        return self._atom()
+
+    def _atom(self) -> Node:
+        tok = self._peek()
+        if tok is None:
+            raise RuleSyntaxError(f"Regra incompleta: {self.text!r}")
+        kind, value, _ = tok
+        if self._accept("("):
+            node = self._or()
+            self._expect(")")
+            return node
+        self.i += 1
+        if kind == "num":
+            return ("num", float(value))
+        if kind != "name":
+            raise RuleSyntaxError(f"Token inesperado na posição {tok[2]}: {value!r}")
+        if not self._accept("("):
+            # colunas de candles ou variáveis por símbolo (ex.: resistance)
+            return ("col", value) if value in COLUMNS else ("var", value)
+        if value not in FUNCTIONS:
+            raise RuleSyntaxError(f"Função desconhecida: {value}()")
+        args = [self._or()]
+        while self._accept(","):
+            args.append(self._or())
+        self._expect(")")
+        call = _series_period(value, args, FUNCTIONS[value])
+        if value in ("macd", "macd_signal"):
+            return _macd(value, *call)
+        return ("call", value) + call
+
+
+def _macd(fname: str, series: Node, fast: Node, slow: Node, signal: Node = None) -> Node:
+    # MACD reescrito em EMAs: as médias passam a ser compartilhadas com o resto da regra
+    line = ("bin", "-", ("call", "ema", series, fast), ("call", "ema", series, slow))
+    return line if fname == "macd" else ("call", "ema", line, signal)
+
+
+def _children(node: Node) -> Tuple[Node, ...]:
+    kind = node[0]
+    if kind == "bin":
+        return node[2], node[3]
+    if kind in ("neg", "not"):
+        return (node[1],)
+    if kind == "call":
+        return node[2:]
+    return ()
+
+
+def _topological(roots: List[Node]) -> List[Node]:
+    """Nós únicos em ordem de dependência (filhos antes dos pais)."""
+    order, seen = [], set()
+
+    def visit(node: Node) -> None:
+        if node in seen:
+            return
+        for child in _children(node):
+            visit(child)
+        seen.add(node)
+        order.append(node)
+
+    for root in roots:
+        visit(root)
+    return order
+
+
+def _type(node: Node, text: str) -> str:
+    """
+    Tipo do nó ("num", "bool" ou "any" para variáveis, que podem ser de qualquer um),
+    verificado na compilação: operandos trocados viram RuleSyntaxError em vez de
+    TypeError/AttributeError na avaliação.
+    """
+    kind = node[0]
+    if kind in ("num", "col"):
+        return "num"
+    if kind == "var":
+        return "any"
+
+    def expect(child: Node, wanted: str, what: str) -> str:
+        got = _type(child, text)
+        if got not in (wanted, "any"):
+            expected = "numérico" if wanted == "num" else "booleano"
+            raise RuleSyntaxError(f"{what} espera operando {expected}: {text!r}")
+        return got
+
+    if kind == "neg":
+        expect(node[1], "num", "'-'")
+        return "num"
+    if kind == "not":
+        expect(node[1], "bool", "'not'")
+        return "bool"
+    if kind == "call":
+        # período no lugar da série, ex.: ema(3, 9)
+        if node[2][0] == "num":
+            raise RuleSyntaxError(f"{node[1]}() espera uma série, não um número: {text!r}")
+        expect(node[2], "num", f"{node[1]}()")
+        return "num"
+    op, a, b = node[1], node[2], node[3]
+    if op in ("and", "or"):
+        expect(a, "bool", f"'{op}'")
+        expect(b, "bool", f"'{op}'")
+        return "bool"
+    if op in ("==", "!="):
+        ta, tb = _type(a, text), _type(b, text)
+        if "any" not in (ta, tb) and ta != tb:
+            raise RuleSyntaxError(f"'{op}' compara operandos de tipos diferentes: {text!r}")
+        return "bool"
+    expect(a, "num", f"'{op}'")
+    expect(b, "num", f"'{op}'")
+    return "bool" if op in _COMPARE else "num"
+
+
+def parse(text: str) -> Node:
+    """Compila a regra; ela precisa ser uma condição booleana."""
+    node = _Parser(text).parse()
+    if _type(node, text) == "num":
+        raise RuleSyntaxError(f"A regra não é uma condição booleana: {text!r}")
+    return node
+
+
+class RuleSet:
+    """
+    Conjunto de regras nomeadas (ex.: variantes short/long) avaliadas numa só passada:
+    o plano de execução é a união dos nós de todas as regras, sem repetição.
+    """
+    def __init__(self, rules: Dict[str, str]):
+        self.rules = dict(rules)
+        self.roots = {name: parse(text) for name, text in self.rules.items()}
+        self.plan = _topological(list(self.roots.values()))
+        self.variables = sorted({n[1] for n in self.plan if n[0] == "var"})
+
+    def _step(self, node: Node, values: Dict[Node, object], data: Dict[str, np.ndarray]):
+        kind = node[0]
+        if kind == "num":
+            return node[1]
+        if kind in ("col", "var"):
+            if node[1] not in data:
+                raise KeyError(f"Regra usa {node[1]!r}, ausente nos dados.")
+            value = np.asarray(data[node[1]], dtype=np.float64)
+            # variáveis por símbolo (1-D) valem para todas as barras
+            return value[:, None] if value.ndim == 1 else value
+        if kind == "neg":
+            return -values[node[1]]
+        if kind == "not":
+            return ~values[node[1]]
+        if kind == "bin":
+            op, a, b = node[1], values[node[2]], values[node[3]]
+            if op == "and":
+                return a & b
+            if op == "or":
+                return a | b
+            return (_COMPARE.get(op) or _ARITH[op])(a, b)
+        fname, series = node[1], values[node[2]]
+        periods = [p[1] for p in node[3:]]
+        if fname == "ema":
+            return ema(series, span=periods[0])
+        if fname == "sma":
+            return sma(series, periods[0])
+        if fname == "rsi":
+            return rsi(series, periods[0])
+        if fname == "highest":
+            return rolling_max(series, periods[0])
+        if fname == "lowest":
+            return -rolling_max(-series, periods[0])
+        # shift
+        out = np.full_like(series, np.nan)
+        out[:, periods[0]:] = series[:, :-periods[0]]
+        return out
+
+    def evaluate(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Avalia todas as regras sobre matrizes (símbolos x barras) de `data` (colunas e
+        variáveis). Retorna {regra: matriz booleana}; NaN nunca satisfaz uma comparação.
+        """
+        values: Dict[Node, object] = {}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for node in self.plan:
+                values[node] = self._step(node, values, data)
+        out = {}
+        for name, root in self.roots.items():
+            result = values[root]
+            if np.asarray(result).dtype != bool:
+                raise RuleSyntaxError(f"Regra {name!r} não é uma condição booleana.")
+            out[name] = result
+        return out
+
+    def evaluate_frames(
+        self,
+        frames: Dict[str, Union[pd.DataFrame, object]],
+        variables: Optional[Dict[str, Dict[str, float]]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Avalia a última barra de cada símbolo (DataFrame de klines ou KlineSeries).
+        `variables` traz valores por símbolo, ex.: {"resistance": {sym: nível}}.
+        Retorna {regra: símbolos aprovados}, na ordem de `frames`.
+        """
+        symbols = list(frames)
+        if not symbols:
+            return {name: [] for name in self.roots}
+        needed = {n[1] for n in self.plan if n[0] == "col"}
+        length = max(len(_column(frames[s], "close")) for s in symbols)
+        data = {c: stack([_column(frames[s], c) for s in symbols], length) for c in needed}
+        for name in self.variables:
+            per_symbol = (variables or {}).get(name, {})
+            data[name] = np.array([per_symbol.get(s, np.nan) for s in symbols], dtype=np.float64)
+        masks = self.evaluate(data)
+        return {
+            name: [s for s, ok in zip(symbols, np.broadcast_to(mask, (len(symbols), length))[:, -1]) if ok]
+            for name, mask in masks.items()
+        }
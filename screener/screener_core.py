@@ -1,12 +1,20 @@
 import asyncio
 import time
 import html
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Optional, Tuple, Callable, Awaitable
+
+import pandas as pd
 
 from utils.logger import AppLogger
 from mexc.mexc_api import MexcApiAsync
+from mexc.kline_decoder import KlineSeries
 from screener.liquidity_filter import LiquidityFilter
 from screener.signal_generator import SignalGenerator
+from screener.resampler import resample_ohlcv
+from screener.vector_engine import CrossSectionalEngine, _column
+from screener.process_evaluator import ProcessEvaluator
+from screener.rule_dsl import RuleSet
+from screener.trend_cache import TrendCache
 from screener.external_factors_evaluator import ExternalFactorsEvaluator
 from notifier.telegram_notifier import TelegramNotifier
 from notifier.message_formatter import MessageFormatter
@@ -24,6 +32,11 @@ TIMEFRAME_TREND = settings.TIMEFRAME_TREND
 TIMEFRAME_ENTRY = settings.TIMEFRAME_ENTRY
 CANDLE_LIMIT   = settings.CANDLE_LIMIT
 _PERIODS       = settings._PERIODS
+SCREENER_MAX_WORKERS    = settings.SCREENER_MAX_WORKERS
+SCREENER_SYMBOL_TIMEOUT = settings.SCREENER_SYMBOL_TIMEOUT
+DERIVED_TIMEFRAMES      = settings.DERIVED_TIMEFRAMES
+SCREENER_EVAL_MODE      = settings.SCREENER_EVAL_MODE
+SCREENER_TRIGGER_RULE   = settings.SCREENER_TRIGGER_RULE
 
 
 class ScreenerCore:
@@ -31,20 +44,64 @@ class ScreenerCore:
         self,
         api: MexcApiAsync,
         notifier: TelegramNotifier,
-        ext_evaluator: ExternalFactorsEvaluator
+        ext_evaluator: ExternalFactorsEvaluator,
+        max_workers: int = SCREENER_MAX_WORKERS,
+        symbol_timeout: float = SCREENER_SYMBOL_TIMEOUT,
+        close_api: bool = True,
+        close_ext_evaluator: bool = False,
+        derive_trend: bool = TIMEFRAME_TREND in DERIVED_TIMEFRAMES,
+        eval_mode: str = SCREENER_EVAL_MODE,
+        process_evaluator: Optional[ProcessEvaluator] = None,
+        trend_cache: Optional[TrendCache] = None,
+        trigger_rule: str = SCREENER_TRIGGER_RULE
     ):
         self.api = api
+        # False quando o cliente pertence a quem chamou (ex.: JobScheduler), que o reutiliza
+        self.close_api = close_api
+        # trend reamostrado a partir dos candles de entrada: uma requisição de klines por símbolo
+        self.derive_trend = derive_trend
         self.notifier = notifier
         self.ext_evaluator = ext_evaluator
+        # idem para o avaliador de fatores externos (cliente HTTP e cache de notícias)
+        self.close_ext_evaluator = close_ext_evaluator
         self.liquidity_filter = LiquidityFilter(api)
         self.signal_gen = SignalGenerator()
+        self.max_workers = max(1, max_workers)
+        self.symbol_timeout = symbol_timeout
+        # "pipeline": símbolo a símbolo; "vector": universo inteiro de uma vez (CrossSectionalEngine);
+        # "process": SignalGenerator em lotes num pool de processos (ProcessEvaluator)
+        self.eval_mode = eval_mode
+        self.engine = CrossSectionalEngine()
+        # regra extra (rule_dsl) aplicada aos sinais de qualquer modo; compilada aqui para
+        # que erros de sintaxe ou de tipo apareçam na inicialização
+        self.trigger_rules = RuleSet({"trigger": trigger_rule}) if trigger_rule else None
+        # pool criado sob demanda quando não é injetado; nesse caso é encerrado ao fim de `run`
+        self.process_evaluator = process_evaluator
+        self._owns_evaluator = process_evaluator is None
+        # vereditos de trend (candles fechados) reaproveitados entre execuções; pertence a quem
+        # mantém o screener rodando (JobScheduler). None = contexto recalculado sempre
+        self.trend_cache = trend_cache
 
     @classmethod
-    async def create(cls):
-        api = await MexcApiAsync().init()
+    async def create(
+        cls,
+        api: MexcApiAsync = None,
+        trend_cache: Optional[TrendCache] = None,
+        ext_evaluator: Optional[ExternalFactorsEvaluator] = None,
+        process_evaluator: Optional[ProcessEvaluator] = None
+    ):
+        """
+        Cria o screener. Se `api`, `ext_evaluator` ou `process_evaluator` forem informados,
+        são compartilhados e não são fechados ao fim de `run`.
+        """
+        owns_api = api is None
+        api = await (api or MexcApiAsync()).init()
         notifier = TelegramNotifier()
-        ext_evaluator = ExternalFactorsEvaluator()
-        return cls(api, notifier, ext_evaluator)
+        owns_ext = ext_evaluator is None
+        ext_evaluator = ext_evaluator or ExternalFactorsEvaluator()
+        return cls(api, notifier, ext_evaluator, close_api=owns_api,
+                   close_ext_evaluator=owns_ext, process_evaluator=process_evaluator,
+                   trend_cache=trend_cache)
 
     async def run(self) -> List[dict]:
         logger.info("Iniciando screener assíncrono…")
@@ -70,56 +127,22 @@ class ScreenerCore:
                 logger.info("Nenhum símbolo passou no filtro de liquidez; aplicando todos.")
             logger.info(f"{len(liquid)} símbolos passarão nos filtros seguintes.")
 
-            # 3) Geração de sinais
-            final_signals: List[dict] = []
-            for sym in liquid:
-                try:
-                    # 3.1) Timeframe trend
-                    trend_raw = await self.api.get_klines(
-                        sym, interval=TIMEFRAME_TREND,
-                        start=trend_start, end=trend_end
-                    )
-                    if not trend_raw:
-                        continue
-                    trend_df = self.api.klines_to_dataframe(trend_raw, sym)
-                    if trend_df.empty or not self.signal_gen.check_context(trend_df):
-                        continue
-                    resistance = self.signal_gen.calculate_resistance_h1(trend_df)
-
-                    # 3.2) Timeframe entry
-                    entry_raw = await self.api.get_klines(
-                        sym, interval=TIMEFRAME_ENTRY,
-                        start=entry_start, end=entry_end
-                    )
-                    if not entry_raw:
-                        continue
-                    entry_df = self.api.klines_to_dataframe(entry_raw, sym)
-                    if entry_df.empty:
-                        continue
-
-                    # 3.3) Gatilho técnico
-                    signal = self.signal_gen.check_trigger(entry_df, resistance)
-                    if not signal:
-                        continue
-
-                    # 3.4) Avalia fatores externos (para uso da IA)
-                    factors = await self.ext_evaluator.evaluate_external_factors(sym, entry_df)
-                    signal.update(factors)
-
-                    # 3.5) Enriquecer sinal com volume médio e tendência
-                    recent_vols = entry_df['volume'].tail(5).tolist()
-                    avg_vol = sum(recent_vols) / len(recent_vols) if recent_vols else 0
-                    recent_closes = entry_df['close'].tail(5).tolist()
-                    trend_dir = (
-                        "alta" if len(recent_closes) >= 2 and recent_closes[-1] > recent_closes[0]
-                        else "baixa"
-                    )
-                    signal.update({"avg_volume": avg_vol, "trend": trend_dir})
-
-                    final_signals.append(signal)
-
-                except Exception as e:
-                    logger.warning(f"Erro processando {sym}: {e}")
+            # 3) Geração de sinais (resultados na ordem de `liquid`)
+            analyze = {
+                "vector": self._analyze_symbols_vectorized,
+                "process": self._analyze_symbols_process,
+            }.get(self.eval_mode, self._analyze_symbols)
+            self.signal_gen.reset_stats()
+            if self.trend_cache is not None:
+                self.trend_cache.reset_stats()
+            final_signals = await analyze(liquid, trend_start, trend_end, entry_start, entry_end)
+            if self.signal_gen.rejections:
+                logger.info(f"Rejeições por gate: {dict(self.signal_gen.rejections.most_common())}")
+            if self.trend_cache is not None:
+                logger.info(
+                    f"Cache de trend: {self.trend_cache.hits} reaproveitados, "
+                    f"{self.trend_cache.misses} recalculados."
+                )
 
             # 4) Envia cada sinal individualmente no canal TECH
             for sig in final_signals:
@@ -174,10 +197,304 @@ class ScreenerCore:
             return []
 
         finally:
-            try:
-                await self.api.close()
-            except Exception as e:
-                logger.warning(f"Erro fechando API: {e}")
+            if self._owns_evaluator and self.process_evaluator is not None:
+                self.process_evaluator.close()
+                self.process_evaluator = None
+            if self.close_ext_evaluator:
+                try:
+                    await self.ext_evaluator.aclose()
+                except Exception as e:
+                    logger.warning(f"Erro fechando cliente de notícias: {e}")
+            if self.close_api:
+                try:
+                    await self.api.close()
+                except Exception as e:
+                    logger.warning(f"Erro fechando API: {e}")
+
+    async def _map_symbols(self, symbols: List[str], fn: Callable[[str], Awaitable]) -> list:
+        """
+        Executa `fn(sym)` para cada símbolo em paralelo, com no máximo `max_workers` em voo e
+        timeout de `symbol_timeout` segundos por símbolo.
+        Erros e timeouts ficam isolados no símbolo (resultado None); a ordem de entrada é mantida.
+        """
+        sem = asyncio.Semaphore(self.max_workers)
+
+        async def _worker(sym: str):
+            async with sem:
+                try:
+                    return await asyncio.wait_for(fn(sym), timeout=self.symbol_timeout)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Timeout processando {sym} ({self.symbol_timeout}s).")
+                except Exception as e:
+                    logger.warning(f"Erro processando {sym}: {e}")
+                return None
+
+        return await asyncio.gather(*(_worker(s) for s in symbols))
+
+    async def _analyze_symbols(
+        self,
+        symbols: List[str],
+        trend_start: int,
+        trend_end: int,
+        entry_start: int,
+        entry_end: int
+    ) -> List[dict]:
+        """
+        Pipeline concorrente símbolo a símbolo; os fatores externos dos sinais são avaliados
+        juntos no fim. A lista retornada segue a ordem de entrada.
+        """
+        results = await self._map_symbols(
+            symbols,
+            lambda sym: self._analyze_symbol(sym, trend_start, trend_end, entry_start, entry_end)
+        )
+        found = [r for r in results if r]
+        return await self._finalize_signals([sig for sig, _ in found],
+                                            {sig["symbol"]: df for sig, df in found})
+
+    async def _analyze_symbols_vectorized(
+        self,
+        symbols: List[str],
+        trend_start: int,
+        trend_end: int,
+        entry_start: int,
+        entry_end: int
+    ) -> List[dict]:
+        """
+        Modo vetorizado: busca os candles de todos os símbolos e avalia contexto e gatilho
+        de uma vez com o CrossSectionalEngine. O contexto é avaliado antes de buscar o
+        timeframe entry, preservando o curto-circuito do pipeline símbolo a símbolo.
+        """
+        async def context(frames):
+            return self.engine.context(frames, self.signal_gen.rejections)
+
+        resistance, fetched, loaded = await self._trend_stage(
+            symbols, trend_start, trend_end, entry_end, context
+        )
+        entry_frames = await self._entry_frames(fetched, loaded, resistance, entry_start, entry_end)
+        signals = self.engine.signals(entry_frames, resistance, self.signal_gen.rejections)
+        return await self._finalize_signals(signals, entry_frames)
+
+    async def _analyze_symbols_process(
+        self,
+        symbols: List[str],
+        trend_start: int,
+        trend_end: int,
+        entry_start: int,
+        entry_end: int
+    ) -> List[dict]:
+        """
+        Modo multiprocesso: o I/O continua no event loop e os cálculos do SignalGenerator
+        vão em lotes para o pool de processos, em duas etapas (contexto no trend e, só
+        para os aprovados, gatilho no entry). Os resultados voltam na ordem dos símbolos.
+        """
+        if self.process_evaluator is None:
+            self.process_evaluator = ProcessEvaluator()
+        evaluator = self.process_evaluator
+        resistance, fetched, loaded = await self._trend_stage(
+            symbols, trend_start, trend_end, entry_end, evaluator.context
+        )
+        entry_frames = await self._entry_frames(fetched, loaded, resistance, entry_start, entry_end)
+        signals = await evaluator.signals(entry_frames, resistance)
+        self.signal_gen.rejections.update(evaluator.rejections)
+        evaluator.rejections.clear()
+        return await self._finalize_signals(signals, entry_frames)
+
+    async def _trend_stage(
+        self,
+        symbols: List[str],
+        trend_start: int,
+        trend_end: int,
+        entry_end: int,
+        context: Callable[[Dict[str, pd.DataFrame]], Awaitable[Dict[str, float]]]
+    ) -> Tuple[Dict[str, float], List[str], list]:
+        """
+        Contexto no timeframe trend para os modos em lote, via `context(frames)`.
+        Com TrendCache, símbolos com veredito válido não são buscados nem recalculados.
+        Retorna (resistências na ordem de `symbols`, símbolos buscados, seus carregamentos).
+        """
+        cached: Dict[str, object] = {}
+        if self.trend_cache is not None:
+            for sym in symbols:
+                verdict = self.trend_cache.get(sym, trend_end)
+                if verdict is not None:
+                    cached[sym] = verdict
+        fetched = [s for s in symbols if s not in cached]
+        loaded = await self._map_symbols(
+            fetched, lambda sym: self._load_trend(sym, trend_start, trend_end, entry_end)
+        )
+        trend_frames = {}
+        for sym, l in zip(fetched, loaded):
+            trend_df = self._closed_trend(l[0], trend_end) if l else None
+            if trend_df is not None and not trend_df.empty:
+                trend_frames[sym] = trend_df
+        fresh = await context(trend_frames)
+        if self.trend_cache is not None:
+            for sym, trend_df in trend_frames.items():
+                self.trend_cache.put(sym, trend_df, sym in fresh, fresh.get(sym))
+
+        resistance = {}
+        for sym in symbols:
+            if sym in fresh:
+                resistance[sym] = fresh[sym]
+            elif sym in cached:
+                if cached[sym].ok:
+                    resistance[sym] = cached[sym].resistance
+                else:
+                    self.signal_gen.rejections["trend_context"] += 1
+        return resistance, fetched, loaded
+
+    def _closed_trend(self, trend_df: pd.DataFrame, now: int) -> pd.DataFrame:
+        # com cache o veredito usa só candles fechados, para valer até o próximo fechamento
+        return self.trend_cache.closed(trend_df, now) if self.trend_cache is not None else trend_df
+
+    async def _entry_frames(
+        self,
+        symbols: List[str],
+        loaded: list,
+        resistance: Dict[str, float],
+        entry_start: int,
+        entry_end: int
+    ) -> Dict[str, pd.DataFrame]:
+        """Candles de entrada dos símbolos aprovados no contexto, na ordem de `resistance`."""
+        # no modo derivado os candles de entrada já vieram junto com o trend
+        entry_frames = {s: l[1] for s, l in zip(symbols, loaded) if l and s in resistance and l[1] is not None}
+        missing = [s for s in resistance if s not in entry_frames]
+        fetched = await self._map_symbols(
+            missing, lambda sym: self._load_entry(sym, entry_start, entry_end)
+        )
+        entry_frames.update({s: df for s, df in zip(missing, fetched) if df is not None})
+        return {s: entry_frames[s] for s in resistance if s in entry_frames}
+
+    async def _finalize_signals(self, signals: List[dict], entry_frames: Dict[str, pd.DataFrame]) -> List[dict]:
+        """
+        Regra extra (SCREENER_TRIGGER_RULE), fatores externos de todos os sinais (notícias em
+        consultas combinadas) e enriquecimento.
+        """
+        by_symbol = {sig["symbol"]: sig for sig in signals}
+        if by_symbol and self.trigger_rules is not None:
+            resistance = {sym: sig["indicators"]["resistance_raw"] for sym, sig in by_symbol.items()}
+            approved = set(self.trigger_rules.evaluate_frames(
+                {sym: entry_frames[sym] for sym in by_symbol}, {"resistance": resistance}
+            )["trigger"])
+            by_symbol = {sym: sig for sym, sig in by_symbol.items() if sym in approved}
+        if not by_symbol:
+            return []
+        factors = await self.ext_evaluator.evaluate_batch({sym: entry_frames[sym] for sym in by_symbol})
+        finalized = []
+        for sym, signal in by_symbol.items():
+            signal.update(factors.get(sym, {}))
+            finalized.append(self.enrich_signal(signal, entry_frames[sym]))
+        return finalized
+
+    async def _load_trend(
+        self,
+        sym: str,
+        trend_start: int,
+        trend_end: int,
+        entry_end: int
+    ) -> Optional[Tuple[pd.DataFrame, Optional[pd.DataFrame]]]:
+        """
+        Candles do timeframe trend: (trend_df, entry_df). No modo derivado busca só o
+        timeframe entry cobrindo a janela do trend e reamostra; entry_df já vem junto.
+        """
+        if self.derive_trend:
+            raw = await self.api.get_klines(
+                sym, interval=TIMEFRAME_ENTRY,
+                start=trend_start, end=entry_end
+            )
+            if not raw:
+                return None
+            full_df = self.api.klines_to_dataframe(raw, sym)
+            if full_df.empty:
+                return None
+            trend_df = resample_ohlcv(full_df, TIMEFRAME_ENTRY, TIMEFRAME_TREND)
+            # mesma janela de entrada do modo buscado (os EMAs dependem do ponto inicial)
+            entry_df = full_df.tail(CANDLE_LIMIT).reset_index(drop=True)
+            return (trend_df, entry_df) if not trend_df.empty else None
+
+        trend_raw = await self.api.get_klines(
+            sym, interval=TIMEFRAME_TREND,
+            start=trend_start, end=trend_end
+        )
+        if not trend_raw:
+            return None
+        trend_df = self.api.klines_to_dataframe(trend_raw, sym)
+        return (trend_df, None) if not trend_df.empty else None
+
+    async def _load_entry(self, sym: str, entry_start: int, entry_end: int) -> Optional[Union[pd.DataFrame, KlineSeries]]:
+        entry_raw = await self.api.get_klines(
+            sym, interval=TIMEFRAME_ENTRY,
+            start=entry_start, end=entry_end
+        )
+        if not entry_raw:
+            return None
+        if self.eval_mode == "vector":
+            # o CrossSectionalEngine lê os arrays direto: sem DataFrame por símbolo
+            series = KlineSeries.from_payload(entry_raw, sym)
+            return series if len(series) else None
+        entry_df = self.api.klines_to_dataframe(entry_raw, sym)
+        return entry_df if not entry_df.empty else None
+
+    async def _analyze_symbol(
+        self,
+        sym: str,
+        trend_start: int,
+        trend_end: int,
+        entry_start: int,
+        entry_end: int
+    ) -> Optional[Tuple[dict, pd.DataFrame]]:
+        """
+        Pipeline de um símbolo: contexto no timeframe trend e gatilho no entry.
+        Retorna (sinal, candles de entrada) ou None; os fatores externos ficam para `_finalize_signals`.
+        """
+        # 1) Timeframe trend (veredito em cache até o próximo candle de trend fechar)
+        verdict = self.trend_cache.get(sym, trend_end) if self.trend_cache is not None else None
+        if verdict is not None:
+            if not verdict.ok:
+                self.signal_gen.rejections["trend_context"] += 1
+                return None
+            resistance, entry_df = verdict.resistance, None
+        else:
+            loaded = await self._load_trend(sym, trend_start, trend_end, entry_end)
+            if not loaded:
+                return None
+            trend_df = self._closed_trend(loaded[0], trend_end)
+            entry_df = loaded[1]
+            if trend_df.empty:
+                return None
+            ok = self.signal_gen.check_context(trend_df)
+            resistance = self.signal_gen.calculate_resistance_h1(trend_df) if ok else None
+            if self.trend_cache is not None:
+                self.trend_cache.put(sym, trend_df, ok, resistance)
+            if not ok:
+                self.signal_gen.rejections["trend_context"] += 1
+                return None
+
+        # 2) Timeframe entry
+        if entry_df is None:
+            entry_df = await self._load_entry(sym, entry_start, entry_end)
+            if entry_df is None:
+                return None
+
+        # 3) Gatilho técnico
+        signal = self.signal_gen.check_trigger(entry_df, resistance)
+        return (signal, entry_df) if signal else None
+
+    @staticmethod
+    def enrich_signal(signal: dict, entry_df) -> dict:
+        """
+        Acrescenta ao sinal o volume médio e a direção dos últimos 5 candles de entrada
+        (`entry_df` pode ser DataFrame ou KlineSeries).
+        """
+        recent_vols = _column(entry_df, "volume")[-5:].tolist()
+        avg_vol = sum(recent_vols) / len(recent_vols) if recent_vols else 0
+        recent_closes = _column(entry_df, "close")[-5:].tolist()
+        trend_dir = (
+            "alta" if len(recent_closes) >= 2 and recent_closes[-1] > recent_closes[0]
+            else "baixa"
+        )
+        signal.update({"avg_volume": avg_vol, "trend": trend_dir})
+        return signal
 
     def run_screener(self) -> List[dict]:
         try:
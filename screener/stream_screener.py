@@ -0,0 +1,311 @@
+# screener/stream_screener.py
+
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import settings
+from mexc.mexc_api import MexcApiAsync
+from notifier.message_formatter import MessageFormatter
+from notifier.telegram_notifier import TelegramNotifier
+from reports.performance import log_signal
+from screener.candle_ring import CandleRing
+from screener.incremental import IndicatorSet, PRECHECK_MARGIN
+from screener.liquidity_filter import LiquidityFilter
+from screener.screener_core import ScreenerCore
+from screener.vector_engine import CrossSectionalEngine
+from telegram.constants import ParseMode
+from utils.logger import AppLogger
+
+logger = AppLogger(__name__).get_logger()
+
+TIMEFRAME_TREND = settings.TIMEFRAME_TREND
+TIMEFRAME_ENTRY = settings.TIMEFRAME_ENTRY
+CANDLE_LIMIT    = settings.CANDLE_LIMIT
+_PERIODS        = settings._PERIODS
+SCREENER_MAX_WORKERS = settings.SCREENER_MAX_WORKERS
+STREAM_EVAL_QUEUE_SIZE = settings.STREAM_EVAL_QUEUE_SIZE
+
+# Mapeamento push.kline -> payload colunar (t=início da janela, q=volume, a=amount)
+_PUSH_FIELDS = {"time": "t", "open": "o", "high": "h", "low": "l", "close": "c", "vol": "q", "amount": "a"}
+
+
+class StreamScreener:
+    """
+    Modo streaming: acompanha os `push.kline` dos timeframes trend e entry de todo o
+    universo líquido e avalia `SignalGenerator.check_trigger` somente para o símbolo cujo
+    candle de entrada acabou de fechar. Os sinais vão direto para o canal TECH
+    (sem fatores externos nem IA, que dependem do lote do screener agendado).
+
+    Cada série mantém um `IndicatorSet` atualizado em O(1) por candle fechado; ele descarta
+    a maioria dos símbolos, e só os aprovados passam pela verificação completa, feita pelo
+    `CrossSectionalEngine` direto sobre as visões do buffer (sem montar DataFrames).
+
+    O handler do WebSocket só atualiza buffer e estado; a avaliação (e o envio ao Telegram)
+    vai para uma fila limitada consumida por `workers` tarefas, sem segurar o dispatch.
+    Após uma reconexão do WebSocket ou um salto de `time` maior que um período, o símbolo
+    é recarregado via REST (buffer e `IndicatorSet` refeitos) em vez de seguir com lacunas.
+    As rejeições (pré-filtro, contexto e cada gate) são logadas a cada período de entry.
+    """
+    def __init__(
+        self,
+        api: MexcApiAsync,
+        notifier: TelegramNotifier,
+        history: int = CANDLE_LIMIT,
+        workers: int = SCREENER_MAX_WORKERS,
+        queue_size: int = STREAM_EVAL_QUEUE_SIZE
+    ):
+        self.api = api
+        self.notifier = notifier
+        self.history = history
+        self.liquidity_filter = LiquidityFilter(api)
+        self.engine = CrossSectionalEngine()
+        self.series: Dict[Tuple[str, str], CandleRing] = {}
+        self.states: Dict[Tuple[str, str], IndicatorSet] = {}
+        self.min_bars = self.engine.min_bars
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[str] = set()      # símbolos já na fila (não entram duas vezes)
+        self._tasks: List[asyncio.Task] = []
+        self._resyncing: Set[str] = set()    # símbolos com recarga via REST em andamento
+        self._resync_tasks: Set[asyncio.Task] = set()
+        self._stop = asyncio.Event()
+        # rejeições por gate desde o último log_stats, com os nomes de SignalGenerator.rejections
+        self.rejections: Counter = Counter()
+
+    @classmethod
+    async def create(cls):
+        api = await MexcApiAsync().init()
+        return cls(api, TelegramNotifier())
+
+    async def run(self) -> None:
+        logger.info("Iniciando screener em modo streaming…")
+        try:
+            contracts = await self.api.get_futures_contracts()
+            symbols = [c["symbol"] for c in contracts if c.get("symbol")]
+            liquid = await self.liquidity_filter.filter_by_liquidez(symbols)
+            logger.info(f"{len(liquid)} símbolos acompanhados em tempo real.")
+
+            await self.seed(liquid)
+            self.start_workers()
+            await self.api.subscribe_klines(
+                [(sym, interval) for sym in liquid for interval in (TIMEFRAME_TREND, TIMEFRAME_ENTRY)],
+                self.on_kline,
+                on_reconnect=self.on_reconnect
+            )
+            period = _PERIODS.get(TIMEFRAME_ENTRY, _PERIODS["Min15"])
+            while not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=period)
+                except asyncio.TimeoutError:
+                    pass
+                self.log_stats()
+        finally:
+            await self.stop_workers()
+            try:
+                await self.api.close()
+            except Exception as e:
+                logger.warning(f"Erro fechando API: {e}")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def log_stats(self) -> None:
+        """Loga e zera as rejeições acumuladas desde a última chamada."""
+        if self.rejections:
+            logger.info(f"Rejeições por gate (streaming): {dict(self.rejections.most_common())}")
+        self.rejections.clear()
+
+    def start_workers(self) -> None:
+        """Cria a fila de avaliações e as tarefas que a consomem (no loop corrente)."""
+        self._queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop_workers(self) -> None:
+        tasks = self._tasks + list(self._resync_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._resync_tasks.clear()
+
+    async def drain(self) -> None:
+        """Aguarda as avaliações enfileiradas até agora."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self) -> None:
+        while True:
+            sym = await self._queue.get()
+            self._pending.discard(sym)
+            try:
+                await self.evaluate(sym)
+            except Exception as e:
+                logger.warning(f"Erro avaliando {sym} em streaming: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _schedule(self, sym: str) -> None:
+        if self._queue is None or sym in self._pending:
+            return
+        try:
+            self._queue.put_nowait(sym)
+        except asyncio.QueueFull:
+            logger.warning(f"Fila de avaliação cheia; {sym} fica para o próximo candle.")
+            return
+        self._pending.add(sym)
+
+    async def seed(self, symbols: List[str]) -> None:
+        """
+        Carrega o histórico via REST (concorrência limitada), recriando buffer e estado de
+        cada série. Se a recarga de uma série já acompanhada falhar, ela é mantida.
+        """
+        sem = asyncio.Semaphore(SCREENER_MAX_WORKERS)
+
+        async def _seed(sym: str, interval: str) -> None:
+            async with sem:
+                end = int(time.time())
+                start = end - self.history * _PERIODS.get(interval, _PERIODS["Min15"])
+                try:
+                    data = await self.api.get_klines(sym, interval=interval, start=start, end=end)
+                except Exception as e:
+                    logger.warning(f"Erro carregando histórico de {sym} {interval}: {e}")
+                    data = None
+                key = (sym, interval)
+                if not data and key in self.series:
+                    return
+                series = CandleRing(self.history)
+                if data:
+                    series.extend(data)
+                self.series[key] = series
+                self.states[key] = self._seed_state(series)
+
+        await asyncio.gather(*(
+            _seed(sym, interval)
+            for sym in symbols for interval in (TIMEFRAME_TREND, TIMEFRAME_ENTRY)
+        ))
+
+    def _resync(self, sym: str) -> None:
+        """Agenda a recarga via REST de `sym` (trend e entry) fora do handler do WebSocket."""
+        if sym in self._resyncing:
+            return
+        self._resyncing.add(sym)
+        task = asyncio.create_task(self._resync_symbol(sym))
+        self._resync_tasks.add(task)
+        task.add_done_callback(self._resync_tasks.discard)
+
+    async def _resync_symbol(self, sym: str) -> None:
+        entry = self.series.get((sym, TIMEFRAME_ENTRY))
+        before = entry.last_time if entry is not None else None
+        try:
+            await self.seed([sym])
+        finally:
+            self._resyncing.discard(sym)
+        after = self.series[(sym, TIMEFRAME_ENTRY)].last_time
+        # algum candle de entrada fechou durante a lacuna: avalia o último fechado
+        if before is not None and after is not None and after > before:
+            self._schedule(sym)
+
+    async def on_reconnect(self, params: List[dict]) -> None:
+        """Socket reconectado: os candles da queda se perderam, recarrega seus símbolos."""
+        symbols = {p.get("symbol") for p in params}
+        logger.info(f"WebSocket reconectado; recarregando {len(symbols)} símbolos via REST.")
+        for sym in symbols:
+            if (sym, TIMEFRAME_ENTRY) in self.series:
+                self._resync(sym)
+
+    @staticmethod
+    def _seed_state(series: CandleRing) -> IndicatorSet:
+        """Inicializa o estado incremental com os candles fechados da série."""
+        state = IndicatorSet()
+        closed = series.payload(closed_only=True)
+        state.seed(closed["close"], closed["high"], closed["vol"])
+        return state
+
+    async def on_kline(self, msg: dict) -> None:
+        data = msg.get("data") or {}
+        sym, interval = data.get("symbol"), data.get("interval")
+        series = self.series.get((sym, interval))
+        if series is None:
+            return
+        try:
+            bar = {f: data[k] for f, k in _PUSH_FIELDS.items()}
+        except KeyError:
+            logger.debug(f"push.kline incompleto para {sym}: {data}")
+            return
+        if sym in self._resyncing:
+            return
+        last = series.last_time
+        if last is not None and bar["time"] - last > _PERIODS.get(interval, _PERIODS["Min15"]):
+            # candles perdidos entre dois push.kline: recarrega em vez de seguir com lacuna
+            logger.debug(f"Lacuna em {sym} {interval}: {last} -> {bar['time']}.")
+            self._resync(sym)
+            return
+        if not series.upsert(bar):
+            return
+        # o candle anterior fechou: incorpora-o ao estado incremental
+        closed = series.bar(-2)
+        state = self.states.setdefault((sym, interval), IndicatorSet())
+        state.update(float(closed["close"]), float(closed["high"]), float(closed["vol"]))
+        if interval == TIMEFRAME_ENTRY:
+            self._schedule(sym)
+
+    def prefilter(self, sym: str) -> bool:
+        """
+        Pré-filtro O(1): contexto e resistência do trend (com o candle aberto, como o
+        caminho em lote) e gatilhos sobre os candles de entrada fechados.
+        """
+        trend, entry = self.series.get((sym, TIMEFRAME_TREND)), self.series.get((sym, TIMEFRAME_ENTRY))
+        trend_state = self.states.get((sym, TIMEFRAME_TREND))
+        entry_state = self.states.get((sym, TIMEFRAME_ENTRY))
+        if not trend or not entry or trend_state is None or entry_state is None:
+            # sem estado ainda: deixa a verificação completa decidir
+            return True
+        open_bar = trend.bar(-1)
+        if not trend_state.context(float(open_bar["close"]), margin=PRECHECK_MARGIN):
+            return False
+        resistance = trend_state.resistance(float(open_bar["high"]))
+        if resistance != resistance:  # NaN: histórico de trend insuficiente
+            return False
+        return entry_state.trigger_precheck(resistance, self.min_bars)
+
+    async def evaluate(self, sym: str) -> Optional[dict]:
+        """Avalia contexto e gatilho do símbolo cujo candle de entrada acabou de fechar."""
+        trend = self.series.get((sym, TIMEFRAME_TREND))
+        entry = self.series.get((sym, TIMEFRAME_ENTRY))
+        if not trend or not entry:
+            return None
+        if not self.prefilter(sym):
+            self.rejections["precheck"] += 1
+            return None
+        try:
+            # contexto e resistência com o candle de trend aberto, como no caminho em lote
+            resistance = self.engine.context({sym: trend.series(sym)}, self.rejections)
+            if sym not in resistance:
+                return None
+
+            # apenas candles fechados: o último da série é o que acabou de abrir
+            entry_series = entry.series(sym, closed_only=True)
+            if not len(entry_series):
+                return None
+            signals = self.engine.signals({sym: entry_series}, resistance, self.rejections)
+            if not signals:
+                return None
+            signal = ScreenerCore.enrich_signal(signals[0], entry_series)
+        except Exception as e:
+            logger.warning(f"Erro avaliando {sym} em streaming: {e}")
+            return None
+
+        tech_msg = MessageFormatter.format_trade_signal(
+            symbol=signal["symbol"],
+            entry=signal["entry_price"],
+            stop_loss=signal["stop_loss"],
+            take_profit=signal["take_profit"],
+            indicators=signal.get("indicators", {})
+        )
+        await self.notifier.send_tech(tech_msg, parse_mode=ParseMode.HTML)
+        log_signal(signal, [])
+        logger.info(f"Sinal em streaming: {sym}")
+        return signal
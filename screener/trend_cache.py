@@ -0,0 +1,62 @@
+# screener/trend_cache.py
+
+from typing import Dict, NamedTuple, Optional
+
+import pandas as pd
+
+from config.settings import TIMEFRAME_TREND, _PERIODS
+
+
+class TrendVerdict(NamedTuple):
+    bar_time: int                 # início (epoch s) do último candle de trend fechado usado
+    ok: bool                      # contexto de baixa aprovado
+    resistance: Optional[float]   # resistência quando `ok`
+
+
+def _epoch(ts) -> int:
+    return int((pd.Timestamp(ts) - pd.Timestamp(0)) // pd.Timedelta(seconds=1))
+
+
+class TrendCache:
+    """
+    Veredito de contexto e resistência por símbolo, calculados sobre candles de trend
+    fechados. Enquanto o candle de trend corrente não fecha o veredito não muda, então
+    o screener pode pular a busca e o cálculo do trend; no fechamento a entrada deixa de
+    valer sozinha (a chave é o timestamp do último candle fechado).
+    """
+    def __init__(self, interval: str = TIMEFRAME_TREND):
+        self.interval = interval
+        self.period = _PERIODS[interval]
+        self._verdicts: Dict[str, TrendVerdict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def last_closed(self, now: int) -> int:
+        """Início do último candle de trend fechado em `now`."""
+        return (now // self.period - 1) * self.period
+
+    def closed(self, trend_df: pd.DataFrame, now: int) -> pd.DataFrame:
+        """Remove o candle de trend ainda aberto (o que começa no bucket corrente)."""
+        open_start = pd.to_datetime(now // self.period * self.period, unit="s")
+        return trend_df[trend_df["time"] < open_start].reset_index(drop=True)
+
+    def get(self, symbol: str, now: int) -> Optional[TrendVerdict]:
+        verdict = self._verdicts.get(symbol)
+        if verdict is not None and verdict.bar_time == self.last_closed(now):
+            self.hits += 1
+            return verdict
+        self.misses += 1
+        return None
+
+    def put(self, symbol: str, closed_df: pd.DataFrame, ok: bool, resistance: Optional[float]) -> TrendVerdict:
+        bar_time = _epoch(closed_df["time"].iloc[-1]) if len(closed_df) else -1
+        verdict = TrendVerdict(bar_time, bool(ok), float(resistance) if ok else None)
+        self._verdicts[symbol] = verdict
+        return verdict
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = 0
+
+    def clear(self) -> None:
+        self._verdicts.clear()
+        self.reset_stats()
@@ -0,0 +1,236 @@
+# screener/vector_engine.py
+
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    EMA_SHORT_PERIOD,
+    EMA_LONG_PERIOD,
+    RSI_PERIOD,
+    MACD_FAST_PERIOD,
+    MACD_SLOW_PERIOD,
+    MACD_SIGNAL_PERIOD,
+    VOLUME_MA_PERIOD
+)
+from screener.params import (
+    ENTRY_BUFFER,
+    STOP_BUFFER,
+    RESISTANCE_BUFFER,
+    RR_TARGET,
+    RESISTANCE_WINDOW,
+    VOLUME_THRESHOLD_MULTIPLIER
+)
+
+# Indicadores em matrizes 2-D (símbolos x barras), alinhadas à direita e com NaN à esquerda
+# para séries mais curtas. As recursões (EMA) e janelas móveis rodam no código C do pandas
+# sobre todas as colunas de uma vez, com as mesmas fórmulas do SignalGenerator.
+
+
+def stack(series: Sequence[np.ndarray], length: Optional[int] = None) -> np.ndarray:
+    """Empilha séries 1-D numa matriz (símbolos x barras), alinhadas pela última barra."""
+    length = length or max((len(s) for s in series), default=0)
+    out = np.full((len(series), length), np.nan)
+    for i, s in enumerate(series):
+        s = np.asarray(s, dtype=np.float64)[-length:]
+        if len(s):
+            out[i, length - len(s):] = s
+    return out
+
+
+def _wide(x: np.ndarray) -> pd.DataFrame:
+    # barras nas linhas, símbolos nas colunas: cada coluna é uma série independente
+    return pd.DataFrame(x.T)
+
+
+def ema(x: np.ndarray, span: int = None, alpha: float = None) -> np.ndarray:
+    kwargs = {"span": span} if alpha is None else {"alpha": alpha}
+    return _wide(x).ewm(adjust=False, **kwargs).mean().to_numpy().T
+
+
+def sma(x: np.ndarray, window: int) -> np.ndarray:
+    return _wide(x).rolling(window=window).mean().to_numpy().T
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    return _wide(x).rolling(window=window).max().to_numpy().T
+
+
+def wilder_gain_loss(close: np.ndarray, period: int = RSI_PERIOD) -> Tuple[np.ndarray, np.ndarray]:
+    """Médias de Wilder de ganhos e perdas (as duas EMAs internas do RSI)."""
+    delta = np.full_like(close, np.nan)
+    delta[:, 1:] = close[:, 1:] - close[:, :-1]
+    with np.errstate(invalid="ignore"):
+        gain = ema(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), alpha=1 / period)
+        loss = ema(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), alpha=1 / period)
+    return gain, loss
+
+
+def rsi(close: np.ndarray, period: int = RSI_PERIOD) -> np.ndarray:
+    gain, loss = wilder_gain_loss(close, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+def macd(
+    close: np.ndarray,
+    fast: int = MACD_FAST_PERIOD,
+    slow: int = MACD_SLOW_PERIOD,
+    signal: int = MACD_SIGNAL_PERIOD
+) -> Tuple[np.ndarray, np.ndarray]:
+    line = ema(close, span=fast) - ema(close, span=slow)
+    return line, ema(line, span=signal)
+
+
+def valid_bars(x: np.ndarray) -> np.ndarray:
+    """Nº de barras válidas (não-NaN) por símbolo."""
+    return np.count_nonzero(~np.isnan(x), axis=1)
+
+
+def _column(frame, name: str) -> np.ndarray:
+    # aceita DataFrame (klines_to_dataframe) ou KlineSeries
+    if isinstance(frame, pd.DataFrame):
+        return frame[name].to_numpy(dtype=np.float64)
+    return np.asarray(getattr(frame, name), dtype=np.float64)
+
+
+class CrossSectionalEngine:
+    """
+    Avalia contexto e gatilho de SHORT para todo o universo de uma vez, retornando máscaras
+    booleanas de candidatos. Reproduz a lógica de `SignalGenerator.check_context`,
+    `calculate_resistance_h1` e `check_trigger` (inclusive a ordem das rejeições com NaN).
+    """
+    def __init__(
+        self,
+        ema_short: int = EMA_SHORT_PERIOD,
+        ema_long: int = EMA_LONG_PERIOD,
+        rsi_period: int = RSI_PERIOD,
+        macd_fast: int = MACD_FAST_PERIOD,
+        macd_slow: int = MACD_SLOW_PERIOD,
+        macd_signal: int = MACD_SIGNAL_PERIOD,
+        volume_ma: int = VOLUME_MA_PERIOD,
+        resistance_window: int = RESISTANCE_WINDOW
+    ):
+        self.ema_short = ema_short
+        self.ema_long = ema_long
+        self.rsi_period = rsi_period
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_signal = macd_signal
+        self.volume_ma = volume_ma
+        self.resistance_window = resistance_window
+
+    @property
+    def min_bars(self) -> int:
+        return max(self.ema_long, self.rsi_period, self.macd_slow, self.volume_ma, self.resistance_window)
+
+    def _context(self, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        ema_s = ema(close, span=self.ema_short)[:, -1]
+        ema_l = ema(close, span=self.ema_long)[:, -1]
+        rsi_all = rsi(close, self.rsi_period)
+        rsi_last = rsi_all[:, -1]
+        with np.errstate(invalid="ignore"):
+            ok = (ema_s < ema_l) & (rsi_last < 50)
+        return ok, ema_s, ema_l, rsi_last
+
+    def context(self, frames: Dict[str, object], rejections: Optional[Counter] = None) -> Dict[str, float]:
+        """
+        Contexto de baixa no timeframe trend. Retorna {símbolo: resistência} dos aprovados,
+        na ordem de `frames`. Os reprovados são contados em `rejections["trend_context"]`.
+        """
+        symbols = list(frames)
+        if not symbols:
+            return {}
+        close = stack([_column(frames[s], "close") for s in symbols])
+        high = stack([_column(frames[s], "high") for s in symbols], close.shape[1])
+        ok, *_ = self._context(close)
+        # calculate_resistance_h1 exige ao menos RESISTANCE_WINDOW candles
+        ok &= valid_bars(close) >= self.resistance_window
+        resistance = rolling_max(high, self.resistance_window)[:, -1]
+        if rejections is not None and not ok.all():
+            rejections["trend_context"] += int(np.count_nonzero(~ok))
+        return {s: float(resistance[i]) for i, s in enumerate(symbols) if ok[i]}
+
+    def trigger_mask(
+        self,
+        frames: Dict[str, object],
+        resistance: Dict[str, float],
+        rejections: Optional[Counter] = None
+    ) -> Tuple[List[str], np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Gatilho de SHORT no timeframe entry para todos os símbolos.
+        Retorna (símbolos, máscara de candidatos, valores da última barra por indicador).
+        Cada reprovado é contado em `rejections` no primeiro gate que o rejeita, na ordem
+        de custo de `DEFAULT_GATES`, com os mesmos nomes de `SignalGenerator.rejections`.
+        """
+        symbols = [s for s in frames if s in resistance]
+        if not symbols:
+            return [], np.zeros(0, dtype=bool), {}
+        close = stack([_column(frames[s], "close") for s in symbols])
+        volume = stack([_column(frames[s], "volume") for s in symbols], close.shape[1])
+        res = np.array([resistance[s] for s in symbols])
+
+        ctx_ok, ema_s, ema_l, rsi_last = self._context(close)
+        line, sig = macd(close, self.macd_fast, self.macd_slow, self.macd_signal)
+        values = {
+            "close": close[:, -1],
+            "ema_short": ema_s,
+            "ema_long": ema_l,
+            "rsi": rsi_last,
+            "macd": line[:, -1],
+            "macd_signal": sig[:, -1],
+            "volume": volume[:, -1],
+            "volume_ma": sma(volume, self.volume_ma)[:, -1],
+            "resistance_raw": res,
+            "resistance_buffered": res * RESISTANCE_BUFFER,
+        }
+        with np.errstate(invalid="ignore"):
+            # mesmas rejeições de check_trigger: comparações com NaN não rejeitam
+            gates = (
+                ("min_bars", valid_bars(close) < self.min_bars),
+                ("resistance", values["close"] > values["resistance_buffered"]),
+                ("volume", values["volume"] < values["volume_ma"] * VOLUME_THRESHOLD_MULTIPLIER),
+                ("rsi", values["rsi"] >= 50),
+                ("context", ~ctx_ok),
+                ("macd", values["macd"] >= values["macd_signal"]),
+            )
+        mask = np.ones(len(symbols), dtype=bool)
+        for name, rejected in gates:
+            if rejections is not None:
+                n = int(np.count_nonzero(mask & rejected))
+                if n:
+                    rejections[name] += n
+            mask &= ~rejected
+        return symbols, mask, values
+
+    def signals(
+        self,
+        frames: Dict[str, object],
+        resistance: Dict[str, float],
+        rejections: Optional[Counter] = None
+    ) -> List[dict]:
+        """Sinais no formato de `check_trigger` para os candidatos, na ordem de `frames`."""
+        symbols, mask, values = self.trigger_mask(frames, resistance, rejections)
+        out = []
+        for i in np.flatnonzero(mask):
+            close = float(values["close"][i])
+            res = float(values["resistance_raw"][i])
+            entry_price = close * (1 - ENTRY_BUFFER)
+            stop_loss = res * (1 + STOP_BUFFER)
+            take_profit = entry_price - (stop_loss - entry_price) * RR_TARGET
+            indicators = {
+                k: float(values[k][i])
+                for k in ("resistance_raw", "resistance_buffered", "volume", "volume_ma",
+                          "rsi", "macd", "macd_signal")
+            }
+            out.append({
+                "symbol": symbols[i],
+                "entry_price": entry_price,
+                "stop_loss": stop_loss,
+                "take_profit": take_profit,
+                "indicators": indicators,
+            })
+        return out
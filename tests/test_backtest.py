@@ -0,0 +1,98 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import BacktestParams, MarketData, run_backtest, signal_mask, simulate
+from backtest.recorder import HistoryRecorder
+from mexc.mexc_api import MexcApiAsync
+from screener.resampler import resample_ohlcv
+from screener.signal_generator import SignalGenerator
+
+
+def random_payloads(n_symbols=3, n_bars=400, seed=11):
+    rng = np.random.default_rng(seed)
+    payloads = {}
+    for i in range(n_symbols):
+        start = 1_700_000_100 // 900 * 900 + i * 900  # início desalinhado da hora
+        close = 10 * np.exp(np.cumsum(rng.normal(-0.002, 0.006, n_bars)))
+        open_ = np.r_[close[0], close[:-1]]
+        payloads[f"S{i}_USDT"] = {
+            "time": start + 900 * np.arange(n_bars),
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + rng.uniform(0, 0.004, n_bars)),
+            "low": np.minimum(open_, close) * (1 - rng.uniform(0, 0.004, n_bars)),
+            "close": close,
+            "vol": rng.uniform(500, 1500, n_bars),
+            "amount": np.zeros(n_bars),
+        }
+    return payloads
+
+
+def test_mask_matches_signal_generator_on_derived_trend():
+    payloads = random_payloads()
+    market = MarketData.from_payloads(payloads, "Min15")
+    mask, _ = signal_mask(market, BacktestParams())
+    assert mask.any()
+
+    sg = SignalGenerator()
+    for i, sym in enumerate(market.symbols):
+        df = MexcApiAsync.klines_to_dataframe(payloads[sym], sym)
+        offset = i  # barras antes do início do símbolo na grade
+        for j in range(200, len(df), 7):
+            entry = df.iloc[:j + 1].reset_index(drop=True)
+            trend = resample_ohlcv(entry, "Min15", "Min60")
+            expected = (
+                sg.check_context(trend)
+                and sg.check_trigger(entry, sg.calculate_resistance_h1(trend)) is not None
+            )
+            assert mask[i, j + offset] == expected, (sym, j)
+
+
+def test_simulate_exits_and_one_position():
+    n = 10
+    time = 900 * np.arange(n)
+    close = np.full((1, n), 100.0)
+    high = close.copy()
+    low = close.copy()
+    low[0, 3] = 90.0       # TP atingido na 3ª barra após o sinal da barra 0
+    high[0, 6] = 200.0     # SL e TP na mesma barra: conta como SL
+    low[0, 6] = 50.0
+    market = MarketData(["A_USDT"], "Min15", time, close, high, low, close, close)
+    mask = np.zeros((1, n), dtype=bool)
+    mask[0, [0, 2, 5]] = True  # o sinal da barra 2 cai dentro do trade aberto
+    resistance = np.full((1, n), 102.0)
+    params = BacktestParams(entry_buffer=0.0, stop_buffer=0.0, rr_target=1.0, fee=0.0, max_hold_bars=4)
+
+    trades = simulate(market, mask, resistance, params)
+    assert trades["reason"].tolist() == ["tp", "sl"]
+    assert trades["exit_price"].tolist() == [98.0, 102.0]
+    assert trades["bars"].tolist() == [3, 1]
+
+    _, stats = run_backtest(MarketData.from_payloads(random_payloads(), "Min15"))
+    assert stats["trades"] > 0 and 0 <= stats["win_rate"] <= 1
+
+
+def test_recorder_pages_full_history_and_resumes(tmp_path):
+    payload = random_payloads(n_symbols=1, n_bars=1500)["S0_USDT"]
+    calls = []
+
+    class FakeApi:
+        async def fetch_klines(self, symbol, interval, start, end):
+            calls.append((start, end))
+            keep = (payload["time"] >= start) & (payload["time"] <= end)
+            return {f: a[keep].tolist() for f, a in payload.items()}
+
+    t = payload["time"]
+    recorder = HistoryRecorder(FakeApi(), base_dir=str(tmp_path), page_bars=500)
+    assert asyncio.run(recorder.record("S0_USDT", "Min15", int(t[0]), int(t[-1]))) == 1500
+    assert len(calls) == 3
+
+    # acima de KLINE_CACHE_MAX_BARS: o histórico do backtest não é cortado
+    market = MarketData.from_cache("Min15", base_dir=str(tmp_path))
+    assert market.close.shape == (1, 1500)
+
+    # nova execução continua do último candle gravado
+    calls.clear()
+    asyncio.run(recorder.record("S0_USDT", "Min15", int(t[0]), int(t[-1])))
+    assert calls == [(int(t[-1]), int(t[-1]))]
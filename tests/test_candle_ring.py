@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from screener.candle_ring import CandleRing
+
+
+def bar(t, close):
+    return {"time": t, "open": close, "high": close, "low": close, "close": close, "vol": 1.0, "amount": 1.0}
+
+
+def test_wraparound_keeps_latest_bars_contiguous():
+    ring = CandleRing(capacity=4)
+    for t in range(10):
+        ring.upsert(bar(t * 60, float(t)))
+    ring.upsert(bar(9 * 60, 9.5))  # candle aberto atualizado no lugar
+
+    assert len(ring) == 4
+    assert ring.view("close").tolist() == [6.0, 7.0, 8.0, 9.5]
+    assert ring.view("close", closed_only=True).tolist() == [6.0, 7.0, 8.0]
+    assert ring.view("time").dtype == np.int64
+    assert ring.bar(-2)["close"] == 8.0
+    with pytest.raises(IndexError):
+        ring.bar(-5)
+
+
+def test_views_are_zero_copy_and_read_only():
+    ring = CandleRing(capacity=3)
+    ring.extend({"time": [0, 60], "close": [1.0, 2.0], "high": [1.0, 2.0]})
+    series = ring.series("A_USDT")
+    assert np.shares_memory(series.close, ring.cols["close"])
+    with pytest.raises(ValueError):
+        series.close[0] = 5.0
+    assert series.to_dataframe()["close"].tolist() == [1.0, 2.0]
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from screener.gates import DEFAULT_GATES, Gate
+from screener.signal_generator import SignalGenerator
+
+
+def random_df(seed, n=60):
+    rng = np.random.default_rng(seed)
+    close = 10 * np.exp(np.cumsum(rng.normal(-0.003, 0.01, n)))
+    return pd.DataFrame({
+        "close": close,
+        "high": close * (1 + rng.uniform(0, 0.01, n)),
+        "volume": rng.uniform(500, 1500, n),
+        "symbol": f"S{seed}_USDT",
+    })
+
+
+def test_gates_evaluated_cheapest_first_with_early_exit():
+    calls = []
+    gates = [Gate("caro", 9, lambda *a: calls.append("caro") or True),
+             Gate("barato", 1, lambda *a: calls.append("barato") or False)]
+    sg = SignalGenerator(gates=gates)
+    assert sg.check_trigger(random_df(0), resistance=100.0) is None
+    assert calls == ["barato"]
+    assert sg.rejections == {"barato": 1}
+    sg.reset_stats()
+    assert not sg.rejections
+
+
+def test_same_signals_as_original_gate_order():
+    by_name = {g.name: g for g in DEFAULT_GATES}
+    original = [Gate(name, cost, by_name[name].check) for cost, name in
+                enumerate(["context", "min_bars", "resistance", "volume", "rsi", "macd"])]
+    fast, slow = SignalGenerator(), SignalGenerator(gates=original)
+    hits = 0
+    for seed in range(40):
+        df = random_df(seed)
+        resistance = df["high"].tail(8).max()
+        a, b = fast.check_trigger(df, resistance), slow.check_trigger(df, resistance)
+        assert a == b
+        hits += a is not None
+    assert hits > 0
+    assert sum(fast.rejections.values()) == sum(slow.rejections.values())
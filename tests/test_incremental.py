@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from screener.incremental import IndicatorSet, RollingMaxState, EMAState
+from screener.params import RESISTANCE_WINDOW
+from screener.signal_generator import SignalGenerator
+from config.settings import EMA_SHORT_PERIOD, VOLUME_MA_PERIOD
+
+
+def random_df(n=80, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 10 * np.exp(np.cumsum(rng.normal(-0.002, 0.01, n)))
+    return pd.DataFrame({
+        "close": close,
+        "high": close * (1 + rng.uniform(0, 0.01, n)),
+        "volume": rng.uniform(500, 1500, n),
+    })
+
+
+def test_state_matches_signal_generator():
+    df = random_df()
+    gen = SignalGenerator()
+    state = IndicatorSet()
+    state.seed(df["close"], df["high"], df["volume"])
+
+    np.testing.assert_allclose(state.rsi.value, gen.calculate_rsi(df).iloc[-1])
+    macd, signal = gen.calculate_macd(df)
+    np.testing.assert_allclose(state.macd.value, (macd.iloc[-1], signal.iloc[-1]))
+    np.testing.assert_allclose(state.volume_ma.value,
+                               df["volume"].rolling(VOLUME_MA_PERIOD).mean().iloc[-1])
+    assert state.resistance() == gen.calculate_resistance_h1(df)
+    assert state.context() == gen.check_context(df)
+
+
+def test_peek_equals_update_without_mutating():
+    df = random_df(40)
+    state = IndicatorSet()
+    state.seed(df["close"][:-1], df["high"][:-1], df["volume"][:-1])
+    before = state.ema_short.value
+    peek_res = state.resistance(df["high"].iloc[-1])
+    peek_ctx = state.context(df["close"].iloc[-1])
+    assert state.ema_short.value == before
+
+    assert peek_res == df["high"].rolling(RESISTANCE_WINDOW).max().iloc[-1]
+    assert peek_ctx == SignalGenerator().check_context(df)
+
+    ema = EMAState(span=EMA_SHORT_PERIOD)
+    for x in df["close"]:
+        ema.update(x)
+    np.testing.assert_allclose(ema.value, df["close"].ewm(span=EMA_SHORT_PERIOD, adjust=False).mean().iloc[-1])
+
+
+def test_rolling_max_window():
+    state = RollingMaxState(window=3)
+    out = [state.update(x) for x in [5, 1, 2, 0, 4, 3]]
+    assert np.isnan(out[0]) and np.isnan(out[1])
+    assert out[2:] == [5, 2, 4, 4]
+
+
+def test_precheck_margin_covers_windowed_check_trigger():
+    # estado com todo o histórico x check_trigger sobre a janela dos últimos 200 candles
+    df = random_df(n=600, seed=7)
+    gen = SignalGenerator()
+    state = IndicatorSet()
+    state.seed(df["close"][:300], df["high"][:300], df["volume"][:300])
+    accepted = 0
+    for j in range(300, len(df)):
+        window = df.iloc[j - 199:j + 1].reset_index(drop=True)
+        state.update(df["close"].iat[j], df["high"].iat[j], df["volume"].iat[j])
+        resistance = float(window["high"].tail(RESISTANCE_WINDOW).max()) * 1.01
+        if gen.check_trigger(window, resistance) is not None:
+            accepted += 1
+            assert state.trigger_precheck(resistance, 30)
+    assert accepted
+
+
+def test_precheck_margin_boundary():
+    state = IndicatorSet()
+    state.seed(*random_df(n=60, seed=1)[["close", "high", "volume"]].to_numpy().T)
+    # RSI logo acima de 50: rejeitado sem margem, aceito dentro da folga
+    state.rsi.gain.value, state.rsi.loss.value = 1.002, 1.0
+    state.ema_short.value, state.ema_long.value = 1.0, 1.0005
+    state.macd.fast.value = state.macd.slow.value = 0.0
+    state.macd.signal.value = 1e-6
+    state.close, state.volume = 0.5, float("inf")
+    assert state.rsi.value > 50
+    assert not state.trigger_precheck(1.0, 30, margin=0.0)
+    assert state.trigger_precheck(1.0, 30)
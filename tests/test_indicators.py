@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+import screener.indicators as ind_mod
+from screener.indicators import IndicatorKernel
+from screener.signal_generator import SignalGenerator
+
+
+def make_df(n=40, symbol="A_USDT", start=0):
+    close = np.linspace(2.0, 1.0, n)
+    return pd.DataFrame({
+        "time": pd.to_datetime(np.arange(start, start + n) * 900, unit="s"),
+        "close": close, "high": close * 1.01, "volume": np.full(n, 100.0), "symbol": symbol,
+    })
+
+
+def test_rsi_computed_once_per_bar(monkeypatch):
+    calls = []
+    real_rsi = ind_mod.rsi
+    monkeypatch.setattr(ind_mod, "rsi", lambda close, *a: calls.append(1) or real_rsi(close, *a))
+    sg = SignalGenerator()
+    df = make_df()
+    sg.check_trigger(df, resistance=5.0)
+    # mesma série reconstruída (novo DataFrame, mesmo candle) reaproveita o cálculo
+    sg.check_context(make_df())
+    assert len(calls) == 1
+
+    sg.check_context(make_df(start=1))  # novo candle
+    assert len(calls) == 2
+
+
+def test_kernel_key_distinguishes_symbol_and_open_candle():
+    kernel = IndicatorKernel(max_bytes=2 * IndicatorKernel.estimate_bytes(make_df()))
+    a, b = make_df(symbol="A_USDT"), make_df(symbol="B_USDT")
+    assert kernel.of(a) is not kernel.of(b)
+    updated = make_df()
+    updated.loc[updated.index[-1], "close"] = 1.5  # candle aberto mudou
+    assert kernel.of(updated) is not kernel.of(a)
+    assert len(kernel._series) == 2
+
+
+def test_kernel_bounded_by_bytes_and_not_fooled_by_in_place_mutation():
+    size = IndicatorKernel.estimate_bytes(make_df())
+    kernel = IndicatorKernel(max_bytes=3 * size)
+    for i in range(10):
+        kernel.of(make_df(start=i))
+    assert len(kernel._series) == 3 and kernel.nbytes == 3 * size
+
+    # sem símbolo não há chave: um DataFrame alterado no lugar é recalculado
+    df = make_df().drop(columns="symbol")
+    before = kernel.of(df).rsi().iat[-1]
+    df["close"] *= np.linspace(1.0, 2.0, len(df))
+    assert kernel.of(df).rsi().iat[-1] != before
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+
+from mexc.kline_cache import KlineCache
+from mexc.mexc_api import MexcApiAsync
+
+
+def payload(times, base=1.0):
+    n = len(times)
+    return {
+        "time": list(times),
+        "open": [base] * n, "high": [base + 1] * n, "low": [base - 1] * n,
+        "close": [base] * n, "vol": [10.0] * n, "amount": [100.0] * n,
+    }
+
+
+def test_cache_roundtrip_merge_and_window(tmp_path):
+    cache = KlineCache(base_dir=str(tmp_path), max_bars=4)
+    cache.save("BTC_USDT", "Min15", KlineCache.to_arrays(payload([0, 900, 1800, 2700, 3600])))
+    loaded = cache.load("BTC_USDT", "Min15")
+    assert loaded["time"].tolist() == [900, 1800, 2700, 3600]
+
+    merged = KlineCache.merge(loaded, KlineCache.to_arrays(payload([3600, 4500], base=2.0)))
+    assert merged["time"].tolist() == [900, 1800, 2700, 3600, 4500]
+    assert merged["close"].tolist() == [1.0, 1.0, 1.0, 2.0, 2.0]
+    assert KlineCache.window(merged, 1800, 3600)["time"].tolist() == [1800, 2700, 3600]
+
+    # escritores concorrentes usam temporários distintos: o arquivo final é sempre íntegro
+    from concurrent.futures import ThreadPoolExecutor
+    arrays = [KlineCache.to_arrays(payload(range(0, 900 * n, 900), base=n)) for n in range(1, 9)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda a: cache.save("ETH_USDT", "Min15", a), arrays * 4))
+    loaded = cache.load("ETH_USDT", "Min15")
+    assert len(set(loaded["close"].tolist())) == 1
+    assert sorted(p.name for p in (tmp_path / "Min15").iterdir()) == ["BTC_USDT.npz", "ETH_USDT.npz"]
+
+
+def test_get_klines_fetches_only_new_bars(tmp_path):
+    api = MexcApiAsync(kline_cache=KlineCache(base_dir=str(tmp_path)))
+    calls = []
+
+    async def fake_fetch(symbol, interval, start, end):
+        calls.append(start)
+        times = [t for t in range(0, end + 1, 900) if start is None or t >= start]
+        return payload(times)
+
+    api._fetch_klines = fake_fetch
+    first = asyncio.run(api.get_klines("BTC_USDT", "Min15", start=0, end=9000))
+    second = asyncio.run(api.get_klines("BTC_USDT", "Min15", start=900, end=10800))
+    assert calls == [0, 9000]
+    assert first["time"][-1] == 9000
+    assert second["time"][0] == 900 and second["time"][-1] == 10800
+    assert len(second["time"]) == len(set(second["time"].tolist()))
+
+
+def test_stale_cache_is_refetched_from_start(tmp_path):
+    cache = KlineCache(base_dir=str(tmp_path))
+    cache.save("BTC_USDT", "Min15", KlineCache.to_arrays(payload(range(0, 9001, 900))))
+    api = MexcApiAsync(kline_cache=cache)
+    calls = []
+
+    async def fake_fetch(symbol, interval, start, end):
+        calls.append(start)
+        # limite de candles por requisição: a resposta para em start + 10 candles
+        return payload(range(start, min(end, start + 9 * 900) + 1, 900))
+
+    api._fetch_klines = fake_fetch
+    # cache termina muito antes do início pedido (downtime): busca a partir de `start`
+    data = asyncio.run(api.get_klines("BTC_USDT", "Min15", start=90000, end=97200))
+    assert calls == [90000]
+    assert data["time"][0] == 90000 and data["time"][-1] == 97200
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mexc.kline_decoder import KlineSeries, decode_klines
+from mexc.mexc_api import MexcApiAsync
+
+RAW = (
+    b'{"success":true,"code":0,"data":{"time":[1700000000,1700000900],'
+    b'"open":[1.0,1.1],"high":[1.2,1.3],"low":[0.9,1.0],"close":[1.1,1.2],'
+    b'"vol":[100,200],"amount":[110.0,240.0]}}'
+)
+
+
+def test_decode_klines_to_arrays():
+    series = decode_klines(RAW, "BTC_USDT")
+    assert isinstance(series, KlineSeries) and len(series) == 2
+    assert series.time.dtype == np.int64 and series.volume.dtype == np.float64
+    assert series.close.tolist() == [1.1, 1.2]
+    assert decode_klines(b'{"success":false,"data":[]}', "X") is None
+    # payload colunar com os mesmos arrays (cache em disco / klines_to_dataframe)
+    assert series.to_payload()["vol"] is series.volume
+
+
+def test_dataframe_on_demand_matches_previous_format():
+    series = decode_klines(RAW, "BTC_USDT")
+    df = series.to_dataframe()
+    assert list(df.columns) == ["time", "open", "high", "low", "close", "volume", "amount", "symbol"]
+    assert df["time"].iloc[0] == pd.Timestamp(1700000000, unit="s")
+    assert df["symbol"].iloc[-1] == "BTC_USDT"
+    assert df["volume"].tolist() == [100.0, 200.0]
+
+    arrays = {"time": series.time, "close": series.close}
+    # arrays já no dtype certo não são copiados
+    assert KlineSeries.from_payload(arrays, "BTC_USDT").close is series.close
+    assert MexcApiAsync.klines_to_dataframe({"time": [1], "close": [2.0]}, "X")["amount"].isna().all()
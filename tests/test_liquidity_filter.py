@@ -22,4 +22,37 @@ async def test_filter_by_liquidez_pass_fail(monkeypatch):
     api = DummyAPIVol(data)
     lf = LiquidityFilter(api)
     res = await lf.filter_by_liquidez(['A','B','C'])
-    assert 'A' in res and 'C' in res and 'B' not in res
\ No newline at end of file
+    assert 'A' in res and 'C' in res and 'B' not in res
+
+class DummyAPIBulk(DummyAPIVol):
+    def __init__(self, data, tickers):
+        super().__init__(data)
+        self.tickers = tickers
+        self.single_calls = 0
+    async def get_all_tickers(self): return self.tickers
+    async def obter_liquidez(self, symbol):
+        self.single_calls += 1
+        return await super().obter_liquidez(symbol)
+
+
+@pytest.mark.asyncio
+async def test_filter_by_liquidez_bulk(monkeypatch):
+    import screener.liquidity_filter as lf_mod
+    monkeypatch.setattr(lf_mod, 'MIN_VOLUME_24H_USD', 50000)
+    monkeypatch.setattr(lf_mod, 'MIN_OPEN_INTEREST_USD', 10000)
+    tickers = [
+        {'symbol': 'C', 'volume24': 50000, 'holdVol': 10000},
+        {'symbol': 'A', 'volume24': '60000', 'holdVol': 20000},
+        {'symbol': 'B', 'volume24': 40000, 'holdVol': 9000},
+        {'symbol': 'D', 'amount24': 90000, 'hold_vol': 90000},
+        {'symbol': 'X', 'volume24': 90000, 'holdVol': 90000},
+    ]
+    api = DummyAPIBulk({}, tickers)
+    res = await LiquidityFilter(api).filter_by_liquidez(['A', 'B', 'C', 'D', 'E'])
+    assert res == ['A', 'C', 'D']
+    assert api.single_calls == 0
+
+    # sem resposta em lote cai no modo símbolo a símbolo
+    api = DummyAPIBulk({'A': (60000, 20000)}, [])
+    res = await LiquidityFilter(api).filter_by_liquidez(['A', 'B'])
+    assert res == ['A'] and api.single_calls == 2
@@ -18,4 +18,100 @@ async def test_news_wrapper(monkeypatch):
         async def get(self,url,params): return DummyResp()
     monkeypatch.setattr('external_data.news_api_wrapper.httpx.AsyncClient', lambda **kwargs: DummyClient())
     arts = await wrapper.fetch_news('X')
-    assert isinstance(arts,list)
\ No newline at end of file
+    assert isinstance(arts,list)
+
+@pytest.mark.asyncio
+async def test_news_wrapper_pools_client_and_caches(monkeypatch):
+    created, calls = [], []
+    class DummyResp:
+        def raise_for_status(self): pass
+        def json(self): return {'articles': [{'title': 't'}]}
+    class DummyClient:
+        def __init__(self): created.append(self)
+        async def get(self, url, params): calls.append(params['q']); return DummyResp()
+        async def aclose(self): pass
+    monkeypatch.setattr('external_data.news_api_wrapper.httpx.AsyncClient', lambda **kwargs: DummyClient())
+
+    from utils.ttl_cache import TTLCache
+    now = [0.0]
+    from external_data.news_budget import NewsBudget
+    wrapper = NewsAPIWrapper(api_key='key', cache=TTLCache(2, ttl=60, clock=lambda: now[0]),
+                             budget=NewsBudget(daily_quota=100, window_quota=100))
+    await wrapper.fetch_news('BTC')
+    await wrapper.fetch_news('BTC')
+    await wrapper.fetch_news('ETH')
+    assert calls == ['BTC', 'ETH'] and len(created) == 1
+
+    await wrapper.fetch_news('SOL')           # excede 2 entradas: BTC (LRU) sai
+    await wrapper.fetch_news('BTC')
+    now[0] = 61.0                             # tudo expirado
+    await wrapper.fetch_news('SOL')
+    assert calls == ['BTC', 'ETH', 'SOL', 'BTC', 'SOL']
+    await wrapper.aclose()
+    assert wrapper._http is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_news_batch_combines_queries_and_demuxes(monkeypatch):
+    from external_data.news_api_wrapper import build_queries
+    wrapper = NewsAPIWrapper(api_key='key')
+    queries = []
+    async def fake_fetch(query, language, page_size):
+        queries.append((query, page_size))
+        return [
+            {'title': 'BTC sobe', 'description': 'ETH acompanha'},
+            {'title': 'SOLANA', 'description': None},      # não é o ticker SOL
+            {'title': 'Alta do SOL', 'description': 'BTC'},
+        ]
+    monkeypatch.setattr(wrapper, '_request', fake_fetch)
+
+    news = await wrapper.fetch_news_batch(['BTC_USDT', 'ETH_USDT', 'SOL_USDT', 'XRP_USDT'], page_size=1)
+    assert queries == [('"BTC" OR "ETH" OR "SOL" OR "XRP"', 4)]
+    assert [a['title'] for a in news['BTC_USDT']] == ['BTC sobe']
+    assert [a['title'] for a in news['ETH_USDT']] == ['BTC sobe']
+    assert [a['title'] for a in news['SOL_USDT']] == ['Alta do SOL']
+    assert news['XRP_USDT'] == []
+
+    # outra ordem de prioridade na execução seguinte: só o ativo novo é consultado
+    news = await wrapper.fetch_news_batch(['XRP_USDT', 'ADA_USDT', 'SOL_USDT', 'BTC_USDT'], page_size=1)
+    assert queries[1:] == [('"ADA"', 1)]
+    assert [a['title'] for a in news['SOL_USDT']] == ['Alta do SOL']
+
+    groups = build_queries([f'T{i:03d}' for i in range(100)], max_chars=60)
+    assert all(len(q) <= 60 for q, _ in groups)
+    assert sum(len(terms) for _, terms in groups) == 100
+
+
+def test_match_articles_ignores_common_words():
+    from external_data.news_api_wrapper import match_articles
+    articles = [
+        {'title': 'One more reason near-term gas prices rise', 'description': 'AI stocks fall'},
+        {'title': 'ONE e NEAR sobem; $AI dispara', 'description': None},
+    ]
+    found = match_articles(articles, ['ONE', 'NEAR', 'GAS', 'AI'], per_term=5)
+    assert {t: len(a) for t, a in found.items()} == {'ONE': 1, 'NEAR': 1, 'GAS': 0, 'AI': 1}
+    assert found['AI'][0] is articles[1]
+
+
+@pytest.mark.asyncio
+async def test_news_cache_survives_next_scheduler_run(monkeypatch):
+    from config.settings import NEWS_CACHE_TTL_SECONDS, SCHEDULER_INTERVAL_MINUTES
+    from external_data.news_budget import NewsBudget
+    from utils.ttl_cache import TTLCache
+    now = [0.0]
+    wrapper = NewsAPIWrapper(api_key='key', cache=TTLCache(16, NEWS_CACHE_TTL_SECONDS, clock=lambda: now[0]),
+                             budget=NewsBudget(daily_quota=100, window_quota=100))
+    calls = []
+    async def fake_request(query, language, page_size):
+        calls.append(query)
+        return [{'title': 'BTC sobe'}]
+    monkeypatch.setattr(wrapper, '_request', fake_request)
+
+    interval = SCHEDULER_INTERVAL_MINUTES * 60
+    await wrapper.fetch_news_batch(['BTC_USDT'])
+    now[0] = interval + 300            # próxima execução (intervalo + duração da varredura)
+    await wrapper.fetch_news_batch(['BTC_USDT'])
+    assert calls == ['"BTC"']
+    now[0] = 2 * interval + 600        # a seguinte renova
+    await wrapper.fetch_news_batch(['BTC_USDT'])
+    assert calls == ['"BTC"', '"BTC"']
@@ -0,0 +1,30 @@
+from external_data.news_budget import NewsBudget
+
+
+def test_budget_quotas_and_backoff_recovery():
+    now = [0.0]
+    budget = NewsBudget(daily_quota=5, window_quota=2, window_seconds=100,
+                        backoff=10, max_backoff=30, clock=lambda: now[0])
+
+    assert budget.try_acquire() and budget.try_acquire()
+    assert not budget.try_acquire() and budget.remaining() == 0      # janela cheia
+    now[0] = 100.0
+    assert budget.remaining() == 2 and budget.remaining_today() == 3
+
+    # 429 seguidos: recuo dobra até o máximo; volta sozinho depois dele
+    assert budget.on_rate_limited() == 10
+    assert budget.rate_limited() and not budget.try_acquire()
+    now[0] = 110.0
+    assert budget.on_rate_limited() == 20
+    assert budget.on_rate_limited(retry_after=5) == 30
+    now[0] = 140.0
+    assert budget.try_acquire()
+    budget.on_success()
+    assert budget.on_rate_limited() == 10                             # sucesso zera o recuo
+
+    # cota diária esgotada até o próximo dia UTC
+    now[0] = 1000.0
+    assert budget.try_acquire() and budget.try_acquire()
+    assert budget.remaining_today() == 0 and not budget.try_acquire()
+    now[0] = 86400.0
+    assert budget.remaining_today() == 5
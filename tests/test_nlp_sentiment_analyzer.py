@@ -12,4 +12,57 @@ def test_sentiment_empty():
 def test_sentiment_polarity(monkeypatch):
     an = NLPSentimentAnalyzer()
     monkeypatch.setattr(an, 'analyze_sentiment', lambda t: {'polarity':-0.7})
-    assert an.get_overall_sentiment([{'title':'x'}])=='negativo'
\ No newline at end of file
+    assert an.get_overall_sentiment([{'title':'x'}])=='negativo'
+
+def test_sentiment_memoized_and_persisted(monkeypatch, tmp_path):
+    from external_data import nlp_sentiment_analyzer as mod
+    from external_data.sentiment_store import SentimentStore
+    scored = []
+    real = mod.score_text
+    monkeypatch.setattr(mod, 'score_text', lambda t: scored.append(t) or real(t))
+
+    store = SentimentStore(str(tmp_path / 'sentiment.sqlite3'))
+    an = NLPSentimentAnalyzer(store=store)
+    res = an.analyze_many(['Great rally ahead', 'Great  rally ahead ', 'Terrible crash'])
+    assert res[0] == res[1] and res[0]['polarity'] > 0 > res[2]['polarity']
+    assert len(scored) == 2                       # espaços não geram nova análise
+    an.analyze_sentiment('Terrible crash')
+    assert len(scored) == 2
+
+    # nova instância (reinício): resultados vêm do disco
+    again = NLPSentimentAnalyzer(store=SentimentStore(store.path))
+    assert again.analyze_sentiment('Great rally ahead') == res[0]
+    assert len(scored) == 2
+
+
+def test_sentiment_store_keeps_most_recent_rows(tmp_path):
+    from external_data.sentiment_store import SentimentStore
+    store = SentimentStore(str(tmp_path / 'sentiment.sqlite3'), max_rows=3)
+    for i in range(5):
+        store.put_many({f'k{i}': (0.1 * i, 0.5)})
+    store.put_many({'k2': (0.9, 0.5)})           # regravada: passa a ser a mais recente
+    store.put_many({'k5': (0.0, 0.5)})
+    assert sorted(store.get_many([f'k{i}' for i in range(6)])) == ['k2', 'k4', 'k5']
+
+
+def test_overall_many_scores_off_loop_in_batches(monkeypatch):
+    import threading
+    from external_data import nlp_sentiment_analyzer as mod
+    threads = []
+    real = mod.score_text
+    monkeypatch.setattr(mod, 'score_text', lambda t: threads.append(threading.current_thread().name) or real(t))
+
+    monkeypatch.setattr(mod, 'SENTIMENT_STORE_PATH', '')   # só memória
+    an = NLPSentimentAnalyzer(executor='thread', max_workers=2, batch_size=2, max_inflight_batches=1)
+    articles = {
+        'BTC_USDT': [{'title': 'Great rally ahead', 'description': 'Excellent gains'}],
+        'ETH_USDT': [{'title': 'Terrible crash', 'description': None}, {'title': 'Great rally ahead'}],
+        'SOL_USDT': [],
+    }
+    try:
+        res = asyncio.run(an.overall_many(articles))
+    finally:
+        an.close()
+    # 3 textos distintos, todos analisados no pool
+    assert len(threads) == 3 and all(name.startswith('sentiment') for name in threads)
+    assert res == {s: NLPSentimentAnalyzer().get_overall_sentiment(a) for s, a in articles.items()}
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import pytest
+
+from mexc.rate_limiter import TokenBucket, RateLimiter
+from mexc.mexc_api import MexcApiAsync
+
+
+def test_token_bucket_reserve_and_penalize():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # terceiro token precisa esperar ~1/rate
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    bucket.penalize(5)
+    assert bucket.reserve() >= 4.9
+
+
+def test_penalized_bucket_releases_queue_at_rate():
+    bucket = TokenBucket(rate=10, capacity=5)
+    bucket.penalize(2)
+    waits = [bucket.reserve() for _ in range(5)]
+    # fila liberada um a um após o bloqueio, não toda no mesmo instante
+    assert waits == pytest.approx([2.1, 2.2, 2.3, 2.4, 2.5], abs=0.02)
+
+
+def test_backoff_honours_retry_after():
+    rl = RateLimiter(rate=10, burst=1, backoff_base=0.5, backoff_max=4)
+    assert rl.backoff(0, retry_after=2) == 2
+    # o prazo do servidor não é encurtado pelo teto do backoff exponencial
+    assert rl.backoff(0, retry_after=60) == 60
+    assert 0 <= rl.backoff(10) <= 4
+    assert RateLimiter.parse_retry_after("3") == 3.0
+    assert RateLimiter.parse_retry_after("abc") is None
+
+
+class FakeResp:
+    def __init__(self, status, body=None, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+    async def __aenter__(self): return self
+    async def __aexit__(self, *a): pass
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+    async def read(self): return json.dumps(self.body).encode()
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+    def request(self, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def test_make_request_retries_after_429():
+    rl = RateLimiter(rate=1000, burst=10, backoff_base=0.01, backoff_max=0.05)
+    api = MexcApiAsync(rate_limiter=rl, max_retries=3)
+    api.http = FakeSession([
+        FakeResp(429, headers={"Retry-After": "0.02"}),
+        FakeResp(200, {"success": True, "data": [1]}),
+    ])
+    data = asyncio.run(api._make_request("GET", "/x"))
+    assert data == {"success": True, "data": [1]}
+    assert api.http.calls == 2
+    # o 429 bloqueou o bucket do endpoint para todos os chamadores
+    assert rl.bucket("/x").blocked_until > 0
+
+
+def test_retry_after_above_backoff_max_blocks_bucket_for_full_period():
+    rl = RateLimiter(rate=1000, burst=10, backoff_base=0.01, backoff_max=0.05)
+    api = MexcApiAsync(rate_limiter=rl, max_retries=1)
+    api.http = FakeSession([FakeResp(429, headers={"Retry-After": "60"})])
+    assert asyncio.run(api._make_request("GET", "/z")) is None
+    assert rl.bucket("/z").reserve() >= 59
+
+
+def test_make_request_retries_after_mexc_510():
+    rl = RateLimiter(rate=1000, burst=10, backoff_base=0.01, backoff_max=0.05)
+    api = MexcApiAsync(rate_limiter=rl, max_retries=3)
+    api.http = FakeSession([
+        FakeResp(200, {"success": False, "code": 510}),
+        FakeResp(200, {"success": True, "data": [2]}),
+    ])
+    data = asyncio.run(api._make_request("GET", "/y"))
+    assert data == {"success": True, "data": [2]}
+    assert api.http.calls == 2
+    assert rl.bucket("/y").blocked_until > 0
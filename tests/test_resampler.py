@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from screener.resampler import resample_ohlcv
+
+
+def make_entry_df(start_epoch, n):
+    times = [start_epoch + 900 * i for i in range(n)]
+    return pd.DataFrame({
+        "time": pd.to_datetime(times, unit="s"),
+        "open": [float(i) for i in range(n)],
+        "high": [float(i) + 0.5 for i in range(n)],
+        "low": [float(i) - 0.5 for i in range(n)],
+        "close": [float(i) + 0.1 for i in range(n)],
+        "volume": [1.0] * n,
+        "amount": [2.0] * n,
+        "symbol": "A_USDT",
+    })
+
+
+def test_resample_drops_leading_partial_and_keeps_open_bar():
+    # começa às 00:30 (bucket 00:00 incompleto) e termina às 03:15 (bucket 03:00 aberto)
+    df = make_entry_df(1800, 12)
+    out = resample_ohlcv(df, "Min15", "Min60")
+    assert out["time"].tolist() == [pd.Timestamp(s, unit="s") for s in (3600, 7200, 10800)]
+    first = out.iloc[0]
+    assert (first["open"], first["close"]) == (2.0, 5.1)
+    assert (first["high"], first["low"], first["volume"]) == (5.5, 1.5, 4.0)
+    assert out["volume"].iloc[-1] == 2.0
+    assert out["symbol"].iloc[-1] == "A_USDT"
+
+    closed = resample_ohlcv(df, "Min15", "Min60", include_partial=False)
+    assert len(closed) == 2
+
+
+def test_resample_rejects_non_multiple():
+    with pytest.raises(ValueError):
+        resample_ohlcv(make_entry_df(0, 4), "Min15", "Min5")
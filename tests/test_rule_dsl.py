@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screener.rule_dsl import RuleSet, RuleSyntaxError, SHORT_TRIGGER, parse
+from screener.vector_engine import CrossSectionalEngine
+
+
+def random_frames(n_symbols=30, n_bars=80, seed=4):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(n_symbols):
+        close = 10 * np.exp(np.cumsum(rng.normal(-0.002, 0.01, n_bars)))
+        frames[f"S{i}_USDT"] = pd.DataFrame({
+            "close": close,
+            "high": close * (1 + rng.uniform(0, 0.01, n_bars)),
+            "volume": rng.uniform(500, 1500, n_bars),
+        })
+    return frames
+
+
+def test_short_trigger_matches_vector_engine():
+    frames = random_frames()
+    resistance = {s: float(df["high"].tail(8).max()) for s, df in frames.items()}
+    symbols, mask, _ = CrossSectionalEngine().trigger_mask(frames, resistance)
+    expected = [s for s, ok in zip(symbols, mask) if ok]
+    assert expected, "dados de teste deveriam gerar ao menos um candidato"
+
+    rules = RuleSet({"short": SHORT_TRIGGER})
+    assert rules.evaluate_frames(frames, {"resistance": resistance})["short"] == expected
+
+
+def test_shared_subexpressions_are_planned_once():
+    rules = RuleSet({
+        "short": "ema(9) < ema(21) and macd(9, 21) < 0",
+        "long": "ema(close, 9) > ema(21) and (0 > macd(9, 21)) == false_flag",
+    })
+    emas = [n for n in rules.plan if n[:2] == ("call", "ema")]
+    assert len(emas) == 2  # ema(9) e ema(21), reaproveitadas pela MACD e pela outra regra
+    assert rules.variables == ["false_flag"]
+
+
+@pytest.mark.parametrize("text", [
+    "ema(9) <", "foo(3) > 1", "ema(close, 2.5) > 1", "close > 1 $",
+    # erros de tipo, detectados na compilação
+    "not close", "close and volume", "ema(3, 9) > 1", "(close > 1) + 1 > 0", "sma(close > 1, 3) > 0", "ema(9)",
+])
+def test_syntax_errors(text):
+    with pytest.raises(RuleSyntaxError):
+        parse(text)
@@ -53,6 +53,9 @@ class DummyExtEvaluator:
     async def evaluate_external_factors(self, symbol, df):
         return {"anomalous_volume": False, "sentiment": "neutro"}
 
+    async def evaluate_batch(self, frames):
+        return {sym: await self.evaluate_external_factors(sym, df) for sym, df in frames.items()}
+
 
 def test_screener_core_full_flow(monkeypatch):
     api = DummyAPI()
@@ -101,3 +104,163 @@ def test_screener_core_full_flow(monkeypatch):
 
     # IA message must start with the pluralized prefix
     assert ia_msg.startswith("🤖 <b>Sugestões da IA"), "IA message formatting is incorrect"
+
+
+def test_analyze_symbols_keeps_order_and_isolates_failures():
+    core = ScreenerCore(DummyAPI(), DummyNotifier(), DummyExtEvaluator(),
+                        max_workers=3, symbol_timeout=0.05)
+    delays = {"A": 0.03, "B": 0.0, "C": 0.01, "D": 0.0}
+
+    async def fake_analyze(sym, *args):
+        if sym == "SLOW":
+            await asyncio.sleep(1)
+        if sym == "BOOM":
+            raise RuntimeError("falha")
+        await asyncio.sleep(delays[sym])
+        return {"symbol": sym}, pd.DataFrame({"volume": [1.0], "close": [1.0]})
+
+    core._analyze_symbol = fake_analyze
+    symbols = ["A", "SLOW", "B", "BOOM", "C", "D"]
+    results = asyncio.run(core._analyze_symbols(symbols, 0, 0, 0, 0))
+    assert [r["symbol"] for r in results] == ["A", "B", "C", "D"]
+
+
+def test_shared_api_is_not_closed_after_run(monkeypatch):
+    class TrackingAPI(DummyAPI):
+        closed = 0
+        async def get_futures_contracts(self):
+            return []
+        async def close(self):
+            TrackingAPI.closed += 1
+
+    api = TrackingAPI()
+    core = ScreenerCore(api, DummyNotifier(), DummyExtEvaluator(), close_api=False)
+    asyncio.run(core.run())
+    assert TrackingAPI.closed == 0
+
+    core = ScreenerCore(api, DummyNotifier(), DummyExtEvaluator())
+    asyncio.run(core.run())
+    assert TrackingAPI.closed == 1
+
+    # pool de processos injetado (JobScheduler) sobrevive à execução
+    from screener.process_evaluator import ProcessEvaluator
+    evaluator = ProcessEvaluator(max_workers=1)
+    closed = []
+    evaluator.close = lambda: closed.append(True)
+    core = asyncio.run(ScreenerCore.create(api=api, ext_evaluator=DummyExtEvaluator(),
+                                           process_evaluator=evaluator))
+    asyncio.run(core.run())
+    assert core.process_evaluator is evaluator and not closed
+
+
+def test_derived_trend_fetches_entry_only(monkeypatch):
+    class CountingAPI(DummyAPI):
+        def __init__(self): self.intervals = []
+        async def get_klines(self, sym, interval, start, end):
+            self.intervals.append(interval)
+            n = 40
+            return {"time": [3600 + 900 * i for i in range(n)], "open": [1.0] * n,
+                    "high": [1.1] * n, "low": [0.9] * n, "close": [1.0] * n,
+                    "vol": [10.0] * n, "amount": [10.0] * n}
+        def klines_to_dataframe(self, data, sym):
+            from mexc.mexc_api import MexcApiAsync
+            return MexcApiAsync.klines_to_dataframe(data, sym)
+
+    seen = {}
+    monkeypatch.setattr(SignalGenerator, "check_context", lambda self, df: seen.setdefault("trend", len(df)) or True)
+    monkeypatch.setattr(SignalGenerator, "calculate_resistance_h1", lambda self, df: 1.25)
+    monkeypatch.setattr(SignalGenerator, "check_trigger", lambda self, df, res: None)
+
+    api = CountingAPI()
+    core = ScreenerCore(api, DummyNotifier(), DummyExtEvaluator(), derive_trend=True)
+    asyncio.run(core._analyze_symbol("ARPA_USDT", 0, 0, 0, 0))
+    assert len(api.intervals) == 1
+    assert seen["trend"] == 10  # 40 candles de 15m -> 10 candles de 60m
+
+
+def test_vector_and_process_modes_match_pipeline_mode(monkeypatch):
+    import zlib
+    import numpy as np
+    from mexc.mexc_api import MexcApiAsync
+    from screener.process_evaluator import ProcessEvaluator
+
+    class RandomAPI(DummyAPI):
+        async def get_klines(self, sym, interval, start, end):
+            rng = np.random.default_rng(zlib.crc32(f"{sym}:{interval}".encode()))
+            n = 200
+            close = 10 * np.exp(np.cumsum(rng.normal(-0.002, 0.01, n)))
+            return {"time": list(range(n)), "open": close, "high": close * 1.004,
+                    "low": close * 0.99, "close": close, "vol": rng.uniform(500, 1500, n),
+                    "amount": close}
+        def klines_to_dataframe(self, data, sym):
+            return MexcApiAsync.klines_to_dataframe(data, sym)
+
+    symbols = [f"S{i}_USDT" for i in range(60)]
+    results, rejections = {}, {}
+    evaluator = ProcessEvaluator(max_workers=2, batch_size=7)
+    try:
+        for mode in ("pipeline", "vector", "process"):
+            core = ScreenerCore(RandomAPI(), DummyNotifier(), DummyExtEvaluator(), eval_mode=mode,
+                                process_evaluator=evaluator)
+            analyze = {"vector": core._analyze_symbols_vectorized,
+                       "process": core._analyze_symbols_process}.get(mode, core._analyze_symbols)
+            results[mode] = asyncio.run(analyze(symbols, 0, 0, 0, 0))
+            rejections[mode] = dict(core.signal_gen.rejections)
+    finally:
+        evaluator.close()
+    assert results["pipeline"], "dados de teste deveriam gerar ao menos um sinal"
+    for mode in ("vector", "process"):
+        assert [s["symbol"] for s in results[mode]] == [s["symbol"] for s in results["pipeline"]]
+        for v, p in zip(results[mode], results["pipeline"]):
+            assert v["entry_price"] == pytest.approx(p["entry_price"])
+            assert v["sentiment"] == p["sentiment"] and v["trend"] == p["trend"]
+        # contadores por gate iguais em todos os modos
+        assert rejections[mode] == rejections["pipeline"]
+
+
+def test_trend_cache_skips_trend_until_next_close(monkeypatch):
+    from mexc.mexc_api import MexcApiAsync
+    from screener.trend_cache import TrendCache
+    from config.settings import _PERIODS
+
+    class ClockAPI(DummyAPI):
+        def __init__(self): self.intervals = []
+        async def get_klines(self, sym, interval, start, end):
+            self.intervals.append(interval)
+            period, n = _PERIODS[interval], 40
+            last = end // period * period
+            close = [2.0 - i * 0.01 for i in range(n)]
+            return {"time": [last - (n - 1 - i) * period for i in range(n)], "open": close,
+                    "high": close, "low": close, "close": close, "vol": [1.0] * n, "amount": [1.0] * n}
+        def klines_to_dataframe(self, data, sym):
+            return MexcApiAsync.klines_to_dataframe(data, sym)
+
+    contexts = []
+    monkeypatch.setattr(SignalGenerator, "check_context", lambda self, df: contexts.append(len(df)) or True)
+    monkeypatch.setattr(SignalGenerator, "calculate_resistance_h1", lambda self, df: 1.25)
+    monkeypatch.setattr(SignalGenerator, "check_trigger", lambda self, df, res: None)
+
+    api = ClockAPI()
+    core = ScreenerCore(api, DummyNotifier(), DummyExtEvaluator(), derive_trend=False, trend_cache=TrendCache("Min60"))
+    for now in (10 * 3600 + 600, 10 * 3600 + 1500, 11 * 3600 + 60):
+        asyncio.run(core._analyze_symbol("ARPA_USDT", 0, now, 0, now))
+    assert api.intervals.count("Min60") == 2  # 10:10 busca, 10:25 reaproveita, 11:01 invalida
+    assert contexts == [39, 39]                # candle de trend aberto descartado
+    assert core.trend_cache.hits == 1
+
+
+def test_trigger_rule_filters_signals_of_any_mode():
+    from screener.rule_dsl import RuleSyntaxError
+
+    with pytest.raises(RuleSyntaxError):
+        ScreenerCore(DummyAPI(), DummyNotifier(), DummyExtEvaluator(), trigger_rule="not close")
+
+    frames = {
+        "A_USDT": pd.DataFrame({"close": [1.0, 1.1, 1.2], "volume": [10.0, 10, 10]}),
+        "B_USDT": pd.DataFrame({"close": [1.0, 0.9, 0.8], "volume": [10.0, 10, 10]}),
+    }
+    signals = [{"symbol": s, "entry_price": 1.0, "indicators": {"resistance_raw": 1.0}} for s in frames]
+    core = ScreenerCore(DummyAPI(), DummyNotifier(), DummyExtEvaluator(),
+                        trigger_rule="close < resistance and close < shift(close, 1)")
+    final = asyncio.run(core._finalize_signals(signals, frames))
+    assert [s["symbol"] for s in final] == ["B_USDT"]
@@ -3,7 +3,8 @@ import pytest
 import pandas as pd
 from typing import List, Dict
 
-from screener.signal_generator import SignalGenerator, RESISTANCE_WINDOW
+from screener.params import RESISTANCE_WINDOW
+from screener.signal_generator import SignalGenerator
 from screener.filter_engine import check_trigger
 
 sg = SignalGenerator()
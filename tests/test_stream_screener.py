@@ -0,0 +1,167 @@
+import asyncio
+import pytest
+
+import screener.stream_screener as stream_mod
+from screener.stream_screener import StreamScreener, TIMEFRAME_TREND, TIMEFRAME_ENTRY
+from screener.candle_ring import CandleRing
+from screener.vector_engine import CrossSectionalEngine
+
+
+class DummyAPI:
+    def klines_to_dataframe(self, data, sym):
+        raise AssertionError("o streaming não deve montar DataFrames")
+
+
+class DummyNotifier:
+    def __init__(self): self.sent = []
+    async def send_tech(self, message, parse_mode=None): self.sent.append(message)
+
+
+def push(sym, interval, t, close):
+    return {"channel": "push.kline", "data": {
+        "symbol": sym, "interval": interval, "t": t,
+        "o": close, "h": close, "l": close, "c": close, "q": 10.0, "a": 100.0,
+    }}
+
+
+def test_candle_ring_upsert_detects_close():
+    s = CandleRing(capacity=3)
+    bar = {"time": 0, "open": 1, "high": 1, "low": 1, "close": 1, "vol": 1, "amount": 1}
+    assert s.upsert(bar) is False
+    assert s.upsert({**bar, "close": 2}) is False
+    assert s.upsert({**bar, "time": 900}) is True
+    assert s.payload(closed_only=True)["close"].tolist() == [2]
+
+
+def test_evaluates_only_on_entry_candle_close(monkeypatch):
+    monkeypatch.setattr(stream_mod, "log_signal", lambda sig, sug: None)
+    monkeypatch.setattr(CrossSectionalEngine, "context", lambda self, frames, rejections=None: {s: 2.0 for s in frames})
+    seen = []
+
+    def fake_signals(self, frames, res, rejections=None):
+        (sym, series), = frames.items()
+        seen.append(series.close.tolist())
+        return [{"symbol": sym, "entry_price": 1.0, "stop_loss": 2.0,
+                 "take_profit": 0.5, "indicators": {}}]
+
+    monkeypatch.setattr(CrossSectionalEngine, "signals", fake_signals)
+    notifier = DummyNotifier()
+    st = StreamScreener(DummyAPI(), notifier)
+    for interval in (TIMEFRAME_TREND, TIMEFRAME_ENTRY):
+        st.series[("A_USDT", interval)] = CandleRing(10)
+
+    async def scenario():
+        st.start_workers()
+        await st.on_kline(push("A_USDT", TIMEFRAME_TREND, 0, 1.0))
+        await st.on_kline(push("A_USDT", TIMEFRAME_ENTRY, 0, 1.0))
+        await st.on_kline(push("A_USDT", TIMEFRAME_ENTRY, 0, 1.1))   # candle aberto atualizado
+        await st.on_kline(push("A_USDT", TIMEFRAME_ENTRY, 900, 1.2)) # fecha o candle 0
+        await st.on_kline(push("B_USDT", TIMEFRAME_ENTRY, 900, 1.2)) # símbolo não acompanhado
+        # a avaliação roda fora do handler do WebSocket
+        assert seen == []
+        await st.drain()
+        await st.stop_workers()
+
+    asyncio.run(scenario())
+    assert seen == [[1.1]]
+    assert len(notifier.sent) == 1 and "A_USDT" in notifier.sent[0]
+
+
+def test_slow_evaluation_does_not_block_dispatch(monkeypatch):
+    release = None
+    evaluated = []
+
+    async def slow_evaluate(self, sym):
+        await release.wait()
+        evaluated.append(sym)
+
+    monkeypatch.setattr(StreamScreener, "evaluate", slow_evaluate)
+    st = StreamScreener(DummyAPI(), DummyNotifier(), workers=1, queue_size=1)
+    for sym in ("A_USDT", "B_USDT"):
+        st.series[(sym, TIMEFRAME_ENTRY)] = CandleRing(10)
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        st.start_workers()
+        for t in (0, 900, 1800):
+            await asyncio.wait_for(st.on_kline(push("A_USDT", TIMEFRAME_ENTRY, t, 1.0)), 0.1)
+            await asyncio.sleep(0)
+        # fila cheia (A em avaliação, A pendente): B fica para o próximo candle
+        await st.on_kline(push("B_USDT", TIMEFRAME_ENTRY, 0, 1.0))
+        await st.on_kline(push("B_USDT", TIMEFRAME_ENTRY, 900, 1.0))
+        release.set()
+        await st.drain()
+        await st.stop_workers()
+
+    asyncio.run(scenario())
+    assert evaluated == ["A_USDT", "A_USDT"]
+
+
+def test_reseeds_from_rest_after_socket_drop(monkeypatch):
+    from mexc.ws_manager import MexcWsManager
+    from tests.test_ws_manager import FakeWS
+
+    monkeypatch.setattr("mexc.ws_manager.random.uniform", lambda a, b: 0.001)
+    period = stream_mod._PERIODS[TIMEFRAME_ENTRY]
+    server = {"last": period}   # início do candle aberto na exchange
+    sockets, calls, evaluated = [], [], []
+
+    class RestAPI(DummyAPI):
+        async def get_klines(self, sym, interval, start, end):
+            calls.append(interval)
+            times = list(range(0, server["last"] + 1, period))
+            return {"time": times, "open": [float(t) for t in times], "high": [float(t) for t in times],
+                    "low": [float(t) for t in times], "close": [float(t) for t in times],
+                    "vol": [10.0] * len(times), "amount": [100.0] * len(times)}
+
+        async def subscribe_klines(self, pairs, callback, on_reconnect=None):
+            mgr.add_reconnect_handler(on_reconnect)
+            return await mgr.subscribe_klines(pairs, callback)
+
+    async def fake_connect(url):
+        sockets.append(FakeWS())
+        return sockets[-1]
+
+    async def fake_evaluate(self, sym):
+        evaluated.append(self.series[(sym, TIMEFRAME_ENTRY)].view("close", closed_only=True)[-1])
+
+    monkeypatch.setattr(StreamScreener, "evaluate", fake_evaluate)
+    mgr = MexcWsManager(url="ws://fake", ping_interval=60, connect=fake_connect)
+    st = StreamScreener(RestAPI(), DummyNotifier())
+
+    async def scenario():
+        await st.seed(["A_USDT"])
+        st.start_workers()
+        await st.api.subscribe_klines([("A_USDT", TIMEFRAME_ENTRY)], st.on_kline, on_reconnect=st.on_reconnect)
+        await asyncio.sleep(0.01)
+        # fecha o candle `period` pelo WebSocket
+        await sockets[0].inbox.put(push("A_USDT", TIMEFRAME_ENTRY, 2 * period, 7.0))
+        await asyncio.sleep(0.01)
+        await st.drain()
+        assert evaluated == [float(period)]
+
+        # queda entre dois fechamentos: dois candles fecham sem push
+        server["last"] = 4 * period
+        await sockets[0].inbox.put(None)
+        await asyncio.sleep(0.05)
+        assert len(sockets) == 2
+        await st.drain()
+        # recarregado via REST e avaliado no último candle fechado da exchange
+        assert st.series[("A_USDT", TIMEFRAME_ENTRY)].last_time == 4 * period
+        assert evaluated[-1] == float(3 * period)
+
+        # salto de `time` sem queda do socket também recarrega
+        server["last"] = 6 * period
+        n_calls = len(calls)
+        await sockets[1].inbox.put(push("A_USDT", TIMEFRAME_ENTRY, 6 * period, 1.0))
+        await asyncio.sleep(0.01)
+        await st.drain()
+        assert len(calls) > n_calls
+        assert evaluated[-1] == float(5 * period)
+
+        await st.stop_workers()
+        await mgr.close()
+
+    asyncio.run(scenario())
+    assert len(evaluated) == 3
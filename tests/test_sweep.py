@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from backtest.engine import MarketData
+from backtest.sweep import SweepRunner, grid, walk_forward
+
+
+def random_payloads(n_symbols, n_bars, seed=5):
+    rng = np.random.default_rng(seed)
+    payloads = {}
+    for i in range(n_symbols):
+        close = 10 * np.exp(np.cumsum(rng.normal(-0.001, 0.006, n_bars)))
+        payloads[f"S{i}_USDT"] = {
+            "time": 1_700_000_000 // 3600 * 3600 + 900 * np.arange(n_bars),
+            "open": close, "close": close,
+            "high": close * (1 + rng.uniform(0, 0.004, n_bars)),
+            "low": close * (1 - rng.uniform(0, 0.004, n_bars)),
+            "vol": rng.uniform(500, 1500, n_bars),
+        }
+    return payloads
+
+
+def test_grid_and_walk_forward_folds():
+    params = grid({"ema_short": (9, 21), "ema_long": (21,), "rr_target": (1.0, 2.0)})
+    assert [(p.ema_short, p.rr_target) for p in params] == [(9, 1.0), (9, 2.0)]
+    folds = walk_forward(100, train=40, test=20)
+    assert [(tr.start, te.start, te.stop) for tr, te in folds] == [(0, 40, 60), (20, 60, 80), (40, 80, 100)]
+
+
+def test_parallel_sweep_matches_serial_and_is_ranked():
+    market = MarketData.from_payloads(random_payloads(n_symbols=4, n_bars=600), "Min15")
+    candidates = grid({"rr_target": (1.0, 1.5, 2.0), "volume_mult": (0.6, 1.0)})
+    serial = SweepRunner(market, max_workers=1, min_trades=1).sweep(candidates)
+    parallel = SweepRunner(market, max_workers=2, min_trades=1).sweep(candidates)
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert serial["rank"].tolist() == list(range(1, len(candidates) + 1))
+    assert serial["total_return"].is_monotonic_decreasing
+
+    wf = SweepRunner(market, max_workers=1, min_trades=1, warmup=200).walk_forward(candidates, train=300, test=150)
+    assert len(wf) == 2 and "test_trades" in wf.columns
+
+    # nenhuma combinação atinge min_trades no treino: janelas sem operação
+    wf = SweepRunner(market, max_workers=1, min_trades=10**6, warmup=200).walk_forward(candidates, train=300, test=150)
+    assert len(wf) == 2 and not wf["traded"].any()
+    assert (wf["test_trades"] == 0).all() and wf["rr_target"].isna().all()
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screener.signal_generator import SignalGenerator
+from screener.vector_engine import CrossSectionalEngine, stack, rsi
+
+
+def random_frames(n_symbols, n_bars, seed=7, drift=-0.002):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for i in range(n_symbols):
+        n = n_bars - (i % 5) * 3  # séries de tamanhos diferentes
+        close = 10 * np.exp(np.cumsum(rng.normal(drift, 0.01, n)))
+        frames[f"S{i}_USDT"] = pd.DataFrame({
+            "close": close,
+            "high": close * (1 + rng.uniform(0, 0.01, n)),
+            "volume": rng.uniform(500, 1500, n),
+            "symbol": f"S{i}_USDT",
+        })
+    return frames
+
+
+def test_rsi_matches_signal_generator():
+    frames = random_frames(3, 60)
+    close = stack([f["close"].to_numpy() for f in frames.values()])
+    got = rsi(close)
+    for i, df in enumerate(frames.values()):
+        expected = SignalGenerator().calculate_rsi(df).to_numpy()
+        np.testing.assert_allclose(got[i, -len(df):], expected, equal_nan=True)
+
+
+def test_engine_matches_per_symbol_signal_generator():
+    sg = SignalGenerator()
+    engine = CrossSectionalEngine()
+    trend = random_frames(150, 120, seed=1)
+    entry = random_frames(150, 200, seed=2)
+
+    resistance = engine.context(trend)
+    expected_ctx = {s: sg.calculate_resistance_h1(df) for s, df in trend.items() if sg.check_context(df)}
+    assert list(resistance) == list(expected_ctx)
+    assert resistance == pytest.approx(expected_ctx)
+
+    # usa a resistência real do entry para ter candidatos nos dois lados
+    res_all = {s: float(df["high"].max()) for s, df in entry.items()}
+    signals = engine.signals(entry, res_all)
+    expected = [sg.check_trigger(df, res_all[s]) for s, df in entry.items()]
+    expected = [e for e in expected if e]
+    assert expected, "dados de teste deveriam gerar ao menos um sinal"
+    assert [s["symbol"] for s in signals] == [e["symbol"] for e in expected]
+    for got, exp in zip(signals, expected):
+        assert got["entry_price"] == pytest.approx(exp["entry_price"])
+        assert got["take_profit"] == pytest.approx(exp["take_profit"])
+        assert got["indicators"] == pytest.approx(exp["indicators"])
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import pytest
+
+from mexc.ws_manager import MexcWsManager, kline_key
+
+
+class FakeWS:
+    """Socket falso: entrega as mensagens da fila e encerra ao receber None."""
+    def __init__(self):
+        self.sent = []
+        self.inbox = asyncio.Queue()
+    async def send(self, msg): self.sent.append(json.loads(msg))
+    async def close(self): await self.inbox.put(None)
+    def __aiter__(self): return self
+    async def __anext__(self):
+        msg = await self.inbox.get()
+        if msg is None:
+            raise ConnectionError("socket fechado")
+        return json.dumps(msg)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_and_resubscribe_after_drop(monkeypatch):
+    monkeypatch.setattr("mexc.ws_manager.random.uniform", lambda a, b: 0.001)
+    sockets = []
+
+    async def fake_connect(url):
+        ws = FakeWS()
+        sockets.append(ws)
+        return ws
+
+    mgr = MexcWsManager(url="ws://fake", max_subs_per_conn=2, ping_interval=60, connect=fake_connect)
+    received = []
+
+    async def handler(msg): received.append(msg["data"]["symbol"])
+
+    await mgr.subscribe_kline("A_USDT", "Min15", handler)
+    await mgr.subscribe_kline("B_USDT", "Min15", handler)
+    await mgr.subscribe_ticker("C_USDT", handler)
+    await asyncio.sleep(0.01)
+    # 3 assinaturas com no máximo 2 por socket -> 2 conexões
+    assert len(sockets) == 2
+    assert [m["param"]["symbol"] for m in sockets[0].sent] == ["A_USDT", "B_USDT"]
+
+    await sockets[0].inbox.put({"channel": "push.kline", "data": {"symbol": "B_USDT", "interval": "Min15"}})
+    await sockets[1].inbox.put({"channel": "push.ticker", "data": {"symbol": "C_USDT"}})
+    await sockets[0].inbox.put({"channel": "pong", "data": 1})
+    await asyncio.sleep(0.01)
+    assert sorted(received) == ["B_USDT", "C_USDT"]
+
+    # queda do primeiro socket: reconecta e refaz as assinaturas
+    await sockets[0].inbox.put(None)
+    await asyncio.sleep(0.05)
+    assert len(sockets) == 3
+    assert [m["param"]["symbol"] for m in sockets[2].sent] == ["A_USDT", "B_USDT"]
+
+    await mgr.close()
+    assert MexcWsManager.channel_key(
+        {"channel": "push.kline", "data": {"symbol": "A_USDT", "interval": "Min60"}}
+    ) == kline_key("A_USDT", "Min60")
+
+
+@pytest.mark.asyncio
+async def test_subscribe_klines_registers_all_pairs_at_once():
+    sockets = []
+
+    async def fake_connect(url):
+        sockets.append(FakeWS())
+        return sockets[-1]
+
+    mgr = MexcWsManager(url="ws://fake", max_subs_per_conn=10, ping_interval=60, connect=fake_connect)
+
+    async def handler(msg): pass
+
+    pairs = [(s, i) for s in ("A_USDT", "B_USDT") for i in ("Min15", "Min60")]
+    keys = await mgr.subscribe_klines(pairs, handler)
+    await asyncio.sleep(0.01)
+    assert keys == [kline_key(s, i) for s, i in pairs]
+    assert len(sockets) == 1
+    assert [(m["param"]["symbol"], m["param"]["interval"]) for m in sockets[0].sent] == pairs
+    await mgr.close()